@@ -0,0 +1,11 @@
+"""Headless benchmarks.
+
+Importing the package forces SDL's dummy video/audio drivers so the
+benchmarks run on machines without a display.
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# Keep stdout clean for machine-readable output
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
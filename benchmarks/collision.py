@@ -0,0 +1,53 @@
+"""Broadphase collision benchmark.
+
+    python -m benchmarks.collision [--counts N ...]
+
+Times the spatial-hash path against the original nested loop from 10 to
+5,000 entities. tests/test_collision.py checks that both find the same hits.
+"""
+import argparse
+
+import numpy as np
+
+from benchmarks.common import summarize, print_table, time_calls
+
+import main
+from collision import SpatialHash, brute_force_laser_hits, find_laser_hits
+
+
+LASER_SIZE = (main.Laser.width, main.Laser.height)
+ENEMY_SIZE = (main.Enemy.width, main.Enemy.height)
+
+
+def random_scene(rng, lasers, enemies, width=main.SCREEN_WIDTH, height=main.SCREEN_HEIGHT):
+    # (laser x, laser y, enemy x, enemy y) arrays, as the entity stores hold them
+    return (rng.uniform(0, width, lasers), rng.uniform(-50, height, lasers),
+            rng.uniform(0, width, enemies), rng.uniform(-50, height, enemies))
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    grid = SpatialHash()
+    rows = []
+    for count in args.counts:
+        # Split the entity budget between lasers and enemies
+        lx, ly, ex, ey = random_scene(rng, count // 2, count - count // 2)
+        cases = [("brute force",
+                  lambda: brute_force_laser_hits(lx, ly, LASER_SIZE, ex, ey, ENEMY_SIZE)),
+                 ("spatial hash",
+                  lambda: find_laser_hits(lx, ly, LASER_SIZE, ex, ey, ENEMY_SIZE, grid))]
+        for name, fn in cases:
+            # The O(L*E) path gets very slow - a couple of runs is enough
+            repeat = 2 if name == "brute force" and count > 1000 else args.repeat
+            rows.append((f"{name} x{count}", summarize(time_calls(fn, repeat))))
+    print_table("laser/enemy collision pass", rows)
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,39 @@
+"""Shared helpers for the headless benchmarks."""
+import time
+
+
+def percentile(sorted_samples, pct):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(pct / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def summarize(samples):
+    # Samples are in seconds, the summary is in milliseconds
+    ordered = sorted(samples)
+    count = len(ordered)
+    return {
+        "frames": count,
+        "mean_ms": (sum(ordered) / count * 1000) if count else 0.0,
+        "p50_ms": percentile(ordered, 50) * 1000,
+        "p95_ms": percentile(ordered, 95) * 1000,
+        "p99_ms": percentile(ordered, 99) * 1000,
+    }
+
+
+def time_calls(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def print_table(title, rows):
+    print(title)
+    print(f"  {'case (ms)':<28}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for name, stats in rows:
+        print(f"  {name:<28}{stats['mean_ms']:>10.3f}{stats['p50_ms']:>10.3f}"
+              f"{stats['p95_ms']:>10.3f}{stats['p99_ms']:>10.3f}")
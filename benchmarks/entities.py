@@ -0,0 +1,77 @@
+"""Micro-benchmark: per-object Enemy/Laser lists vs the array-backed stores.
+
+    python -m benchmarks.entities [--frames N]
+
+Each case keeps N enemies (and N / 50 lasers) alive and times one update +
+off-screen cull step, respawning whatever was culled outside the timing.
+"""
+import argparse
+import random
+import time
+
+from benchmarks import legacy
+from benchmarks.common import summarize, print_table
+
+import main
+
+
+def spawn_y():
+    return random.uniform(-50, main.SCREEN_HEIGHT)
+
+
+def legacy_case(count):
+    enemies = []
+    lasers = []
+
+    def frame():
+        while len(enemies) < count:
+            enemies.append(legacy.Enemy(random.randint(50, main.SCREEN_WIDTH - 50), spawn_y()))
+        while len(lasers) < count // 50:
+            lasers.append(legacy.Laser(random.randint(50, main.SCREEN_WIDTH - 50), spawn_y()))
+        start = time.perf_counter()
+        for laser in lasers[:]:
+            laser.update()
+            if laser.is_off_screen():
+                lasers.remove(laser)
+        for enemy in enemies[:]:
+            enemy.update()
+            if enemy.is_off_screen():
+                enemies.remove(enemy)
+        return time.perf_counter() - start
+    return frame
+
+
+def store_case(count):
+    enemies = main.EnemyStore(capacity=max(count, 1))
+    lasers = main.LaserStore(capacity=max(count // 50, 1))
+
+    def frame():
+        while len(enemies) < count:
+            enemies.spawn(random.randint(50, main.SCREEN_WIDTH - 50), spawn_y())
+        while len(lasers) < count // 50:
+            lasers.spawn(random.randint(50, main.SCREEN_WIDTH - 50), spawn_y())
+        start = time.perf_counter()
+        lasers.update()
+        enemies.update()
+        return time.perf_counter() - start
+    return frame
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--counts", type=int, nargs="+", default=[50, 500, 5000])
+    args = parser.parse_args(argv)
+
+    rows = []
+    for count in args.counts:
+        for name, factory in (("object lists", legacy_case), ("entity store", store_case)):
+            random.seed(1234)
+            frame = factory(count)
+            samples = [frame() for _ in range(args.frames)]
+            rows.append((f"{name} x{count}", summarize(samples)))
+    print_table(f"enemy/laser update + cull ({args.frames} frames)", rows)
+
+
+if __name__ == "__main__":
+    run_benchmark()
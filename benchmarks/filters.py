@@ -0,0 +1,176 @@
+"""Lag and jitter of the hand-position filters on hand trajectories.
+
+    python -m benchmarks.filters [--latency-ms MS] [--recording input.rec ...]
+
+Replays hand trajectories through each filter the way the game does: the
+camera delivers a measurement every frame, it becomes available to the
+simulation ``--latency-ms`` after capture, and the ship asks its filter for
+a position every 1/60 s step. The built-in trajectories (a steady sweep,
+quick flicks between positions, a hand held still) have a known true
+position; measurements get landmark-sized noise, tracking dropouts and,
+with --inference-interval, skipped inference. As in the game, a frame whose
+inference was skipped repeats the last measurement and its capture time.
+Recordings made with
+``main.py --record`` are replayed from their capture timestamps; their
+reference is the recording itself smoothed with a centered (non-causal)
+window, which no real-time filter could see.
+
+Per filter and trajectory, reports:
+
+- error: RMS distance in pixels from the reference at each step
+- lag: the time shift of the reference that best matches the output
+- jitter: RMS in pixels of the output's wobble around its centered 7-step
+  mean, minus the reference's own (lag-shifted) wobble, so real motion
+  does not count
+"""
+import argparse
+
+import numpy as np
+
+import main
+from filters import FILTERS, make_filter
+from recording import InputReplay
+
+SIM_DT = main.SIM_DT
+WIDTH = main.SCREEN_WIDTH
+
+
+def sweep(t):
+    return 0.5 + 0.35 * np.sin(2 * np.pi * t / 4.0)
+
+
+def flicks(t, seed=7):
+    # Minimum-jerk moves between random positions every 0.6-1.2 s
+    rng = np.random.default_rng(seed)
+    starts = np.cumsum(rng.uniform(0.6, 1.2, 64))
+    targets = rng.uniform(0.15, 0.85, 65)
+    i = np.clip(np.searchsorted(starts, t), 1, len(starts) - 1)
+    u = np.clip((t - starts[i - 1]) / 0.35, 0.0, 1.0)
+    s = u ** 3 * (10 - 15 * u + 6 * u ** 2)
+    return targets[i - 1] + (targets[i] - targets[i - 1]) * s
+
+
+def hold(t):
+    # Physiological tremor only
+    return 0.5 + 0.002 * np.sin(2 * np.pi * 9 * t)
+
+
+TRAJECTORIES = {"sweep": sweep, "flicks": flicks, "hold": hold}
+
+
+def synthetic_measurements(truth, seconds, fps, noise, dropout, interval, rng):
+    # (frame capture times, measurement capture times, hand x in px or NaN)
+    # at the camera rate
+    captures = np.arange(0, seconds, 1.0 / fps)
+    xs = truth(captures) * WIDTH + rng.normal(0, noise, len(captures))
+    # Dropouts come in runs of a few frames
+    lost = np.zeros(len(captures), dtype=bool)
+    for start in np.flatnonzero(rng.random(len(captures)) < dropout):
+        lost[start:start + rng.integers(2, 8)] = True
+    xs[lost] = np.nan
+    # Frames without inference repeat the last inferred frame
+    inferred = np.arange(len(captures)) // interval * interval
+    return captures, captures[inferred], xs[inferred]
+
+
+def recorded_measurements(path):
+    records = InputReplay(path).records
+    times, first = np.unique(records["timestamp"], return_index=True)
+    xs = records["hand_x"][first].astype(np.float64) * WIDTH
+    times = times - times[0]
+    return times, times, xs
+
+
+def smoothed_reference(times, xs, sigma=2.0):
+    # Centered Gaussian smoothing of the valid measurements, as a function of time
+    valid = ~np.isnan(xs)
+    t, x = times[valid], xs[valid]
+    offsets = np.arange(-3 * int(sigma), 3 * int(sigma) + 1)
+    weights = np.exp(-0.5 * (offsets / sigma) ** 2)
+    padded = np.pad(x, len(offsets) // 2, mode="edge")
+    smooth = np.convolve(padded, weights / weights.sum(), mode="valid")
+    return lambda s: np.interp(s, t, smooth) / WIDTH
+
+
+def run_filter(name, captures, times, xs, latency, end):
+    # Position at every simulation step, plus the step times
+    arrivals = captures + latency
+    steps = np.arange(arrivals[0], end, SIM_DT)
+    newest = np.searchsorted(arrivals, steps, side="right") - 1
+    start = xs[~np.isnan(xs)][0]
+    hand_filter = make_filter(name, start)
+    out = np.empty(len(steps))
+    x = start
+    for i, (now, j) in enumerate(zip(steps.tolist(), newest.tolist())):
+        measured = xs[j]
+        estimate = hand_filter.step(None if np.isnan(measured) else float(measured),
+                                    float(times[j]), now)
+        if estimate is not None:
+            x = min(max(estimate, 0.0), WIDTH)
+        out[i] = x
+    return steps, out
+
+
+def raw_output(times, xs, latency, end):
+    # Latest valid measurement, unfiltered
+    steps = np.arange(times[0] + latency, end, SIM_DT)
+    valid = ~np.isnan(xs)
+    t, x = times[valid] + latency, xs[valid]
+    return steps, x[np.clip(np.searchsorted(t, steps, side="right") - 1, 0, len(x) - 1)]
+
+
+def metrics(steps, out, truth, settle=1.0):
+    keep = steps >= steps[0] + settle
+    steps, out = steps[keep], out[keep]
+    error = np.sqrt(np.mean((out - truth(steps) * WIDTH) ** 2))
+    shifts = np.arange(-0.05, 0.3, 0.001)
+    lags = [np.mean((out - truth(steps - shift) * WIDTH) ** 2) for shift in shifts]
+    lag = shifts[int(np.argmin(lags))]
+    reference = truth(steps - lag) * WIDTH
+    window = np.ones(7) / 7
+    wobble = (out - np.convolve(out, window, mode="same")
+              - reference + np.convolve(reference, window, mode="same"))
+    jitter = np.sqrt(np.mean(wobble[3:-3] ** 2))
+    return error, lag * 1000, jitter
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recording", nargs="*", default=[],
+                        help="also evaluate these recordings")
+    parser.add_argument("--latency-ms", type=float, default=50.0,
+                        help="capture-to-simulation latency of every measurement")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--noise-px", type=float, default=3.0)
+    parser.add_argument("--dropout", type=float, default=0.01,
+                        help="chance per frame that a tracking dropout starts")
+    parser.add_argument("--inference-interval", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    latency = args.latency_ms / 1000
+    rng = np.random.default_rng(args.seed)
+    cases = []
+    for name, truth in TRAJECTORIES.items():
+        measurements = synthetic_measurements(truth, args.seconds, args.fps, args.noise_px,
+                                              args.dropout, args.inference_interval, rng)
+        cases.append((name, *measurements, truth))
+    for path in args.recording:
+        captures, times, xs = recorded_measurements(path)
+        cases.append((path, captures, times, xs, smoothed_reference(times, xs)))
+
+    print(f"hand filters ({args.latency_ms:.0f} ms latency, {args.noise_px} px noise, "
+          f"inference every {args.inference_interval} frame(s))")
+    print(f"  {'trajectory':<16}{'filter':<10}{'error px':>10}{'lag ms':>10}{'jitter px':>11}")
+    for name, captures, times, xs, truth in cases:
+        end = captures[-1] + latency
+        rows = [("raw", raw_output(captures, xs, latency, end))]
+        rows += [(f, run_filter(f, captures, times, xs, latency, end)) for f in FILTERS]
+        for filter_name, (steps, out) in rows:
+            error, lag, jitter = metrics(steps, out, truth)
+            print(f"  {name:<16}{filter_name:<10}{error:>10.2f}{lag:>10.1f}{jitter:>11.2f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,38 @@
+"""Micro-benchmark for the gesture engine.
+
+    python -m benchmarks.gestures [--frames N]
+
+Times feature extraction + classification + hysteresis for one hand per call
+on synthetic landmarks.
+"""
+import argparse
+
+from benchmarks.common import summarize, print_table, time_calls
+
+from gestures import GestureEngine
+from input_sources import SyntheticSource
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    source = SyntheticSource(realtime=False, seed=1234)
+    frames = [source.read_landmarks()[1].copy() for _ in range(256)]
+    engine = GestureEngine()
+    index = 0
+
+    def classify():
+        nonlocal index
+        engine.update(frames[index & 255])
+        index += 1
+
+    samples = time_calls(classify, args.frames)
+    stats = summarize(samples)
+    print_table(f"gesture classification ({args.frames} frames)", [("GestureEngine.update", stats)])
+    print(f"  = {stats['mean_ms'] * 1000:.1f} us per frame")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,220 @@
+"""CPU time and wake-up latency of the idle mode against the always-on loop.
+
+    python -m benchmarks.idle [--seconds S] [--trials N] [--pipelined]
+    python -m benchmarks.idle --video no_hands.mp4 [--pipelined]
+
+Runs ``Game.run`` headlessly, once with idle mode and once without, in the
+two situations it is for:
+
+- game over: the game over screen, with the synthetic hand in view
+- no hand: a running game with nobody in front of the camera (synthetic
+  input that drops every frame)
+
+and reports the process CPU time (all threads) per second of wall time,
+plus the rates frames were drawn and camera frames tracked at. With
+--video, both play a clip (without hands, looped) through the full camera
+path, so the figures include MediaPipe.
+
+It then wakes idle games up and reports the latency to the first frame
+that reacts, against the same event in the always-on loop:
+
+- hand: the synthetic hand appears at a random point of the idle poll
+  cycle; timed from its appearance to the first frame drawn with it
+- restart: R is pressed on the idle game over screen; timed to the first
+  frame of the new game
+
+Exits non-zero if a woken game draws another idle frame after the event
+was seen, or if idling does not save CPU time.
+"""
+import argparse
+import contextlib
+import io
+import math
+import sys
+import threading
+import time
+
+import numpy as np
+import pygame
+
+import main
+from idle import IDLE_POLL_INTERVAL
+from input_sources import SyntheticSource, VideoFileSource
+
+
+class ScriptedSource:
+    # Wraps a source: the hand stays hidden until hand_at seconds after the
+    # first read, and the source ends after seconds
+    def __init__(self, source, seconds, hand_at=0.0):
+        self.source = source
+        self.seconds = seconds
+        self.hand_at = hand_at
+        self.start = None
+
+    def __getattr__(self, name):
+        return getattr(self.source, name)
+
+    def elapsed(self):
+        if self.start is None:
+            self.start = time.perf_counter()
+        return time.perf_counter() - self.start
+
+    @property
+    def exhausted(self):
+        return self.source.exhausted or (self.start is not None and self.elapsed() >= self.seconds)
+
+    def read(self):
+        self.elapsed()
+        return self.source.read()
+
+    def read_landmarks(self):
+        ok, landmarks, timestamp = self.source.read_landmarks()
+        if self.elapsed() < self.hand_at:
+            landmarks = None
+        return ok, landmarks, timestamp
+
+
+class MeteredGame(main.Game):
+    # Records every drawn frame as (time, idle, game over, hand detected)
+    # and the CPU time from the first frame on
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.frames = []
+        self.frame_hand = False
+        self.cpu_start = None
+
+    def draw_everything(self, hand_detected, *args):
+        self.frame_hand = hand_detected
+        super().draw_everything(hand_detected, *args)
+
+    def present(self):
+        super().present()
+        if self.cpu_start is None:
+            self.cpu_start = time.process_time()
+        self.frames.append((time.perf_counter(), self.idle, self.game_over, self.frame_hand))
+
+    def tracked_frames(self):
+        worker = self.tracking_worker
+        return worker.seq if worker is not None else self.tracking_seq
+
+
+def play(source, args, idle, game_over=False, idle_after=0.0, events=()):
+    # Runs one game until the source ends; events: (seconds after the run
+    # starts, pygame event) to post from another thread
+    pygame.init()
+    game = MeteredGame(source=source, seed=args.seed, pipelined=args.pipelined, idle=idle)
+    if game.idle_monitor is not None:
+        game.idle_monitor.idle_after = game.idle_monitor.game_over_after = idle_after
+        game.idle_monitor.log = lambda message: None
+    game.game_over = game_over
+    timers = [threading.Timer(at, pygame.event.post, (event,)) for at, event in events]
+    try:
+        game.started = time.perf_counter()
+        for timer in timers:
+            timer.start()
+        # Keep the game's own messages out of the tables
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.run()
+        cpu_end = time.process_time()
+    finally:
+        for timer in timers:
+            timer.cancel()
+        game.shutdown()
+    return game, cpu_end
+
+
+def make_source(args, seconds, hand_at):
+    if args.video:
+        return ScriptedSource(VideoFileSource(args.video, loop=True), seconds, hand_at)
+    dropout = 1.0 if math.isinf(hand_at) else 0.0
+    return ScriptedSource(SyntheticSource(seed=args.seed, dropout=dropout), seconds, hand_at)
+
+
+def measure_cpu(args, idle, game_over):
+    # (CPU share, frames drawn/s, camera frames tracked/s)
+    hand_at = 0.0 if game_over else math.inf
+    game, cpu_end = play(make_source(args, args.seconds, hand_at), args, idle, game_over)
+    first, last = game.frames[0][0], game.frames[-1][0]
+    wall = last - first
+    return ((cpu_end - game.cpu_start) / wall, (len(game.frames) - 1) / wall,
+            game.tracked_frames() / args.seconds)
+
+
+def first_frame_after(frames, start, condition):
+    # The first frame drawn at or after start that meets condition, or None
+    for frame in frames:
+        if frame[0] >= start and condition(frame):
+            return frame
+    return None
+
+
+def wake_hand(args, idle, phase):
+    # (latency in seconds, woke in one frame) for a hand appearing phase
+    # seconds into the idle poll cycle
+    hand_at = 1.0 + phase
+    source = SyntheticSource(seed=args.seed)
+    source = ScriptedSource(source, hand_at + 0.5, hand_at)
+    game, _ = play(source, args, idle, idle_after=0.5)
+    appeared = source.start + hand_at
+    seen = first_frame_after(game.frames, appeared, lambda frame: frame[3])
+    return seen[0] - appeared, not seen[1]
+
+
+def wake_restart(args, idle, phase):
+    # (latency in seconds, woke in one frame) for R pressed phase seconds
+    # into an idle game over screen
+    press_at = 1.0 + phase
+    source = ScriptedSource(SyntheticSource(seed=args.seed), press_at + 0.5)
+    event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_r, mod=0, unicode="r")
+    game, _ = play(source, args, idle, game_over=True, idle_after=0.5,
+                   events=[(press_at, event)])
+    pressed = game.started + press_at
+    restarted = first_frame_after(game.frames, pressed, lambda frame: not frame[2])
+    return restarted[0] - pressed, not restarted[1]
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--video", help="play this clip without hands through the camera path")
+    parser.add_argument("--seconds", type=float, default=10.0,
+                        help="length of each CPU time run")
+    parser.add_argument("--trials", type=int, default=10, help="wake-ups of each kind")
+    parser.add_argument("--pipelined", action="store_true")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    mode = "pipelined" if args.pipelined else "serial"
+    failures = []
+    print(f"idle mode ({args.video or 'synthetic hand'}, {mode})")
+    print(f"  {'situation':<12}{'loop':<12}{'CPU %':>8}{'frames/s':>10}{'tracked/s':>11}")
+    for situation, game_over in (("game over", True), ("no hand", False)):
+        cpu = {}
+        for loop, idle in (("always-on", False), ("idle", True)):
+            cpu[loop], fps, tracked = measure_cpu(args, idle, game_over)
+            print(f"  {situation:<12}{loop:<12}{cpu[loop]:>8.1%}{fps:>10.1f}{tracked:>11.1f}")
+        if cpu["idle"] >= cpu["always-on"]:
+            failures.append(f"idle used no less CPU than the always-on loop on {situation}")
+
+    rng = np.random.default_rng(args.seed)
+    phases = rng.uniform(0.0, IDLE_POLL_INTERVAL, args.trials)
+    print(f"wake-up latency over {args.trials} trials (ms)")
+    print(f"  {'event':<12}{'loop':<12}{'mean':>8}{'p50':>8}{'max':>8}")
+    for event, wake in (("hand", wake_hand), ("restart", wake_restart)):
+        for loop, idle in (("always-on", False), ("idle", True)):
+            trials = [wake(args, idle, phase) for phase in phases]
+            latency = np.array([seconds for seconds, _ in trials]) * 1000
+            print(f"  {event:<12}{loop:<12}{latency.mean():>8.1f}{np.median(latency):>8.1f}"
+                  f"{latency.max():>8.1f}")
+            late = sum(not woke for _, woke in trials)
+            if late:
+                failures.append(f"{late} {event} wake-up(s) drew an idle frame after the event")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("every wake-up was drawn at the full rate")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,87 @@
+"""Full-frame vs ROI-tracked hand inference over a video file.
+
+    python -m benchmarks.inference --video hands.mp4 [--inference-size 192]
+
+Every frame is run through two trackers: the full-frame baseline and the
+ROI/downscaled mode. Reports per-frame inference time for both and the
+landmark drift (pixels) of the ROI mode against the baseline.
+"""
+import argparse
+import csv
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.common import summarize, print_table
+
+import main
+from input_sources import VideoFileSource
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--video", required=True)
+    parser.add_argument("--inference-size", type=int, default=192)
+    parser.add_argument("--padding", type=float, default=0.6)
+    parser.add_argument("--no-mirror", action="store_true")
+    parser.add_argument("--per-frame", metavar="CSV", help="write per-frame timings and drift")
+    args = parser.parse_args(argv)
+
+    source = VideoFileSource(args.video, realtime=False, mirror=not args.no_mirror)
+    baseline = main.HandTracker()
+    roi = main.HandTracker(roi_tracking=True, inference_size=args.inference_size,
+                           roi_padding=args.padding)
+
+    rows = []
+    while True:
+        ok, frame, _ = source.read()
+        if not ok:
+            break
+        if source.mirror:
+            frame = cv2.flip(frame, 1)
+
+        start = time.perf_counter()
+        baseline.find_hands(frame)
+        full_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        roi.find_hands(frame)
+        roi_time = time.perf_counter() - start
+
+        drift = None
+        if baseline.landmarks is not None and roi.landmarks is not None:
+            scale = np.array(source.frame_size, dtype=np.float32)
+            delta = (baseline.landmarks[:, :2] - roi.landmarks[:, :2]) * scale
+            drift = float(np.linalg.norm(delta, axis=1).mean())
+        rows.append((full_time, roi_time, baseline.hand_detected, roi.hand_detected,
+                     roi.used_roi, drift))
+    source.release()
+
+    if not rows:
+        print("no frames read")
+        return
+    if args.per_frame:
+        with open(args.per_frame, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "full_ms", "roi_ms", "full_detected", "roi_detected",
+                             "used_roi", "drift_px"])
+            for i, (full_t, roi_t, full_d, roi_d, used, drift) in enumerate(rows):
+                writer.writerow([i, f"{full_t * 1000:.3f}", f"{roi_t * 1000:.3f}", int(full_d),
+                                 int(roi_d), int(used), "" if drift is None else f"{drift:.2f}"])
+
+    print_table(f"hand inference per frame ({len(rows)} frames, "
+                f"{source.frame_size[0]}x{source.frame_size[1]})",
+                [("full frame", summarize([r[0] for r in rows])),
+                 (f"ROI @ {args.inference_size}px", summarize([r[1] for r in rows]))])
+    drifts = sorted(r[5] for r in rows if r[5] is not None)
+    frames = len(rows)
+    print(f"  detected: full {sum(r[2] for r in rows)}/{frames}, "
+          f"ROI {sum(r[3] for r in rows)}/{frames} ({sum(r[4] for r in rows)} from the crop)")
+    if drifts:
+        print(f"  landmark drift vs full frame: mean {sum(drifts) / len(drifts):.2f}px, "
+              f"p95 {drifts[int(0.95 * (len(drifts) - 1))]:.2f}px")
+
+
+if __name__ == "__main__":
+    run_benchmark()
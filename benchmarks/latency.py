@@ -0,0 +1,64 @@
+"""Motion-to-photon latency of the real main loop.
+
+    python -m benchmarks.latency [--seconds S] [--pipelined]
+    python -m benchmarks.latency --video hands.mp4 [--pipelined]
+
+Runs ``Game.run`` headlessly on a scripted motion and prints the per-stage
+and end-to-end latency histograms, plus fist -> laser latency. By default
+the motion is the synthetic hand (sweeps and fists on a fixed schedule,
+delivered at camera rate; no flip or inference stage). With --video, a
+recorded clip of a known motion is played back at its own frame rate
+through the full camera path (flip, MediaPipe, gestures), so latency can be
+measured the same way every time without a live camera.
+"""
+import argparse
+
+import pygame
+
+import main
+from input_sources import SyntheticSource, VideoFileSource
+
+
+class EndlessGame(main.Game):
+    # Restarts straight away after a game over, so every frame is measured
+    def step(self, inputs):
+        if self.game_over:
+            self.restart_game()
+        super().step(inputs)
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--video", help="play this clip through the full camera path")
+    parser.add_argument("--no-mirror", action="store_true")
+    parser.add_argument("--seconds", type=float, default=10.0,
+                        help="length of the synthetic run")
+    parser.add_argument("--fps", type=float, default=30.0, help="synthetic camera rate")
+    parser.add_argument("--pipelined", action="store_true")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    if args.video:
+        source = VideoFileSource(args.video, realtime=True, mirror=not args.no_mirror)
+    else:
+        source = SyntheticSource(fps=args.fps, seed=args.seed, duration=args.seconds)
+    game = EndlessGame(source=source, seed=args.seed, pipelined=args.pipelined)
+    try:
+        game.run()
+    finally:
+        game.shutdown()
+
+    mode = "pipelined" if args.pipelined else "serial"
+    print(f"motion-to-photon latency ({args.video or 'synthetic hand'}, {mode})")
+    print(game.latency.report())
+    for name in ("end_to_end", "fist_to_laser"):
+        histogram = game.latency.histograms[name]
+        if histogram.count:
+            print(f"{name}:")
+            for line in histogram.bars():
+                print("  " + line)
+
+
+if __name__ == "__main__":
+    run_benchmark()
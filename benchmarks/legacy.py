@@ -0,0 +1,93 @@
+"""Per-object particles, stars, lasers and enemies from before the
+vectorized ParticleSystem, Starfield and entity stores.
+
+The game no longer uses them; they are the reference implementations the
+particles, starfield and entities benchmarks compare against.
+"""
+import math
+import random
+
+import pygame
+
+import main
+
+
+class Particle:
+    def __init__(self, x, y, color, size=2):
+        self.x = x
+        self.y = y
+        self.vx = random.uniform(-2, 2)
+        self.vy = random.uniform(-2, 2)
+        self.color = color
+        self.size = size
+        self.life = 60
+        self.max_life = 60
+
+    def update(self):
+        self.x += self.vx
+        self.y += self.vy
+        self.life -= 1
+        self.size = max(0, self.size * (self.life / self.max_life))
+
+    def draw(self, screen):
+        if self.life > 0:
+            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)),
+                               max(1, int(self.size)))
+
+    def is_alive(self):
+        return self.life > 0
+
+
+class Star:
+    def __init__(self):
+        self.x = random.randint(0, main.SCREEN_WIDTH)
+        self.y = random.randint(0, main.SCREEN_HEIGHT)
+        self.speed = random.uniform(0.5, 2)
+        self.size = random.randint(1, 3)
+        self.twinkle = random.randint(0, 60)
+
+    def update(self):
+        self.y += self.speed
+        if self.y > main.SCREEN_HEIGHT:
+            self.y = -10
+            self.x = random.randint(0, main.SCREEN_WIDTH)
+        self.twinkle = (self.twinkle + 1) % 120
+
+    def draw(self, screen):
+        alpha = 100 + int(100 * math.sin(self.twinkle * 0.1))
+        brightness = max(50, min(255, alpha))
+        color = (brightness, brightness, brightness)
+        pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.size)
+
+
+class Laser:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.glow = 0
+        self.prev_y = y
+
+    def update(self):
+        self.prev_y = self.y
+        self.y -= main.Laser.speed
+        self.glow += 0.3
+
+    def is_off_screen(self):
+        return self.y < -main.Laser.height
+
+
+class Enemy:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.speed = 1.5 + random.uniform(0, 1)
+        self.rotation = 0
+        self.prev_y = y
+
+    def update(self):
+        self.prev_y = self.y
+        self.y += self.speed
+        self.rotation += 2
+
+    def is_off_screen(self):
+        return self.y > main.SCREEN_HEIGHT + main.Enemy.height
@@ -0,0 +1,68 @@
+"""Micro-benchmark: per-object Particle lists vs the NumPy ParticleSystem.
+
+    python -m benchmarks.particles [--frames N]
+
+Each case keeps N particles alive and times one update + cull + draw step.
+"""
+import argparse
+import random
+
+import pygame
+
+from benchmarks import legacy
+from benchmarks.common import summarize, print_table, time_calls
+
+import main
+from particles import ParticleSystem
+
+COLORS = (main.CUTE_PINK, main.GOLD, main.WHITE)
+
+
+def legacy_case(screen, count):
+    particles = []
+
+    def frame():
+        nonlocal particles
+        if not particles:
+            particles = [legacy.Particle(random.uniform(0, main.SCREEN_WIDTH),
+                                         random.uniform(0, main.SCREEN_HEIGHT),
+                                         random.choice(COLORS), random.randint(2, 5))
+                         for _ in range(count)]
+        particles = [p for p in particles if p.is_alive()]
+        for particle in particles:
+            particle.update()
+        for particle in particles:
+            particle.draw(screen)
+    return frame
+
+
+def system_case(screen, count):
+    system = ParticleSystem(capacity=max(count, 1))
+
+    def frame():
+        if not len(system):
+            system.burst(main.SCREEN_WIDTH / 2, main.SCREEN_HEIGHT / 2, count,
+                         COLORS, main.SCREEN_WIDTH // 2, (2, 5))
+        system.update()
+        system.draw(screen)
+    return frame
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args(argv)
+
+    screen = pygame.display.set_mode((main.SCREEN_WIDTH, main.SCREEN_HEIGHT))
+    rows = []
+    for count in args.counts:
+        for name, factory in (("Particle list", legacy_case), ("ParticleSystem", system_case)):
+            random.seed(1234)
+            samples = time_calls(factory(screen, count), args.frames)
+            rows.append((f"{name} x{count}", summarize(samples)))
+    print_table(f"particle update + draw ({args.frames} frames)", rows)
+
+
+if __name__ == "__main__":
+    run_benchmark()
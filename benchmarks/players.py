@@ -0,0 +1,103 @@
+"""Per-frame cost of 1-4 player games.
+
+    python -m benchmarks.players [--frames N] [--video hands.mp4]
+
+With synthetic hands, times tracking (player assignment + per-player
+gestures), the simulation step and drawing for each player count. With
+--video, also runs MediaPipe with max_num_hands = 1..4 over the file and
+reports inference time per frame and the number of ``Hands.process`` calls
+(one per frame, whatever the player count).
+"""
+import argparse
+import time
+
+import cv2
+import pygame
+
+from benchmarks.common import summarize, print_table
+
+import main
+from input_sources import SyntheticSource, VideoFileSource
+
+
+def game_case(players, frames, seed):
+    pygame.init()
+    source = SyntheticSource(realtime=False, seed=seed, hands=players)
+    game = main.Game(source=source, seed=seed, players=players)
+    tracking, step, draw = [], [], []
+    for _ in range(frames):
+        start = time.perf_counter()
+        result = game.process_hand_tracking()
+        tracked = time.perf_counter()
+        game.step(result.player_inputs(players))
+        stepped = time.perf_counter()
+        game.draw_everything(result.hand_detected, result.confidence, result.is_fist)
+        game.present()
+        drawn = time.perf_counter()
+        if game.game_over:
+            game.restart_game()
+        tracking.append(tracked - start)
+        step.append(stepped - tracked)
+        draw.append(drawn - stepped)
+    game.shutdown()
+    return tracking, step, draw
+
+
+def inference_case(path, players, mirror):
+    source = VideoFileSource(path, realtime=False, mirror=mirror)
+    tracker = main.HandTracker(players=players)
+    calls = 0
+    process = tracker.hands.process
+
+    def counted(image):
+        nonlocal calls
+        calls += 1
+        return process(image)
+    tracker.hands.process = counted
+
+    samples, hands = [], 0
+    while True:
+        ok, frame, _ = source.read()
+        if not ok:
+            break
+        if source.mirror:
+            frame = cv2.flip(frame, 1)
+        start = time.perf_counter()
+        tracker.find_hands(frame)
+        samples.append(time.perf_counter() - start)
+        hands += sum(landmarks is not None for landmarks in tracker.player_landmarks) \
+            if players > 1 else tracker.hand_detected
+    source.release()
+    return samples, calls, hands
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--video", help="also time MediaPipe inference over this video")
+    parser.add_argument("--no-mirror", action="store_true")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for players in range(1, main.MAX_PLAYERS + 1):
+        tracking, step, draw = game_case(players, args.frames, args.seed)
+        rows.append((f"{players}P tracking", summarize(tracking)))
+        rows.append((f"{players}P step", summarize(step)))
+        rows.append((f"{players}P draw + present", summarize(draw)))
+        rows.append((f"{players}P frame", summarize([a + b + c for a, b, c in
+                                                      zip(tracking, step, draw)])))
+    print_table(f"synthetic hands ({args.frames} frames)", rows)
+
+    if args.video:
+        rows = []
+        for players in range(1, main.MAX_PLAYERS + 1):
+            samples, calls, hands = inference_case(args.video, players, not args.no_mirror)
+            rows.append((f"{players}P inference", summarize(samples)))
+            print(f"{players}P: {calls} Hands.process calls over {len(samples)} frames, "
+                  f"{hands / max(len(samples), 1):.2f} hands per frame")
+        print_table(f"MediaPipe inference ({args.video})", rows)
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,89 @@
+"""Micro-benchmark: camera preview inset, copy chain vs shared buffers.
+
+    python -m benchmarks.preview [--frames N]
+
+Times turning a captured BGR frame into the preview inset and drawing it
+with the hand skeleton and gesture label, at webcam resolutions. The copy
+chains convert the whole frame to RGB and hand it to pygame (via
+``tobytes``/``fromstring`` or ``surfarray``) before scaling it down; the
+shared-buffer case is ``CameraPreview`` as the game uses it, refreshing
+only every few frames when one downscale costs more than
+``PREVIEW_BUDGET_MS``. Exits non-zero if its downscaling averages more than
+the budget per frame.
+"""
+import argparse
+import sys
+
+import cv2
+import numpy as np
+import pygame
+
+from benchmarks.common import time_calls, summarize, print_table
+
+import main
+from input_sources import SyntheticSource
+from preview import CameraPreview, PREVIEW_BUDGET_MS
+
+SIZES = ((640, 480), (1280, 720), (1920, 1080))
+
+
+def copy_chain(screen, frame, size, rect):
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    surface = pygame.image.fromstring(rgb.tobytes(), (frame.shape[1], frame.shape[0]), "RGB")
+    screen.blit(pygame.transform.smoothscale(surface, size), rect)
+
+
+def surfarray_chain(screen, frame, size, rect):
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    surface = pygame.surfarray.make_surface(rgb.swapaxes(0, 1))
+    screen.blit(pygame.transform.smoothscale(surface, size), rect)
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    screen = pygame.display.set_mode((main.SCREEN_WIDTH, main.SCREEN_HEIGHT))
+    ui = main.UI()
+    _, landmarks, _ = SyntheticSource(realtime=False, seed=args.seed, noise=0).read_landmarks()
+    rng = np.random.default_rng(args.seed)
+    rows, refreshes, over_budget = [], [], []
+    for width, height in SIZES:
+        frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        preview = CameraPreview()
+        preview.capture(frame)
+        size = (preview.width, preview.height)
+        rect = pygame.Rect(0, 0, *size)
+
+        def shared():
+            slot = preview.capture(frame)
+            ui.draw_camera_preview(screen, preview, slot, landmarks, "open_palm")
+
+        cases = [("tobytes chain", lambda: copy_chain(screen, frame, size, rect)),
+                 ("surfarray chain", lambda: surfarray_chain(screen, frame, size, rect)),
+                 ("shared buffer", shared)]
+        for name, fn in cases:
+            stats = summarize(time_calls(fn, args.frames))
+            rows.append((f"{width}x{height} {name}", stats))
+        downscale = summarize(time_calls(lambda: preview.capture(frame), args.frames))
+        refreshes.append((width, height, downscale["mean_ms"], preview.cost * 1000,
+                          preview.interval))
+    print_table(f"camera preview per frame ({args.frames} frames)", rows)
+
+    print(f"downscaling, budget {PREVIEW_BUDGET_MS} ms per frame")
+    print(f"  {'size':<12}{'per frame':>12}{'one refresh':>12}{'every':>8}")
+    for width, height, per_frame, cost, interval in refreshes:
+        print(f"  {f'{width}x{height}':<12}{per_frame:>12.3f}{cost:>12.3f}{interval:>8}")
+        if per_frame > PREVIEW_BUDGET_MS:
+            over_budget.append(f"{width}x{height} downscaling averages {per_frame:.3f} ms a frame")
+    for failure in over_budget:
+        print(f"FAIL: {failure}")
+    if over_budget:
+        sys.exit(1)
+    print("preview downscaling within budget at every size")
+
+
+if __name__ == "__main__":
+    run_benchmark()
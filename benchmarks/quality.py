@@ -0,0 +1,106 @@
+"""Headless check of the adaptive quality governor under a load spike.
+
+    python -m benchmarks.quality [--spike-ms MS] [--frames N]
+
+Runs a synthetic-hands game with ``quality="auto"`` and feeds the governor
+the same per-frame work time as the real loop. Part way through, a
+synthetic load is added that stands in for expensive hand inference: it
+busy-waits for ``--spike-ms`` at full inference resolution and scales with
+the inference pixel count and interval the current quality level asks for.
+Exits non-zero unless the governor brings frame time back under budget
+during the spike and restores full quality once the spike is over.
+tests/test_quality.py checks the same on modelled frame times, without
+running the game.
+"""
+import argparse
+import sys
+import time
+
+import pygame
+
+from benchmarks.common import summarize, print_table
+
+import main
+from input_sources import SyntheticSource
+
+FULL_INFERENCE_SIZE = 640
+
+
+def spike_load(tracker, spike):
+    # Seconds of modelled inference work at the tracker's current settings
+    size = tracker.inference_size or FULL_INFERENCE_SIZE
+    return spike * (size / FULL_INFERENCE_SIZE) ** 2 / tracker.inference_interval
+
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def run_phase(game, frames, spike):
+    samples, levels = [], []
+    for _ in range(frames):
+        start = time.perf_counter()
+        result = game.process_hand_tracking()
+        game.step(result.player_inputs())
+        game.draw_everything(result.hand_detected, result.confidence, result.is_fist)
+        game.present()
+        if spike:
+            busy_wait(spike_load(game.hand_tracker, spike))
+        if game.game_over:
+            game.restart_game()
+        frame_time = time.perf_counter() - start
+        game.update_quality(frame_time)
+        samples.append(frame_time)
+        levels.append(game.quality_level)
+    return samples, levels
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=900, help="frames per phase")
+    parser.add_argument("--spike-ms", type=float, default=24.0)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    source = SyntheticSource(realtime=False, seed=args.seed)
+    game = main.Game(source=source, seed=args.seed, quality="auto")
+    budget = game.governor.budget
+    settle = args.frames // 4
+
+    before, _ = run_phase(game, args.frames, 0.0)
+    during, levels = run_phase(game, args.frames, args.spike_ms / 1000)
+    after, after_levels = run_phase(game, args.frames * 2, 0.0)
+    game.shutdown()
+
+    rows = [("before spike", summarize(before)),
+            ("spike: first window", summarize(during[:game.governor.window])),
+            (f"spike: last {settle} frames", summarize(during[-settle:])),
+            ("after spike", summarize(after))]
+    print_table(f"frame work time (budget {budget * 1000:.1f} ms)", rows)
+    for frame, _, old, new, p90 in game.governor.history:
+        print(f"  frame {frame:5d}: {old} -> {new} (p90 {p90:.1f} ms)")
+
+    settled = summarize(during[-settle:])["p95_ms"]
+    restored = after_levels[-1] == "high"
+    ok = True
+    if levels[-1] == "high":
+        print("FAIL: quality was not lowered during the spike")
+        ok = False
+    if settled > budget * 1000:
+        print(f"FAIL: frame p95 {settled:.1f} ms stayed over budget during the spike")
+        ok = False
+    if not restored:
+        print(f"FAIL: quality stuck at {after_levels[-1]} after the spike")
+        ok = False
+    if not ok:
+        sys.exit(1)
+    recovered = after_levels.index("high")
+    print(f"quality held the budget during the spike ({levels[-1]}) and was back to high "
+          f"{recovered} frames after it")
+
+
+if __name__ == "__main__":
+    run_benchmark()
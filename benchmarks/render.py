@@ -0,0 +1,71 @@
+"""Frame-time comparison of the rendering paths.
+
+    python -m benchmarks.render [--frames N] [--enemies N]
+
+Compares the original per-row gradient + full flip, entities drawn from
+primitive shapes instead of cached sprites, the cached background + full
+flip, and the cached background + dirty-rect update.
+"""
+import argparse
+import random
+import time
+
+import pygame
+
+from benchmarks.common import summarize, print_table
+
+import main
+from input_sources import SyntheticSource
+
+
+def populate(game, enemies, lasers):
+    for _ in range(enemies):
+        game.enemies.spawn(random.randint(50, main.SCREEN_WIDTH - 50),
+                           random.randint(0, main.SCREEN_HEIGHT - 200))
+    for _ in range(lasers):
+        game.lasers.spawn(random.randint(50, main.SCREEN_WIDTH - 50),
+                          random.randint(100, main.SCREEN_HEIGHT - 200))
+
+
+def run_case(game, frames, legacy_gradient=False):
+    if legacy_gradient:
+        # Reproduce the pre-compositor path: rebuild the gradient every frame
+        game.compositor.begin_frame = lambda: main.draw_gradient(game.screen)
+    samples = []
+    for _ in range(frames):
+        game.spaceship.update(random.random())
+        game.update_game_objects()
+        start = time.perf_counter()
+        game.draw_everything(True, 0.9, False)
+        game.present()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--enemies", type=int, default=20)
+    parser.add_argument("--lasers", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    cases = [
+        ("gradient + flip", dict(dirty_rects=False), True),
+        ("primitive shapes + flip", dict(dirty_rects=False, sprite_cache=False), False),
+        ("cached bg + flip", dict(dirty_rects=False), False),
+        ("cached bg + dirty rects", dict(dirty_rects=True), False),
+    ]
+    rows = []
+    for name, kwargs, legacy in cases:
+        random.seed(1234)
+        pygame.init()
+        game = main.Game(source=SyntheticSource(realtime=False), **kwargs)
+        populate(game, args.enemies, args.lasers)
+        rows.append((name, run_case(game, args.frames, legacy)))
+        game.shutdown()
+    print_table(f"draw_everything + present ({args.frames} frames, "
+                f"{args.enemies} enemies, {args.lasers} lasers)", rows)
+
+
+if __name__ == "__main__":
+    run_benchmark()
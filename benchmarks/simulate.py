@@ -0,0 +1,92 @@
+"""Throughput of the headless batch simulation against worker count.
+
+    python -m benchmarks.simulate [--games N] [--bot nearest|random] [--workers 1 2 4 ...]
+
+Plays the same seeded batch with each worker count and reports games and
+simulation steps per second, plus speedup and parallel efficiency against
+one worker. The pool is started and warmed up before timing, so the
+figures are steady-state throughput. By default the worker counts are the
+powers of two up to ``os.cpu_count()``. Exits non-zero if any count's
+rows differ from the single-worker run.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+import simulate
+
+
+def worker_counts(cpus):
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def timed_batch(games, workers, chunk):
+    # (rows in game order, seconds spent playing)
+    chunks = [games[i:i + chunk] for i in range(0, len(games), chunk)]
+    if workers == 1:
+        start = time.perf_counter()
+        rows = [simulate.play_chunk(c) for c in chunks]
+        elapsed = time.perf_counter() - start
+    else:
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            # Warm up every worker (interpreter start, imports) before timing
+            pool.map(simulate.play_chunk, [games[:1]] * workers, chunksize=1)
+            start = time.perf_counter()
+            rows = list(pool.imap_unordered(simulate.play_chunk, chunks))
+            elapsed = time.perf_counter() - start
+    rows = np.concatenate(rows)
+    return rows[np.argsort(rows["game"])], elapsed
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--bot", default="nearest", choices=("nearest", "random"))
+    parser.add_argument("--max-seconds", type=float, default=30.0)
+    parser.add_argument("--workers", type=int, nargs="+")
+    parser.add_argument("--chunk", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rules = dict(spawn_interval=simulate.main.SPAWN_INTERVAL,
+                 enemy_speed=simulate.main.ENEMY_SPEED,
+                 laser_cooldown=simulate.main.LASER_COOLDOWN, horde=False)
+    games = [(i, args.seed + i, args.bot, rules, args.max_seconds) for i in range(args.games)]
+    cpus = os.cpu_count() or 1
+    counts = args.workers or worker_counts(cpus)
+
+    print(f"headless simulation: {args.games} {args.bot} games of up to {args.max_seconds:.0f} s "
+          f"({cpus} CPUs)")
+    print(f"  {'workers':<10}{'games/s':>10}{'steps/s':>12}{'speedup':>10}{'efficiency':>12}")
+    reference, base = None, None
+    mismatched = []
+    for workers in counts:
+        rows, elapsed = timed_batch(games, workers, args.chunk)
+        if reference is None:
+            reference = rows
+        elif not np.array_equal(rows, reference):
+            mismatched.append(workers)
+        rate = len(rows) / elapsed
+        base = base or rate
+        steps = rows["survival_s"].sum() * simulate.main.SIM_RATE / elapsed
+        print(f"  {workers:<10}{rate:>10.1f}{steps:>12,.0f}{rate / base:>10.2f}"
+              f"{rate / base / workers:>12.0%}")
+
+    for workers in mismatched:
+        print(f"FAIL: {workers} workers produced different results than 1")
+    if mismatched:
+        sys.exit(1)
+    print("every worker count produced the same games")
+
+
+if __name__ == "__main__":
+    run_benchmark()
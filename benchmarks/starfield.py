@@ -0,0 +1,54 @@
+"""Micro-benchmark: per-object Star list vs the vectorized Starfield.
+
+    python -m benchmarks.starfield [--frames N]
+"""
+import argparse
+import random
+
+import pygame
+
+from benchmarks import legacy
+from benchmarks.common import summarize, print_table, time_calls
+
+import main
+from starfield import Starfield, PARALLAX_LAYERS
+
+
+def legacy_case(screen, count):
+    stars = [legacy.Star() for _ in range(count)]
+
+    def frame():
+        for star in stars:
+            star.update()
+        for star in stars:
+            star.draw(screen)
+    return frame
+
+
+def starfield_case(screen, count):
+    starfield = Starfield(main.SCREEN_WIDTH, main.SCREEN_HEIGHT, count, PARALLAX_LAYERS, seed=1234)
+
+    def frame():
+        starfield.update()
+        starfield.draw(screen)
+    return frame
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 5000])
+    args = parser.parse_args(argv)
+
+    screen = pygame.display.set_mode((main.SCREEN_WIDTH, main.SCREEN_HEIGHT))
+    rows = []
+    for count in args.counts:
+        for name, factory in (("Star list", legacy_case), ("Starfield", starfield_case)):
+            random.seed(1234)
+            samples = time_calls(factory(screen, count), args.frames)
+            rows.append((f"{name} x{count}", summarize(samples)))
+    print_table(f"star update + draw ({args.frames} frames)", rows)
+
+
+if __name__ == "__main__":
+    run_benchmark()
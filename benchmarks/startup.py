@@ -0,0 +1,108 @@
+"""Startup timing by phase, with a time-to-first-frame regression check.
+
+    python -m benchmarks.startup [--repeat N] [--max-first-frame SECONDS]
+
+Starts the game in fresh processes on a short generated video clip, which
+takes the same path as a webcam (OpenCV, MediaPipe, model warm-up), once
+with everything loaded before the first frame ("eager", the old startup)
+and once with the background startup the game uses. Prints the per-phase
+breakdown of the last background run and the median time to first frame
+and to tracking ready for both. Times are from the moment ``main`` starts
+importing; interpreter startup is listed separately. Exits non-zero if the
+background time to first frame is over --max-first-frame.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+RESULT_PREFIX = "STARTUP "
+
+
+def write_clip(path, frames=60, fps=30, size=(640, 480)):
+    import cv2
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, size)
+    for i in range(frames):
+        writer.write(np.full((size[1], size[0], 3), 40 + i, dtype=np.uint8))
+    writer.release()
+
+
+def child(mode, clip, spawned_at):
+    # Runs in the fresh process: times the real startup and reports it as JSON
+    import main
+    from input_sources import VideoFileSource
+
+    game = main.Game(source=VideoFileSource(clip, lazy=True),
+                     background_startup=mode == "background")
+    try:
+        game.run()
+    finally:
+        game.shutdown()
+    result = game.startup.as_dict()
+    # perf_counter is system-wide on Linux, macOS and Windows
+    result["interpreter"] = main.IMPORT_START - spawned_at
+    print(RESULT_PREFIX + json.dumps(result))
+
+
+def run_child(mode, clip):
+    command = [sys.executable, "-m", "benchmarks.startup", "--child", mode, "--clip", clip,
+               "--spawned-at", repr(time.perf_counter())]
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    line = [line for line in output.splitlines() if line.startswith(RESULT_PREFIX)][-1]
+    return json.loads(line[len(RESULT_PREFIX):])
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-first-frame", type=float, default=0.5,
+                        help="fail if background startup takes longer to show a frame (s)")
+    parser.add_argument("--child", choices=("eager", "background"), help=argparse.SUPPRESS)
+    parser.add_argument("--clip", help=argparse.SUPPRESS)
+    parser.add_argument("--spawned-at", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child(args.child, args.clip, args.spawned_at)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        clip = os.path.join(tmp, "startup.avi")
+        write_clip(clip)
+        runs = {mode: [run_child(mode, clip) for _ in range(args.repeat)]
+                for mode in ("eager", "background")}
+
+    last = runs["background"][-1]
+    print("background startup phases (last run)")
+    print(f"  {'phase':<24}{'thread':<12}{'start ms':>10}{'took ms':>10}")
+    for phase in sorted(last["phases"], key=lambda phase: phase["start"]):
+        print(f"  {phase['phase']:<24}{phase['thread']:<12}{phase['start'] * 1000:>10.1f}"
+              f"{(phase['end'] - phase['start']) * 1000:>10.1f}")
+    for name, error in last["errors"]:
+        print(f"  {name} failed: {error}")
+
+    print(f"median over {args.repeat} runs (ms)")
+    print(f"  {'startup':<12}{'interpreter':>12}{'first frame':>14}{'tracking ready':>16}")
+    first_frame = {}
+    for mode, results in runs.items():
+        first_frame[mode] = statistics.median(r["marks"]["first frame"] for r in results)
+        ready = statistics.median(r["marks"]["tracking ready"] for r in results)
+        interpreter = statistics.median(r["interpreter"] for r in results)
+        print(f"  {mode:<12}{interpreter * 1000:>12.1f}{first_frame[mode] * 1000:>14.1f}"
+              f"{ready * 1000:>16.1f}")
+
+    if first_frame["background"] > args.max_first_frame:
+        print(f"FAIL: first frame after {first_frame['background'] * 1000:.0f} ms "
+              f"(limit {args.max_first_frame * 1000:.0f} ms)")
+        sys.exit(1)
+    print(f"first frame within {args.max_first_frame * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,179 @@
+"""Headless frame-time benchmark suite.
+
+    python -m benchmarks.suite run [--frames N] [--output results.json]
+    python -m benchmarks.suite compare baseline.json results.json [--threshold 0.2]
+
+``run`` plays seeded scenarios with a synthetic input source under SDL's
+dummy video driver and times each stage of a frame separately: tracking,
+update_game_objects, handle_collision and draw_everything (including the
+display present). Results are written as JSON with p50/p95/p99 per stage.
+
+``compare`` flags every stage whose chosen percentile got slower than the
+baseline by more than the threshold, and exits non-zero if any did.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+import pygame
+
+from benchmarks.common import summarize
+
+import main
+from input_sources import SyntheticSource
+
+STAGES = ("tracking", "update_game_objects", "handle_collision", "draw_everything")
+
+
+def fill_enemies(game, count):
+    while len(game.enemies) < count:
+        game.enemies.spawn(random.randint(50, main.SCREEN_WIDTH - 50),
+                           random.randint(-main.SCREEN_HEIGHT, 300))
+
+
+def fill_particles(game, count):
+    missing = count - len(game.particles)
+    if missing > 0:
+        game.particles.burst(main.SCREEN_WIDTH / 2, main.SCREEN_HEIGHT / 2, missing,
+                             (main.CUTE_PINK, main.GOLD, main.WHITE), main.SCREEN_WIDTH // 2, (2, 5))
+
+
+# name -> (source options, per-frame top-up run outside the timed stages,
+#          whether the scene is frozen in the game over state)
+SCENARIOS = {
+    "idle": (dict(dropout=1.0), None, False),
+    "normal": (dict(), None, False),
+    "enemies_500": (dict(), lambda game: fill_enemies(game, 500), False),
+    "horde_3k": (dict(), lambda game: fill_enemies(game, 3000), False),
+    "particles_10k": (dict(), lambda game: fill_particles(game, 10000), False),
+    "game_over": (dict(), None, True),
+}
+
+
+def run_scenario(name, frames, warmup, seed):
+    source_options, top_up, game_over = SCENARIOS[name]
+    pygame.init()
+    source = SyntheticSource(realtime=False, seed=seed, **source_options)
+    game = main.Game(source=source, seed=seed)
+    samples = {stage: [] for stage in STAGES + ("frame",)}
+
+    for frame in range(warmup + frames):
+        if top_up is not None:
+            top_up(game)
+        game.game_over = game_over
+        record = frame >= warmup
+
+        start = time.perf_counter()
+        result = game.process_hand_tracking()
+        tracked = time.perf_counter()
+        if not game.game_over:
+            game.apply_inputs(result.player_inputs())
+        else:
+            game.spaceship.snapshot()
+        applied = time.perf_counter()
+        game.update_game_objects()
+        updated = time.perf_counter()
+        if not game.game_over:
+            game.handle_collision()
+        collided = time.perf_counter()
+        game.draw_everything(result.hand_detected, result.confidence, result.is_fist)
+        game.present()
+        drawn = time.perf_counter()
+
+        if record:
+            samples["tracking"].append(tracked - start)
+            samples["update_game_objects"].append(updated - applied)
+            if not game_over:
+                samples["handle_collision"].append(collided - updated)
+            samples["draw_everything"].append(drawn - collided)
+            samples["frame"].append(drawn - start)
+
+    game.shutdown()
+    return {stage: summarize(values) for stage, values in samples.items() if values}
+
+
+def run(args):
+    names = args.scenario or list(SCENARIOS)
+    results = {
+        "meta": {
+            "frames": args.frames,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "scenarios": {},
+    }
+    for name in names:
+        stats = run_scenario(name, args.frames, args.warmup, args.seed)
+        results["scenarios"][name] = stats
+        print(f"{name:<16}" + "  ".join(f"{stage} p95 {s['p95_ms']:.3f}ms"
+                                       for stage, s in stats.items()), file=sys.stderr)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)["scenarios"]
+    with open(args.current) as f:
+        current = json.load(f)["scenarios"]
+
+    regressions = 0
+    for name, stages in sorted(current.items()):
+        for stage, stats in sorted(stages.items()):
+            base = baseline.get(name, {}).get(stage)
+            if base is None:
+                continue
+            old, new = base[args.metric], stats[args.metric]
+            delta = new - old
+            change = delta / old if old else 0.0
+            regressed = delta > args.min_delta_ms and change > args.threshold
+            regressions += regressed
+            flag = "REGRESSION" if regressed else "ok"
+            print(f"{name:<16}{stage:<22}{old:>10.3f}{new:>10.3f}ms {change:>+8.1%}  {flag}")
+    if regressions:
+        print(f"{regressions} stage(s) regressed by more than {args.threshold:.0%} ({args.metric})")
+        sys.exit(1)
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the scenarios and emit JSON")
+    run_parser.add_argument("--frames", type=int, default=300)
+    run_parser.add_argument("--warmup", type=int, default=60)
+    run_parser.add_argument("--seed", type=int, default=1234)
+    run_parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    run_parser.add_argument("--output", metavar="PATH")
+
+    compare_parser = commands.add_parser("compare", help="compare results against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--metric", default="p95_ms",
+                                choices=("mean_ms", "p50_ms", "p95_ms", "p99_ms"))
+    compare_parser.add_argument("--threshold", type=float, default=0.2,
+                                help="relative slowdown that counts as a regression")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=0.05,
+                                help="ignore absolute changes smaller than this")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        run(args)
+    else:
+        compare(args)
+
+
+if __name__ == "__main__":
+    run_benchmark()
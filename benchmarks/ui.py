@@ -0,0 +1,58 @@
+"""Micro-benchmark: immediate-mode vs retained-mode UI drawing.
+
+    python -m benchmarks.ui [--frames N]
+
+Times the HUD panels (hand status, score, instructions) during play and the
+game over screen, with inputs that change the way they do in a real game:
+the score ticks up now and then, confidence jitters and the hand comes and
+goes. The immediate-mode case is the same UI with its panel, text and
+overlay caches bypassed (Font objects stay cached in both).
+"""
+import argparse
+import random
+import time
+
+import pygame
+
+from benchmarks.common import summarize, print_table
+
+import main
+
+
+def ui_inputs(frame, rng):
+    # (hand detected, confidence, fist, score) for one frame
+    detected = (frame // 90) % 4 != 3
+    return detected, round(rng.uniform(0.8, 1.0), 2), (frame // 20) % 3 == 0, (frame // 45) * 10
+
+
+def run_case(screen, ui, frames, game_over):
+    rng = random.Random(1234)
+    samples = []
+    for frame in range(frames):
+        detected, confidence, fist, score = ui_inputs(frame, rng)
+        start = time.perf_counter()
+        ui.draw_hand_status(screen, detected, confidence, fist)
+        ui.draw_score_panel(screen, score)
+        ui.draw_instructions(screen)
+        if game_over:
+            ui.draw_game_over(screen, score)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def run_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600)
+    args = parser.parse_args(argv)
+
+    screen = pygame.display.set_mode((main.SCREEN_WIDTH, main.SCREEN_HEIGHT))
+    rows = []
+    for scene, game_over in (("play", False), ("game over", True)):
+        for name, retained in (("immediate", False), ("retained", True)):
+            rows.append((f"{scene}: {name}", run_case(screen, main.UI(retained), args.frames,
+                                                       game_over)))
+    print_table(f"UI draw per frame ({args.frames} frames)", rows)
+
+
+if __name__ == "__main__":
+    run_benchmark()
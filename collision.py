@@ -0,0 +1,137 @@
+"""Uniform-grid broadphase for laser/enemy/ship collisions.
+
+Entities are given as coordinate arrays plus one (width, height) per kind,
+matching the array-backed entity stores. The grid is rebuilt from the enemy
+arrays every tick in one vectorized pass: each enemy is expanded into the
+cells it covers and the (cell key, enemy index) pairs are sorted, so a query
+is a couple of binary searches. Lasers and the ship only run the narrow-phase
+AABB test against enemies sharing a grid cell, and hits are returned in the
+same order the old nested loop found them so callers can remove everything
+in one batch. With only a handful of enemies (normal play) building the grid
+costs more than it saves, so every pair is tested directly instead.
+"""
+import numpy as np
+
+# Cell coordinates are packed into one int64 key
+KEY_OFFSET = 1 << 20
+KEY_STRIDE = 1 << 21
+
+# Up to this many enemies, every pair is tested without the grid
+DIRECT_MAX_ENEMIES = 16
+
+
+def reach(size_a, size_b):
+    # Same axis-aligned test the game has always used:
+    # abs(a.x - b.x) < (a.width + b.width) // 2, likewise for height
+    return (size_a[0] + size_b[0]) // 2, (size_a[1] + size_b[1]) // 2
+
+
+class SpatialHash:
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.keys = np.empty(0, dtype=np.int64)
+        self.items = np.empty(0, dtype=np.int64)
+
+    def clear(self):
+        self.keys = self.keys[:0]
+        self.items = self.items[:0]
+
+    def cover(self, xs, ys, half_w, half_h):
+        # (box index, cell key) for every cell each box touches
+        size = self.cell_size
+        x0 = np.floor_divide(xs - half_w, size).astype(np.int64)
+        x1 = np.floor_divide(xs + half_w, size).astype(np.int64)
+        y0 = np.floor_divide(ys - half_h, size).astype(np.int64)
+        y1 = np.floor_divide(ys + half_h, size).astype(np.int64)
+        nx = x1 - x0 + 1
+        covered = nx * (y1 - y0 + 1)
+        index = np.repeat(np.arange(len(xs)), covered)
+        k = np.arange(len(index)) - np.repeat(np.cumsum(covered) - covered, covered)
+        cx = x0[index] + k % nx[index]
+        cy = y0[index] + k // nx[index]
+        return index, (cx + KEY_OFFSET) * KEY_STRIDE + (cy + KEY_OFFSET)
+
+    def build(self, xs, ys, half_w, half_h):
+        index, keys = self.cover(xs, ys, half_w, half_h)
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.items = index[order]
+
+    def pairs(self, xs, ys, half_w, half_h):
+        # (box index, item index) for every item sharing a cell with each
+        # box; a pair shows up once per shared cell
+        boxes, keys = self.cover(xs, ys, half_w, half_h)
+        starts = np.searchsorted(self.keys, keys, "left")
+        counts = np.searchsorted(self.keys, keys, "right") - starts
+        first = np.cumsum(counts) - counts
+        positions = np.arange(counts.sum()) - np.repeat(first - starts, counts)
+        return np.repeat(boxes, counts), self.items[positions]
+
+    def query(self, x, y, half_w, half_h):
+        # Sorted indices of everything sharing a cell with one box
+        _, items = self.pairs(np.array([x], dtype=np.float64), np.array([y], dtype=np.float64),
+                              half_w, half_h)
+        return np.unique(items)
+
+
+def brute_force_laser_hits(laser_x, laser_y, laser_size, enemy_x, enemy_y, enemy_size):
+    # Reference implementation of the original nested loop: every laser
+    # destroys at most the first live enemy (in index order) it touches
+    reach_x, reach_y = reach(laser_size, enemy_size)
+    hits = []
+    remaining = list(range(len(enemy_x)))
+    for li in range(len(laser_x)):
+        for ei in remaining:
+            if (abs(laser_x[li] - enemy_x[ei]) < reach_x and
+                    abs(laser_y[li] - enemy_y[ei]) < reach_y):
+                hits.append((li, ei))
+                remaining.remove(ei)
+                break
+    return hits
+
+
+def find_laser_hits(laser_x, laser_y, laser_size, enemy_x, enemy_y, enemy_size, grid):
+    # Returns (hit laser indices, destroyed enemy indices) as parallel arrays
+    # in hit order. The grid is left populated with the enemies so it can be
+    # reused for the ship check (empty when they are few enough to test directly).
+    direct = len(enemy_x) <= DIRECT_MAX_ENEMIES
+    if direct:
+        grid.clear()
+    else:
+        grid.build(enemy_x, enemy_y, enemy_size[0] / 2, enemy_size[1] / 2)
+    hit_lasers = []
+    destroyed = []
+    if len(enemy_x) and len(laser_x):
+        # Narrow phase on every candidate pair at once
+        if direct:
+            lasers, enemies = np.divmod(np.arange(len(laser_x) * len(enemy_x)), len(enemy_x))
+        else:
+            lasers, enemies = grid.pairs(laser_x, laser_y, laser_size[0] / 2, laser_size[1] / 2)
+        reach_x, reach_y = reach(laser_size, enemy_size)
+        touching = ((np.abs(enemy_x[enemies] - laser_x[lasers]) < reach_x) &
+                    (np.abs(enemy_y[enemies] - laser_y[lasers]) < reach_y))
+        # Sorted by laser, then enemy: each laser takes its first enemy that
+        # an earlier laser has not already destroyed
+        n = len(enemy_x)
+        dead = set()
+        last = -1
+        for key in np.unique(lasers[touching] * n + enemies[touching]).tolist():
+            li, ei = divmod(key, n)
+            if li != last and ei not in dead:
+                hit_lasers.append(li)
+                destroyed.append(ei)
+                dead.add(ei)
+                last = li
+    return np.array(hit_lasers, dtype=np.int64), np.array(destroyed, dtype=np.int64)
+
+
+def ship_hit(x, y, size, enemy_x, enemy_y, enemy_size, grid, destroyed=()):
+    if len(enemy_x) <= DIRECT_MAX_ENEMIES:
+        candidates = np.arange(len(enemy_x))
+    else:
+        candidates = grid.query(x, y, size[0] / 2, size[1] / 2)
+    if len(destroyed):
+        candidates = candidates[~np.isin(candidates, destroyed)]
+    reach_x, reach_y = reach(size, enemy_size)
+    return bool(((np.abs(enemy_x[candidates] - x) < reach_x) &
+                 (np.abs(enemy_y[candidates] - y) < reach_y)).any())
@@ -0,0 +1,86 @@
+"""Array-backed entity storage.
+
+An ``EntityStore`` keeps one preallocated NumPy array per component, with the
+live entities packed at ``[0:count)`` so every update is a vectorized slice.
+Entities are removed by swap-remove: the hole is filled from the tail, and a
+batch of removals is done in a single fancy-indexing pass. Each entity also
+gets a stable handle from a free list, so callers can refer to one entity
+across removals that move it.
+"""
+import numpy as np
+
+
+class EntityStore:
+    def __init__(self, capacity, components):
+        # components: {name: dtype}; each becomes an attribute array
+        self.capacity = capacity
+        self.count = 0
+        self.components = list(components)
+        for name, dtype in components.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.columns = [getattr(self, name) for name in self.components]
+
+        # Dense index -> handle, handle -> dense index, and a stack of free handles
+        self.handles = np.zeros(capacity, dtype=np.int32)
+        self.index_of = np.full(capacity, -1, dtype=np.int32)
+        self.free_handles = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self.free_count = capacity
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.index_of[self.handles[:self.count]] = -1
+        self.free_handles[:] = np.arange(self.capacity - 1, -1, -1, dtype=np.int32)
+        self.free_count = self.capacity
+        self.count = 0
+
+    def add(self, **values):
+        # Appends one entity and returns its handle, or -1 when the store is full
+        if self.count >= self.capacity:
+            return -1
+        i = self.count
+        for name, column in zip(self.components, self.columns):
+            column[i] = values.get(name, 0)
+        self.free_count -= 1
+        handle = self.free_handles[self.free_count]
+        self.handles[i] = handle
+        self.index_of[handle] = i
+        self.count += 1
+        return int(handle)
+
+    def reserve(self, n):
+        # Claims n slots at the tail for bulk initialisation; returns their slice
+        n = min(n, self.capacity - self.count)
+        start, end = self.count, self.count + n
+        handles = self.free_handles[self.free_count - n:self.free_count][::-1]
+        self.free_count -= n
+        self.handles[start:end] = handles
+        self.index_of[handles] = np.arange(start, end, dtype=np.int32)
+        self.count = end
+        return slice(start, end)
+
+    def remove(self, indices):
+        # Swap-removes the entities at the given dense indices in one pass
+        if not len(indices):
+            return
+        dead = np.unique(np.asarray(indices, dtype=np.int64))
+        n = self.count
+        new_n = n - len(dead)
+
+        # Holes below the new end are filled by the live entities past it
+        holes = dead[dead < new_n]
+        tail = np.arange(new_n, n)
+        tail = tail[~np.isin(tail, dead, assume_unique=True)]
+
+        freed = self.handles[dead]
+        self.index_of[freed] = -1
+        self.free_handles[self.free_count:self.free_count + len(freed)] = freed
+        self.free_count += len(freed)
+
+        if len(holes):
+            for column in self.columns:
+                column[holes] = column[tail]
+            self.handles[holes] = self.handles[tail]
+            self.index_of[self.handles[holes]] = holes
+        self.count = new_n
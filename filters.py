@@ -0,0 +1,128 @@
+"""Hand-position filters between the tracker and the ship.
+
+Every simulation step the ship asks its filter for a position in screen
+pixels, passing the latest hand x (None while no hand is tracked), the
+capture time ``t`` of the result it came from, and ``now``. A measurement
+is new when its capture time changes, so repeats (inference skipped, camera
+slower than the simulation) only advance the prediction.
+
+- lerp: the original behaviour, chasing the last measurement by a fixed
+  fraction every step. No prediction; kept for comparison.
+- one-euro: the One-Euro filter (Casiez et al., CHI 2012), a low-pass whose
+  cutoff rises with speed: steady hands are smoothed hard, fast ones
+  followed closely.
+- kalman: a constant-velocity Kalman filter on position and velocity.
+
+The two predictive filters extrapolate with their velocity estimate from the
+last measurement's capture time to ``now``, which makes up for capture and
+inference latency. While the hand is lost they keep extrapolating up to
+``max_lead`` past the last measurement and then hold, and after a gap of
+``reset_after`` they restart from the next measurement instead of treating
+the jump as motion.
+"""
+import math
+
+FILTERS = ("lerp", "one-euro", "kalman")
+
+
+def make_filter(name, x):
+    # x: starting position in pixels
+    if name == "lerp":
+        return LerpFilter(x)
+    if name == "one-euro":
+        return OneEuroFilter()
+    if name == "kalman":
+        return KalmanFilter()
+    raise ValueError(f"unknown hand filter {name!r}")
+
+
+class LerpFilter:
+    def __init__(self, x, alpha=0.15):
+        self.x = x
+        self.target = x
+        self.alpha = alpha
+
+    def step(self, x, t, now):
+        if x is not None:
+            self.target = x
+        self.x += (self.target - self.x) * self.alpha
+        return self.x
+
+
+class PredictiveFilter:
+    # Shared measurement bookkeeping and prediction; subclasses implement
+    # start(x) and measure(x, dt) on self.x / self.v
+    def __init__(self, max_lead=0.1, reset_after=0.5):
+        self.max_lead = max_lead
+        self.reset_after = reset_after
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.v = 0.0
+        self.t = None
+
+    def step(self, x, t, now):
+        if x is not None and t != self.t:
+            if self.t is None or t - self.t > self.reset_after:
+                self.start(x)
+            elif t > self.t:
+                self.measure(x, t - self.t)
+            self.t = t
+        if self.x is None:
+            return None
+        lead = min(max(now - self.t, 0.0), self.max_lead)
+        return self.x + self.v * lead
+
+
+class OneEuroFilter(PredictiveFilter):
+    def __init__(self, min_cutoff=1.0, beta=0.02, d_cutoff=1.0, max_lead=0.1, reset_after=0.5):
+        # Cutoffs in Hz; beta in Hz per pixel/second of hand speed
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        super().__init__(max_lead, reset_after)
+
+    @staticmethod
+    def smoothing(cutoff, dt):
+        r = 2 * math.pi * cutoff * dt
+        return r / (r + 1)
+
+    def start(self, x):
+        self.x = x
+        self.v = 0.0
+
+    def measure(self, x, dt):
+        self.v += self.smoothing(self.d_cutoff, dt) * ((x - self.x) / dt - self.v)
+        cutoff = self.min_cutoff + self.beta * abs(self.v)
+        self.x += self.smoothing(cutoff, dt) * (x - self.x)
+
+
+class KalmanFilter(PredictiveFilter):
+    def __init__(self, accel_noise=2000.0, measurement_noise=8.0, max_lead=0.1, reset_after=0.5):
+        # accel_noise: hand acceleration (px/s^2) the model allows for;
+        # measurement_noise: landmark jitter (px)
+        self.q = accel_noise ** 2
+        self.r = measurement_noise ** 2
+        super().__init__(max_lead, reset_after)
+
+    def start(self, x):
+        self.x = x
+        self.v = 0.0
+        # Position known to the measurement noise, velocity unknown
+        self.p00, self.p01, self.p11 = self.r, 0.0, 1e6
+
+    def measure(self, x, dt):
+        # Predict: x += v dt, with white-noise acceleration
+        q = self.q
+        self.x += self.v * dt
+        p00 = self.p00 + dt * (2 * self.p01 + dt * self.p11) + q * dt ** 4 / 4
+        p01 = self.p01 + dt * self.p11 + q * dt ** 3 / 2
+        p11 = self.p11 + q * dt ** 2
+        # Update with the measured position
+        s = p00 + self.r
+        k0, k1 = p00 / s, p01 / s
+        residual = x - self.x
+        self.x += k0 * residual
+        self.v += k1 * residual
+        self.p00, self.p01, self.p11 = (1 - k0) * p00, (1 - k0) * p01, p11 - k1 * p01
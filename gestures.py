@@ -0,0 +1,114 @@
+"""Vectorized gesture classification with temporal hysteresis.
+
+Features are computed from a (21, 3) landmark array in one pass:
+
+- finger extension: distance of each fingertip from a reference point divided
+  by the distance of the finger's middle joint from that point. It does not
+  depend on hand orientation or handedness.
+- pinch: thumb-tip to index-tip distance divided by palm size.
+
+Gestures are data. Each one is a name, a finger pattern ("1" extended,
+"0" curled, "?" don't care; thumb first) and an optional pinch requirement.
+The first matching gesture in the list wins.
+"""
+import numpy as np
+
+WRIST, THUMB_TIP, INDEX_TIP, MIDDLE_MCP, PINKY_MCP = 0, 4, 8, 9, 17
+
+TIPS = np.array([4, 8, 12, 16, 20])
+JOINTS = np.array([3, 6, 10, 14, 18])
+# The thumb is measured from the pinky MCP, the other fingers from the wrist
+REFERENCES = np.array([PINKY_MCP, WRIST, WRIST, WRIST, WRIST])
+
+# thumbs_up comes before fist, whose thumb is don't care
+DEFAULT_GESTURES = [
+    {"name": "pinch", "fingers": "?????", "pinch": True},
+    {"name": "thumbs_up", "fingers": "10000", "pinch": False},
+    {"name": "fist", "fingers": "?0000", "pinch": False},
+    {"name": "point", "fingers": "?1000", "pinch": False},
+    {"name": "victory", "fingers": "?1100", "pinch": False},
+    {"name": "rock", "fingers": "?1001", "pinch": False},
+    {"name": "open_palm", "fingers": "11111", "pinch": False},
+]
+
+
+class GestureEngine:
+    def __init__(self, gestures=DEFAULT_GESTURES, extend_on=(1.05, 1.15, 1.15, 1.15, 1.15),
+                 extend_off=(0.9, 0.95, 0.95, 0.95, 0.95), pinch_on=0.25, pinch_off=0.35,
+                 enter_frames=2, exit_frames=3):
+        # Feature hysteresis: a curled finger must pass extend_on to count as
+        # extended, and an extended finger stays extended until extend_off.
+        # Thresholds are per finger (thumb first); the thumb's joints are
+        # closer together so its ratio swings less.
+        self.extend_on = np.broadcast_to(np.asarray(extend_on, dtype=np.float64), (5,))
+        self.extend_off = np.broadcast_to(np.asarray(extend_off, dtype=np.float64), (5,))
+        self.pinch_on = pinch_on
+        self.pinch_off = pinch_off
+        # Temporal hysteresis: a new gesture must be seen for enter_frames in
+        # a row, and a lost hand keeps its gesture for exit_frames
+        self.enter_frames = enter_frames
+        self.exit_frames = exit_frames
+        self.set_gestures(gestures)
+        self.reset()
+
+    def set_gestures(self, gestures):
+        self.names = [g["name"] for g in gestures]
+        self.patterns = np.array([[c == "1" for c in g["fingers"]] for g in gestures], dtype=bool)
+        self.care = np.array([[c != "?" for c in g["fingers"]] for g in gestures], dtype=bool)
+        pinch = [g.get("pinch") for g in gestures]
+        self.pinch_care = np.array([p is not None for p in pinch], dtype=bool)
+        self.pinch_required = np.array([bool(p) for p in pinch], dtype=bool)
+
+    def reset(self):
+        self.extended = np.zeros(5, dtype=bool)
+        self.pinching = False
+        self.gesture = None
+        self.candidate = None
+        self.candidate_frames = 0
+        self.missing_frames = 0
+
+    def features(self, landmarks, aspect=4 / 3):
+        # Returns (extension ratio per finger, pinch ratio). x is scaled by
+        # the frame aspect ratio so distances are isotropic in pixels.
+        points = landmarks[:, :2] * (aspect, 1.0)
+        refs = points[REFERENCES]
+        tip_dist = np.linalg.norm(points[TIPS] - refs, axis=1)
+        joint_dist = np.linalg.norm(points[JOINTS] - refs, axis=1)
+        extension = tip_dist / np.maximum(joint_dist, 1e-6)
+        palm = max(float(np.linalg.norm(points[MIDDLE_MCP] - points[WRIST])), 1e-6)
+        pinch = float(np.linalg.norm(points[THUMB_TIP] - points[INDEX_TIP])) / palm
+        return extension, pinch
+
+    def classify(self, extension, pinch):
+        # Raw per-frame gesture, applying only the feature hysteresis
+        self.extended = np.where(self.extended, extension > self.extend_off,
+                                 extension > self.extend_on)
+        self.pinching = pinch < (self.pinch_off if self.pinching else self.pinch_on)
+        finger_ok = ~((self.patterns != self.extended) & self.care).any(axis=1)
+        pinch_ok = ~self.pinch_care | (self.pinch_required == self.pinching)
+        matches = np.flatnonzero(finger_ok & pinch_ok)
+        return self.names[matches[0]] if len(matches) else None
+
+    def update(self, landmarks, aspect=4 / 3):
+        # Feed one frame (None when no hand) and return the stable gesture
+        if landmarks is None:
+            self.missing_frames += 1
+            if self.missing_frames >= self.exit_frames:
+                self.reset()
+            return self.gesture
+        self.missing_frames = 0
+
+        raw = self.classify(*self.features(landmarks, aspect))
+        if raw == self.gesture:
+            self.candidate = None
+            self.candidate_frames = 0
+        elif raw == self.candidate:
+            self.candidate_frames += 1
+        else:
+            self.candidate = raw
+            self.candidate_frames = 1
+        if self.candidate_frames >= self.enter_frames:
+            self.gesture = self.candidate
+            self.candidate = None
+            self.candidate_frames = 0
+        return self.gesture
@@ -0,0 +1,68 @@
+"""Low-power idle mode.
+
+Nobody is playing while the game over screen is up, or while no hand has
+been seen for a while, yet the always-on loop still runs hand inference on
+every camera frame and draws 60 frames a second. The monitor decides when
+the game may idle:
+
+- on the game over screen, ``game_over_after`` seconds after the game ended
+  (the explosion has finished by then), whether or not a hand is visible;
+- while playing, once no hand has been detected for ``idle_after`` seconds.
+
+While idle the game polls the camera every ``IDLE_POLL_INTERVAL`` with a
+small inference input, draws at ``IDLE_FPS`` and stops updating whatever
+nothing on screen depends on. It wakes on the first frame a hand is
+detected again (while playing) or the game leaves the game over screen,
+and that frame already runs at the full rate.
+"""
+IDLE_AFTER = 5.0             # seconds without a hand before a running game idles
+GAME_OVER_IDLE_AFTER = 2.0   # seconds on the game over screen before it idles
+IDLE_POLL_INTERVAL = 0.2     # seconds between camera frames while idle
+IDLE_FPS = 15                # draw rate while idle (four simulation steps a frame)
+IDLE_INFERENCE_SIZE = 256    # longest side of the inference input while idle
+
+
+class IdleMonitor:
+    def __init__(self, idle_after=IDLE_AFTER, game_over_after=GAME_OVER_IDLE_AFTER, log=print):
+        self.idle_after = idle_after
+        self.game_over_after = game_over_after
+        self.log = log
+        self.idle = False
+        self.last_hand = None
+        self.game_over_since = None
+        # (time, reason) of every wake-up, for measuring
+        self.wakes = []
+
+    def update(self, now, hand_detected, game_over):
+        # Feeds one frame's tracking result; returns True when idle changed
+        if self.last_hand is None or hand_detected:
+            self.last_hand = now
+        restarted = False
+        if game_over:
+            if self.game_over_since is None:
+                self.game_over_since = now
+        elif self.game_over_since is not None:
+            # Restarted: the player gets the full grace period again
+            self.game_over_since = None
+            self.last_hand = now
+            restarted = True
+
+        if self.idle:
+            if self.game_over_since is None and (hand_detected or restarted):
+                reason = "restarted" if restarted else "hand detected"
+                self.idle = False
+                self.wakes.append((now, reason))
+                self.log(f"⚡ Awake ({reason})")
+                return True
+            return False
+
+        if self.game_over_since is not None:
+            if now - self.game_over_since >= self.game_over_after:
+                self.idle = True
+                self.log("💤 Idle on the game over screen")
+                return True
+        elif now - self.last_hand >= self.idle_after:
+            self.idle = True
+            self.log(f"💤 Idle (no hand for {self.idle_after:.0f} s)")
+            return True
+        return False
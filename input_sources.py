@@ -0,0 +1,307 @@
+"""Input-source backends for hand tracking.
+
+Every source exposes the same small interface:
+
+    read() -> (ok, frame, timestamp)   BGR frame ready for inference
+    frame_size                         (width, height) of the frames
+    exhausted                          True once a finite source has ended
+    open()                             opens the device or file (idempotent)
+    release()
+
+File and camera sources open in their constructor unless created with
+``lazy=True``, in which case ``open()`` does the slow part (importing
+OpenCV, opening the device) and can run on a background thread. OpenCV is
+only imported by the sources that need it.
+
+``SyntheticSource`` sets ``provides_landmarks`` and implements
+``read_landmarks()`` (and ``read_hands()`` for several hands) instead, so the
+tracker skips inference entirely.
+"""
+import glob
+import math
+import os
+import time
+
+import numpy as np
+
+
+class FrameSource:
+    provides_landmarks = False
+    exhausted = False
+    mirror = True
+    frame_size = (640, 480)
+
+    def open(self):
+        pass
+
+    def read(self):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+
+class Pacer:
+    # Spaces frames out at a nominal frame rate. Without real-time pacing the
+    # source runs as fast as the consumer can go.
+    def __init__(self, fps, realtime):
+        self.interval = 1.0 / fps if fps and fps > 0 else 0.0
+        self.realtime = realtime and self.interval > 0
+        self.start = None
+
+    def due_index(self):
+        # Index of the frame that should be on screen right now
+        now = time.perf_counter()
+        if self.start is None:
+            self.start = now
+        return int((now - self.start) / self.interval)
+
+    def wait_for(self, index):
+        if self.start is None:
+            self.start = time.perf_counter()
+        delay = self.start + index * self.interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class CameraSource(FrameSource):
+    def __init__(self, index=0, width=640, height=480, fourcc=None, mirror=True, lazy=False):
+        self.index = index
+        self.fourcc = fourcc
+        self.mirror = mirror
+        self.frame_size = (width, height)
+        self.cap = None
+        if not lazy:
+            self.open()
+
+    def open(self):
+        if self.cap is not None:
+            return
+        import cv2
+        width, height = self.frame_size
+        cap = cv2.VideoCapture(self.index)
+        if self.fourcc:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        # The driver may not honour the requested size
+        actual_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or width
+        actual_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or height
+        self.frame_size = (actual_w, actual_h)
+        self.cap = cap
+
+    def read(self):
+        ret, frame = self.cap.read()
+        timestamp = time.perf_counter()
+        if ret:
+            self.frame_size = (frame.shape[1], frame.shape[0])
+        return ret, frame, timestamp
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    def __init__(self, path, realtime=True, loop=False, mirror=True, lazy=False):
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.mirror = mirror
+        self.cap = None
+        self.index = 0
+        self.exhausted = False
+        if not lazy:
+            self.open()
+
+    def open(self):
+        if self.cap is not None:
+            return
+        import cv2
+        cap = cv2.VideoCapture(self.path)
+        if not cap.isOpened():
+            raise IOError(f"Could not open video file {self.path}")
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.pacer = Pacer(self.fps, self.realtime)
+        self.frame_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                           int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        self.cap = cap
+
+    def read(self):
+        if self.exhausted:
+            return False, None, time.perf_counter()
+        if self.pacer.realtime:
+            # Drop frames the consumer was too slow for, wait for early ones
+            due = self.pacer.due_index()
+            while self.index < due and self.cap.grab():
+                self.index += 1
+            self.pacer.wait_for(self.index)
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            import cv2
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.pacer.start = None
+            self.index = 0
+            ret, frame = self.cap.read()
+        timestamp = time.perf_counter()
+        if not ret:
+            self.exhausted = True
+            return False, None, timestamp
+        self.index += 1
+        self.frame_size = (frame.shape[1], frame.shape[0])
+        return True, frame, timestamp
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+
+class ImageSequenceSource(FrameSource):
+    EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+    def __init__(self, pattern, fps=30.0, realtime=True, loop=False, mirror=True, lazy=False):
+        # Accepts a directory or a glob pattern
+        if os.path.isdir(pattern):
+            paths = [os.path.join(pattern, name) for name in os.listdir(pattern)
+                     if name.lower().endswith(self.EXTENSIONS)]
+        else:
+            paths = glob.glob(pattern)
+        self.paths = sorted(paths)
+        if not self.paths:
+            raise IOError(f"No images found for {pattern}")
+        self.loop = loop
+        self.mirror = mirror
+        self.pacer = Pacer(fps, realtime)
+        self.index = 0
+        self.exhausted = False
+        self.opened = False
+        if not lazy:
+            self.open()
+
+    def open(self):
+        if self.opened:
+            return
+        import cv2
+        first = cv2.imread(self.paths[0])
+        if first is None:
+            raise IOError(f"Could not read image {self.paths[0]}")
+        self.frame_size = (first.shape[1], first.shape[0])
+        self.opened = True
+
+    def read(self):
+        if self.pacer.realtime:
+            self.index = max(self.index, self.pacer.due_index())
+            self.pacer.wait_for(self.index)
+        if self.index >= len(self.paths):
+            if not self.loop:
+                self.exhausted = True
+                return False, None, time.perf_counter()
+            self.index = 0
+            self.pacer.start = None
+        import cv2
+        frame = cv2.imread(self.paths[self.index])
+        timestamp = time.perf_counter()
+        self.index += 1
+        if frame is None:
+            return False, None, timestamp
+        self.frame_size = (frame.shape[1], frame.shape[0])
+        return True, frame, timestamp
+
+
+# Open hand, normalized to hand size, relative to the middle-finger MCP
+# (landmark 9). Image y grows downwards.
+OPEN_HAND = np.array([
+    (0.00, 0.40, 0), (-0.20, 0.30, 0), (-0.32, 0.18, 0), (-0.42, 0.08, 0), (-0.50, -0.02, 0),
+    (-0.12, 0.00, 0), (-0.14, -0.22, 0), (-0.15, -0.36, 0), (-0.16, -0.48, 0),
+    (0.00, 0.00, 0), (0.00, -0.25, 0), (0.00, -0.40, 0), (0.00, -0.53, 0),
+    (0.12, 0.02, 0), (0.13, -0.20, 0), (0.14, -0.34, 0), (0.15, -0.45, 0),
+    (0.23, 0.06, 0), (0.26, -0.12, 0), (0.28, -0.22, 0), (0.30, -0.31, 0),
+], dtype=np.float32)
+
+# Fist: fingertips curl back below their PIP joints, thumb tucked across
+FIST = OPEN_HAND.copy()
+FIST[[3, 4]] = [(-0.20, 0.10, 0), (-0.05, 0.05, 0)]
+for tip, pip in ((8, 6), (12, 10), (16, 14), (20, 18)):
+    FIST[tip - 1] = FIST[pip] + (0.0, 0.08, 0)
+    FIST[tip] = FIST[pip] + (0.0, 0.12, 0)
+
+
+class SyntheticSource(FrameSource):
+    provides_landmarks = True
+
+    def __init__(self, width=640, height=480, fps=30.0, realtime=True, sweep_period=4.0,
+                 fist_period=1.5, dropout=0.0, noise=0.002, seed=None, duration=None, hands=1):
+        # The hand sweeps left/right, closes into a fist for part of every
+        # fist_period and randomly drops out to exercise the no-hand path.
+        # With several hands each one sweeps its own lane of the frame,
+        # alternating right and left hands, out of phase with the others.
+        self.frame_size = (width, height)
+        self.fps = fps
+        self.pacer = Pacer(fps, realtime)
+        self.sweep_period = sweep_period
+        self.fist_period = fist_period
+        self.dropout = dropout
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+        self.frames = int(duration * fps) if duration else None
+        self.index = 0
+        self.exhausted = False
+        self.landmarks = np.empty((21, 3), dtype=np.float32)
+        self.hands = hands
+        self.hand_buffers = np.empty((hands, 21, 3), dtype=np.float32)
+
+    def next_time(self):
+        # Advances to the next frame; returns (t, timestamp) or None once finished
+        if self.frames is not None and self.index >= self.frames:
+            self.exhausted = True
+            return None
+        if self.pacer.realtime:
+            self.pacer.wait_for(self.index)
+        t = self.index / self.fps
+        self.index += 1
+        return t, time.perf_counter()
+
+    def pose(self, out, shape, center_x, left=False):
+        # Writes the hand shape centred at center_x into out, mirrored for a left hand
+        scale_x = -0.25 if left else 0.25
+        np.multiply(shape, (scale_x, 0.25 * self.frame_size[0] / self.frame_size[1], 0.25),
+                    out=out)
+        out += (center_x, 0.55, 0.0)
+        if self.noise:
+            out[:, :2] += self.rng.normal(0, self.noise, (21, 2))
+        return out
+
+    def read_landmarks(self):
+        # Returns (ok, landmarks or None, timestamp); landmarks are normalized
+        frame = self.next_time()
+        if frame is None:
+            return False, None, time.perf_counter()
+        t, timestamp = frame
+        if self.dropout and self.rng.random() < self.dropout:
+            return True, None, timestamp
+
+        center_x = 0.5 + 0.4 * math.sin(2 * math.pi * t / self.sweep_period)
+        closed = (t % self.fist_period) < self.fist_period * 0.3
+        return True, self.pose(self.landmarks, FIST if closed else OPEN_HAND, center_x), timestamp
+
+    def read_hands(self):
+        # Returns (ok, [landmarks, ...], [handedness, ...], timestamp) for the
+        # hands visible this frame
+        frame = self.next_time()
+        if frame is None:
+            return False, [], [], time.perf_counter()
+        t, timestamp = frame
+        hands, handedness = [], []
+        for h in range(self.hands):
+            if self.dropout and self.rng.random() < self.dropout:
+                continue
+            lane = (h + 0.5) / self.hands
+            center_x = lane + 0.4 / self.hands * math.sin(2 * math.pi * t / self.sweep_period + h)
+            closed = ((t + h * self.fist_period / self.hands) % self.fist_period) < self.fist_period * 0.3
+            left = h % 2 == 1
+            hands.append(self.pose(self.hand_buffers[h], FIST if closed else OPEN_HAND, center_x, left))
+            handedness.append("Left" if left else "Right")
+        return True, hands, handedness, timestamp
+
+    def read(self):
+        raise TypeError("SyntheticSource provides landmarks, not frames")
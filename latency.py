@@ -0,0 +1,193 @@
+"""Motion-to-photon latency histograms.
+
+Every tracked frame carries a list of ``perf_counter`` stamps, one per
+milestone, starting with the capture timestamp from the frame source:
+
+- capture: the source returned the frame (or synthetic landmarks)
+- flip: the frame was mirrored (camera/video sources only)
+- inference: MediaPipe returned (camera/video sources only)
+- gesture: the fist / hand position decision was made
+- target: a simulation step handed the result to ``Spaceship.update``
+- present: the first ``pygame.display.flip()`` after that step
+
+Each stage histogram holds the time since the previous milestone that was
+stamped, and ``end_to_end`` the time from capture to present. Results that
+never reach the screen (superseded by a newer one before a simulation step
+used them, or arriving during game over) are counted but not timed.
+
+Fist latency is measured per player from the capture of the first frame of
+a fist to the step that spawned its laser (``fist_to_spawn``) and to the
+flip that showed it (``fist_to_laser``). Fists that start while the laser
+cooldown is running are not timed, since the wait there is game design
+rather than latency.
+
+Histograms use fixed log-spaced bins, so recording never allocates and
+percentiles are accurate to the bin width (about 5%).
+"""
+import bisect
+import math
+import time
+
+import numpy as np
+
+MILESTONES = ("capture", "flip", "inference", "gesture", "target", "present")
+CAPTURE, FLIP, INFERENCE, GESTURE, TARGET, PRESENT = range(len(MILESTONES))
+HISTOGRAMS = MILESTONES[1:] + ("end_to_end", "fist_to_spawn", "fist_to_laser")
+
+# Bin edges in seconds, 0.1 ms to 10 s
+BIN_EDGES = np.geomspace(1e-4, 10.0, 241)
+
+
+def new_stamps(capture):
+    return [capture] + [None] * (len(MILESTONES) - 1)
+
+
+class Histogram:
+    def __init__(self, edges=BIN_EDGES):
+        self.edges = edges
+        self.edge_list = edges.tolist()
+        # counts[i] holds samples in [edges[i - 1], edges[i]); the first and
+        # last bins catch everything outside the range
+        self.counts = np.zeros(len(edges) + 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.counts[bisect.bisect_right(self.edge_list, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def clear(self):
+        self.counts[:] = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct):
+        # Geometric middle of the bin holding the pct-th sample, clamped to
+        # the observed range
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        i = int(np.searchsorted(np.cumsum(self.counts), rank))
+        low = self.edges[i - 1] if i > 0 else self.min
+        high = self.edges[i] if i < len(self.edges) else self.max
+        return float(min(max(math.sqrt(low * high), self.min), self.max))
+
+    def bars(self, width=40, rows=12):
+        # Text histogram: the occupied range merged into at most `rows` rows
+        occupied = np.flatnonzero(self.counts)
+        if not len(occupied):
+            return []
+        first, last = int(occupied[0]), int(occupied[-1]) + 1
+        step = max(1, math.ceil((last - first) / rows))
+        groups = [(i, min(i + step, last)) for i in range(first, last, step)]
+        totals = [int(self.counts[a:b].sum()) for a, b in groups]
+        peak = max(totals)
+        lines = []
+        for (a, b), total in zip(groups, totals):
+            low = self.edges[a - 1] if a > 0 else 0.0
+            high = self.edges[b - 1] if b - 1 < len(self.edges) else math.inf
+            bar = "#" * max(1 if total else 0, round(total / peak * width))
+            lines.append(f"{low * 1000:8.2f} - {high * 1000:8.2f} ms {total:6d} {bar}")
+        return lines
+
+
+class LatencyTracker:
+    def __init__(self, players=1):
+        self.histograms = {name: Histogram() for name in HISTOGRAMS}
+        self.current = None
+        self.current_seq = -1
+        self.unshown = 0
+        # Per player: capture stamp of a fist not yet answered by a laser
+        self.fist_start = [None] * players
+        self.fist_down = [False] * players
+        # Fist capture stamps whose laser has spawned but not been shown
+        self.fists_spawned = []
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.clear()
+        self.unshown = 0
+
+    def begin(self, result, inputs):
+        # Called with every result the main loop picks up; repeats of the
+        # last result (pipelined mode) are ignored
+        if result.stamps is None or result.seq == self.current_seq:
+            return
+        if self.current is not None:
+            self.unshown += 1
+        self.current = result.stamps
+        self.current_seq = result.seq
+        capture = result.stamps[CAPTURE]
+        for player, (_, is_fist, detected) in enumerate(inputs):
+            fist = is_fist and detected
+            if fist and not self.fist_down[player]:
+                self.fist_start[player] = capture
+            elif not fist:
+                self.fist_start[player] = None
+            self.fist_down[player] = fist
+
+    def target(self):
+        # A simulation step applied the current result
+        stamps = self.current
+        if stamps is not None and stamps[TARGET] is None:
+            stamps[TARGET] = time.perf_counter()
+
+    def laser_spawned(self, player):
+        start = self.fist_start[player]
+        if start is not None:
+            self.histograms["fist_to_spawn"].add(time.perf_counter() - start)
+            self.fists_spawned.append(start)
+            self.fist_start[player] = None
+
+    def laser_blocked(self, player):
+        # The fist met a running cooldown: its laser will be late by design
+        self.fist_start[player] = None
+
+    def presented(self):
+        now = time.perf_counter()
+        for start in self.fists_spawned:
+            self.histograms["fist_to_laser"].add(now - start)
+        self.fists_spawned.clear()
+
+        stamps = self.current
+        if stamps is None or stamps[TARGET] is None:
+            return
+        stamps[PRESENT] = now
+        histograms = self.histograms
+        previous = stamps[CAPTURE]
+        for milestone in range(FLIP, PRESENT + 1):
+            stamp = stamps[milestone]
+            if stamp is not None:
+                histograms[MILESTONES[milestone]].add(stamp - previous)
+                previous = stamp
+        histograms["end_to_end"].add(now - stamps[CAPTURE])
+        self.current = None
+
+    def summary(self, percentiles=(50, 90, 99)):
+        # {histogram: (count, mean, p50, p90, p99, max)} in milliseconds,
+        # for histograms with samples
+        stats = {}
+        for name, histogram in self.histograms.items():
+            if histogram.count:
+                stats[name] = (histogram.count, histogram.mean() * 1000,
+                               *(histogram.percentile(p) * 1000 for p in percentiles),
+                               histogram.max * 1000)
+        return stats
+
+    def report(self):
+        lines = [f"  {'stage (ms)':<16}{'count':>8}{'mean':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}"]
+        for name, (count, *values) in self.summary().items():
+            lines.append(f"  {name:<16}{count:>8}" + "".join(f"{v:>9.2f}" for v in values))
+        if self.unshown:
+            lines.append(f"  {self.unshown} tracked frames were superseded before reaching the screen")
+        return "\n".join(lines)
@@ -1,10 +1,37 @@
-import cv2
+import time
+# Startup timing starts here (see startup.py)
+IMPORT_START = time.perf_counter()
+
+# OpenCV and MediaPipe are imported where they are first needed, so the
+# window comes up without waiting for them
 import pygame
-import mediapipe as mp
 import numpy as np
 import random
 import math
 import sys
+import threading
+import argparse
+import os
+
+from particles import ParticleSystem
+from starfield import Starfield, CLASSIC_LAYERS, PARALLAX_LAYERS
+from collision import SpatialHash, find_laser_hits, ship_hit
+from entities import EntityStore
+from filters import FILTERS, make_filter
+from idle import IDLE_FPS, IDLE_INFERENCE_SIZE, IDLE_POLL_INTERVAL, IdleMonitor
+from sprites import SpriteCache, alpha_surface
+from recording import InputRecorder, InputReplay
+from input_sources import (CameraSource, VideoFileSource, ImageSequenceSource,
+                           SyntheticSource)
+from gestures import GestureEngine
+from players import PlayerAssigner
+from preview import CameraPreview, HAND_CONNECTIONS
+import latency as lat
+import profiler as prof
+from quality import QUALITY_LEVELS, QualityGovernor, level_index
+from startup import Startup
+
+IMPORT_END = time.perf_counter()
 
 # Initialize Pygame
 pygame.init()
@@ -14,6 +41,30 @@ SCREEN_WIDTH = 1000
 SCREEN_HEIGHT = 700
 FPS = 60
 
+# Fixed-timestep simulation: all speeds/timers are per simulation step
+SIM_RATE = 60
+SIM_DT = 1.0 / SIM_RATE
+MAX_SIM_STEPS = 5          # catch-up steps allowed per loop iteration
+MAX_SKIPPED_FRAMES = 2     # consecutive draws that may be skipped while behind
+MAX_FRAME_TIME = 0.25      # longer stalls (e.g. dragging the window) are clamped
+IDLE_EVENT_CHECK = 0.01    # how often an idle frame's sleep checks for key presses
+
+# The hand panel shows confidence in steps of this many percent
+CONFIDENCE_STEP = 5
+
+# Hand results older than this (seconds) are treated as "no hand"
+STALE_RESULT_AGE = 0.25
+
+# Horde mode: a wave of enemies staggered above the top edge every interval
+HORDE_WAVE_SIZE = 400
+HORDE_WAVE_INTERVAL = 120  # simulation steps
+HORDE_WAVE_DEPTH = 600     # pixels the wave is spread over vertically
+
+# Game rules; Game takes overrides so simulate.py can tune them in batch runs
+SPAWN_INTERVAL = (90, 150) # simulation steps between enemies, drawn uniformly
+ENEMY_SPEED = (1.5, 2.5)   # pixels per step, drawn uniformly
+LASER_COOLDOWN = 30        # simulation steps between a player's shots
+
 # Colors - Cute pastel theme
 SPACE_DARK = (15, 15, 30)
 CUTE_PINK = (255, 182, 193)
@@ -27,293 +78,798 @@ DARK_GRAY = (100, 100, 100)
 RED = (255, 100, 100)
 GREEN = (100, 255, 100)
 
-class Particle:
-    def __init__(self, x, y, color, size=2):
-        self.x = x
-        self.y = y
-        self.vx = random.uniform(-2, 2)
-        self.vy = random.uniform(-2, 2)
-        self.color = color
-        self.size = size
-        self.life = 60
-        self.max_life = 60
-        
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.life -= 1
-        self.size = max(0, self.size * (self.life / self.max_life))
-        
-    def draw(self, screen):
-        if self.life > 0:
-            alpha = int(255 * (self.life / self.max_life))
-            color = (*self.color[:3], alpha)
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), max(1, int(self.size)))
-    
-    def is_alive(self):
-        return self.life > 0
-
-class Star:
-    def __init__(self):
-        self.x = random.randint(0, SCREEN_WIDTH)
-        self.y = random.randint(0, SCREEN_HEIGHT)
-        self.speed = random.uniform(0.5, 2)
-        self.size = random.randint(1, 3)
-        self.twinkle = random.randint(0, 60)
-        
-    def update(self):
-        self.y += self.speed
-        if self.y > SCREEN_HEIGHT:
-            self.y = -10
-            self.x = random.randint(0, SCREEN_WIDTH)
-        self.twinkle = (self.twinkle + 1) % 120
-        
-    def draw(self, screen):
-        alpha = 100 + int(100 * math.sin(self.twinkle * 0.1))
-        brightness = max(50, min(255, alpha))
-        color = (brightness, brightness, brightness)
-        pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.size)
+# Ship colors in multi-player mode, player 1 first
+PLAYER_COLORS = (MINT_GREEN, GOLD, LAVENDER, CUTE_PINK)
+MAX_PLAYERS = len(PLAYER_COLORS)
 
 class Spaceship:
-    def __init__(self, x, y):
+    def __init__(self, x, y, particles, color=MINT_GREEN, hand_filter="lerp"):
         self.x = x
         self.y = y
-        self.target_x = x
+        # Turns hand measurements into a ship position (see filters.py)
+        self.filter = make_filter(hand_filter, x)
         self.width = 60
         self.height = 50
         self.speed = 8
         self.bob_offset = 0
-        self.trail_particles = []
+        self.color = color
+        self.particles = particles
+        self.snapshot()
+        
+    def snapshot(self):
+        # State at the start of the step, used for interpolated drawing
+        self.prev_x = self.x
+        self.prev_bob_offset = self.bob_offset
         
-    def update(self, hand_x):
+    def update(self, hand_x, t=None, now=None):
+        # t: capture time of the measurement, now: the time to position the ship for
+        self.snapshot()
+        target_x = None
         if hand_x is not None:
-            self.target_x = int(hand_x * SCREEN_WIDTH)
-            self.target_x = max(self.width // 2, min(SCREEN_WIDTH - self.width // 2, self.target_x))
+            target_x = int(hand_x * SCREEN_WIDTH)
+            target_x = max(self.width // 2, min(SCREEN_WIDTH - self.width // 2, target_x))
         
         # Smooth movement
-        self.x += (self.target_x - self.x) * 0.15
+        x = self.filter.step(target_x, t, now)
+        if x is not None:
+            self.x = max(self.width / 2, min(SCREEN_WIDTH - self.width / 2, x))
         self.bob_offset += 0.2
         
         # Add cute trail particles
         if random.random() < 0.7:
-            self.trail_particles.append(Particle(
+            self.particles.emit(
                 self.x + random.randint(-15, 15), 
                 self.y + 20, 
                 SOFT_BLUE, 
                 random.randint(2, 4)
-            ))
+            )
+    
+    def draw(self, screen, alpha=1.0, sprites=None):
+        # Without a sprite cache the ship is drawn from primitives
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        bob_offset = self.prev_bob_offset + (self.bob_offset - self.prev_bob_offset) * alpha
+        current_y = self.y + math.sin(bob_offset) * 3
+        if sprites is None:
+            return draw_spaceship(screen, x, current_y, self.width, self.height, self.color)
         
-        # Update trail particles
-        self.trail_particles = [p for p in self.trail_particles if p.is_alive()]
-        for particle in self.trail_particles:
-            particle.update()
+        # The bob only moves the ship, so a single sprite covers it
+        style = (self.width, self.height, self.color, SOFT_BLUE, WHITE, SPACE_DARK)
+        sprite = sprites.get(("spaceship", style, 0), render_spaceship,
+                             self.width, self.height, self.color)
+        ox, oy = sprite_center(self.width, self.height)
+        return screen.blit(sprite, (int(x) - ox, int(current_y) - oy))
+
+def draw_spaceship(screen, x, y, width, height, color=MINT_GREEN):
+    # Draw spaceship body (cute rounded shape)
+    body = pygame.draw.ellipse(screen, color, 
+                      (x - width//2, y - height//2, 
+                       width, height))
+    pygame.draw.ellipse(screen, WHITE, 
+                      (x - width//2, y - height//2, 
+                       width, height), 3)
     
-    def draw(self, screen):
-        # Draw trail particles
-        for particle in self.trail_particles:
-            particle.draw(screen)
-            
-        current_y = self.y + math.sin(self.bob_offset) * 3
-        
-        # Draw spaceship body (cute rounded shape)
-        pygame.draw.ellipse(screen, MINT_GREEN, 
-                          (self.x - self.width//2, current_y - self.height//2, 
-                           self.width, self.height))
-        pygame.draw.ellipse(screen, WHITE, 
-                          (self.x - self.width//2, current_y - self.height//2, 
-                           self.width, self.height), 3)
-        
-        # Draw cute cockpit
-        pygame.draw.ellipse(screen, SOFT_BLUE, 
-                          (self.x - 15, current_y - 10, 30, 20))
-        pygame.draw.ellipse(screen, WHITE, 
-                          (self.x - 15, current_y - 10, 30, 20), 2)
-        
-        # Draw cute eyes
-        pygame.draw.circle(screen, WHITE, (int(self.x - 8), int(current_y - 5)), 4)
-        pygame.draw.circle(screen, WHITE, (int(self.x + 8), int(current_y - 5)), 4)
-        pygame.draw.circle(screen, SPACE_DARK, (int(self.x - 8), int(current_y - 5)), 2)
-        pygame.draw.circle(screen, SPACE_DARK, (int(self.x + 8), int(current_y - 5)), 2)
+    # Draw cute cockpit
+    pygame.draw.ellipse(screen, SOFT_BLUE, 
+                      (x - 15, y - 10, 30, 20))
+    pygame.draw.ellipse(screen, WHITE, 
+                      (x - 15, y - 10, 30, 20), 2)
+    
+    # Draw cute eyes
+    pygame.draw.circle(screen, WHITE, (int(x - 8), int(y - 5)), 4)
+    pygame.draw.circle(screen, WHITE, (int(x + 8), int(y - 5)), 4)
+    pygame.draw.circle(screen, SPACE_DARK, (int(x - 8), int(y - 5)), 2)
+    pygame.draw.circle(screen, SPACE_DARK, (int(x + 8), int(y - 5)), 2)
+    
+    # Everything above sits inside the body outline
+    return body
+
+def draw_laser(screen, x, y, glow_size):
+    # Draw glowing laser effect
+    # Outer glow
+    outer = pygame.draw.ellipse(screen, GOLD, 
+                      (x - glow_size, y - Laser.height//2, 
+                       glow_size * 2, Laser.height))
+    # Inner core
+    core = pygame.draw.ellipse(screen, WHITE, 
+                      (x - Laser.width//2, y - Laser.height//2, 
+                       Laser.width, Laser.height))
+    return outer.union(core)
 
+def draw_enemy(screen, x, y, antenna):
+    # Draw rotating enemy (cute alien)
+    center_x = int(x)
+    center_y = int(y)
+    radius = Enemy.width//2
+    
+    # Main body
+    body = pygame.draw.circle(screen, CUTE_PINK, (center_x, center_y), radius)
+    pygame.draw.circle(screen, WHITE, (center_x, center_y), radius, 2)
+    
+    # Cute antennae
+    pygame.draw.circle(screen, LAVENDER, 
+                     (center_x - 10 + antenna, center_y - 15), 3)
+    pygame.draw.circle(screen, LAVENDER, 
+                     (center_x + 10 - antenna, center_y - 15), 3)
+    
+    # Eyes
+    pygame.draw.circle(screen, WHITE, (center_x - 8, center_y - 5), 5)
+    pygame.draw.circle(screen, WHITE, (center_x + 8, center_y - 5), 5)
+    pygame.draw.circle(screen, SPACE_DARK, (center_x - 8, center_y - 5), 3)
+    pygame.draw.circle(screen, SPACE_DARK, (center_x + 8, center_y - 5), 3)
+    
+    # Antennae and eyes stay inside the body circle
+    return body
+
+# Sprites: each drawing routine above rendered once per animation phase into
+# a transparent surface with a small margin, then blitted by its center
+def sprite_center(width, height):
+    return width // 2 + 2, height // 2 + 2
+
+def render_spaceship(width, height, color):
+    sprite = alpha_surface((width + 4, height + 4))
+    draw_spaceship(sprite, *sprite_center(width, height), width, height, color)
+    return sprite
+
+def render_laser(glow_size):
+    width = max(Laser.width, Laser.sprite_width)
+    sprite = alpha_surface((width + 4, Laser.height + 4))
+    draw_laser(sprite, *sprite_center(width, Laser.height), glow_size)
+    return sprite
+
+def render_enemy(antenna):
+    sprite = alpha_surface((Enemy.width + 4, Enemy.height + 4))
+    draw_enemy(sprite, *sprite_center(Enemy.width, Enemy.height), antenna)
+    return sprite
+
+def blit_phases(screen, sprites, kind, style, render, phases, left, top):
+    # One cache lookup per distinct phase, then a single blits call
+    lookup = {phase: sprites.get((kind, style, phase), render, phase)
+              for phase in set(phases)}
+    return screen.blits(zip([lookup[phase] for phase in phases], zip(left, top)))
+
+# Laser and enemy dimensions, shared by the stores, sprites and collision checks
 class Laser:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.width = 6
-        self.height = 20
-        self.speed = 12
-        self.glow = 0
+    width = 6
+    height = 20
+    speed = 12
+    sprite_width = 10  # widest glow ellipse
+
+class Enemy:
+    width = 40
+    height = 40
+
+class LaserStore(EntityStore):
+    # Every live laser, one array per component
+    def __init__(self, capacity=512):
+        super().__init__(capacity, {"x": np.float64, "y": np.float64, "prev_y": np.float64,
+                                    "glow": np.float64, "owner": np.int8, "alive": bool})
+        
+    def spawn(self, x, y, owner=0):
+        # owner is the index of the player who fired
+        return self.add(x=x, y=y, prev_y=y, owner=owner, alive=True)
         
     def update(self):
-        self.y -= self.speed
-        self.glow += 0.3
+        n = self.count
+        self.prev_y[:n] = self.y[:n]
+        self.y[:n] -= Laser.speed
+        self.glow[:n] += 0.3
         
-    def draw(self, screen):
-        # Draw glowing laser effect
-        glow_size = 3 + int(2 * math.sin(self.glow))
+        # Cull off-screen lasers
+        self.alive[:n] = self.y[:n] >= -Laser.height
+        self.remove(np.flatnonzero(~self.alive[:n]))
         
-        # Outer glow
-        pygame.draw.ellipse(screen, GOLD, 
-                          (self.x - glow_size, self.y - self.height//2, 
-                           glow_size * 2, self.height))
-        # Inner core
-        pygame.draw.ellipse(screen, WHITE, 
-                          (self.x - self.width//2, self.y - self.height//2, 
-                           self.width, self.height))
+    def draw(self, screen, alpha=1.0, sprites=None, animate=True):
+        n = self.count
+        if not n:
+            return []
+        prev_y = self.prev_y[:n]
+        ys = prev_y + (self.y[:n] - prev_y) * alpha
+        if animate:
+            glow_size = 3 + (2 * np.sin(self.glow[:n])).astype(np.int32)
+        else:
+            glow_size = np.full(n, 3, dtype=np.int32)
+        if sprites is None:
+            return [draw_laser(screen, x, y, size)
+                    for x, y, size in zip(self.x[:n].tolist(), ys.tolist(), glow_size.tolist())]
         
-    def is_off_screen(self):
-        return self.y < -self.height
+        ox, oy = sprite_center(max(Laser.width, Laser.sprite_width), Laser.height)
+        left = self.x[:n].astype(np.int32) - ox
+        top = ys.astype(np.int32) - oy
+        style = (Laser.width, Laser.height, GOLD, WHITE)
+        return blit_phases(screen, sprites, "laser", style, render_laser,
+                           glow_size.tolist(), left.tolist(), top.tolist())
 
-class Enemy:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.width = 40
-        self.height = 40
-        self.speed = 1.5 + random.uniform(0, 1)
-        self.rotation = 0
-        self.hit_particles = []
+class EnemyStore(EntityStore):
+    # Every live enemy, one array per component
+    def __init__(self, capacity=8192):
+        super().__init__(capacity, {"x": np.float64, "y": np.float64, "prev_y": np.float64,
+                                    "speed": np.float64, "rotation": np.float64,
+                                    "alive": bool})
+        self.speed_range = ENEMY_SPEED
+        
+    def spawn(self, x, y):
+        return self.add(x=x, y=y, prev_y=y, speed=random.uniform(*self.speed_range), alive=True)
+        
+    def spawn_many(self, xs, ys, speeds):
+        # Bulk spawn for horde waves; enemies beyond capacity are dropped
+        slots = self.reserve(len(xs))
+        n = slots.stop - slots.start
+        self.x[slots] = xs[:n]
+        self.y[slots] = ys[:n]
+        self.prev_y[slots] = ys[:n]
+        self.speed[slots] = speeds[:n]
+        self.rotation[slots] = 0
+        self.alive[slots] = True
         
     def update(self):
-        self.y += self.speed
-        self.rotation += 2
-        
-        # Update hit particles
-        self.hit_particles = [p for p in self.hit_particles if p.is_alive()]
-        for particle in self.hit_particles:
-            particle.update()
-        
-    def draw(self, screen):
-        # Draw hit particles
-        for particle in self.hit_particles:
-            particle.draw(screen)
-            
-        # Draw rotating enemy (cute alien)
-        center_x, center_y = int(self.x), int(self.y)
-        
-        # Main body
-        pygame.draw.circle(screen, CUTE_PINK, (center_x, center_y), self.width//2)
-        pygame.draw.circle(screen, WHITE, (center_x, center_y), self.width//2, 2)
-        
-        # Cute antennae
-        antenna_offset = 5 * math.sin(math.radians(self.rotation))
-        pygame.draw.circle(screen, LAVENDER, 
-                         (center_x - 10 + int(antenna_offset), center_y - 15), 3)
-        pygame.draw.circle(screen, LAVENDER, 
-                         (center_x + 10 - int(antenna_offset), center_y - 15), 3)
-        
-        # Eyes
-        pygame.draw.circle(screen, WHITE, (center_x - 8, center_y - 5), 5)
-        pygame.draw.circle(screen, WHITE, (center_x + 8, center_y - 5), 5)
-        pygame.draw.circle(screen, SPACE_DARK, (center_x - 8, center_y - 5), 3)
-        pygame.draw.circle(screen, SPACE_DARK, (center_x + 8, center_y - 5), 3)
-        
-    def explode(self):
-        for _ in range(15):
-            self.hit_particles.append(Particle(
-                self.x + random.randint(-20, 20),
-                self.y + random.randint(-20, 20),
-                random.choice([CUTE_PINK, GOLD, WHITE]),
-                random.randint(2, 5)
-            ))
-        
-    def is_off_screen(self):
-        return self.y > SCREEN_HEIGHT + self.height
+        n = self.count
+        self.prev_y[:n] = self.y[:n]
+        self.y[:n] += self.speed[:n]
+        self.rotation[:n] += 2
+        
+        # Cull enemies that left the bottom of the screen
+        self.alive[:n] = self.y[:n] <= SCREEN_HEIGHT + Enemy.height
+        self.remove(np.flatnonzero(~self.alive[:n]))
+        
+    def draw(self, screen, alpha=1.0, sprites=None, animate=True):
+        n = self.count
+        if not n:
+            return []
+        prev_y = self.prev_y[:n]
+        ys = prev_y + (self.y[:n] - prev_y) * alpha
+        if animate:
+            antenna = (5 * np.sin(np.radians(self.rotation[:n]))).astype(np.int32)
+        else:
+            antenna = np.zeros(n, dtype=np.int32)
+        if sprites is None:
+            return [draw_enemy(screen, x, y, offset)
+                    for x, y, offset in zip(self.x[:n].tolist(), ys.tolist(), antenna.tolist())]
+        
+        ox, oy = sprite_center(Enemy.width, Enemy.height)
+        left = self.x[:n].astype(np.int32) - ox
+        top = ys.astype(np.int32) - oy
+        style = (Enemy.width, Enemy.height, CUTE_PINK, WHITE, LAVENDER, SPACE_DARK)
+        return blit_phases(screen, sprites, "enemy", style, render_enemy,
+                           antenna.tolist(), left.tolist(), top.tolist())
+        
+    def explode(self, indices, particles):
+        for x, y in zip(self.x[indices].tolist(), self.y[indices].tolist()):
+            particles.burst(x, y, 15, (CUTE_PINK, GOLD, WHITE), 20, (2, 5))
 
 class HandTracker:
-    def __init__(self):
+    def __init__(self, inference=True, roi_tracking=False, inference_size=None, roi_padding=0.6,
+                 players=1, load=True):
+        # inference=False skips building the MediaPipe graph, for sources
+        # that already provide landmarks; load=False leaves it to load_model()
+        self.players = players
+        self.inference = inference
+        self.hands = None
+        self.roi_hands = None
+        self.hand_detected = False
+        self.confidence = 0
+        self.frame_size = (640, 480)
+        
+        # Current hand as a (21, 3) array of normalized (x, y, z); the buffer
+        # is reused every frame and landmarks is None while no hand is visible
+        self.landmark_buffer = np.zeros((21, 3), dtype=np.float32)
+        self.landmarks = None
+        self.gestures = GestureEngine()
+        self.gesture = None
+        
+        # Multi-player mode: every hand comes from the same inference pass and
+        # is handed to a player slot; each player has its own gesture state
+        self.assigner = PlayerAssigner(players)
+        self.hand_buffer = np.zeros((players, 21, 3), dtype=np.float32)
+        self.player_buffer = np.zeros((players, 21, 3), dtype=np.float32)
+        self.player_landmarks = [None] * players
+        self.player_confidence = [0.0] * players
+        self.player_gestures = [GestureEngine() for _ in range(players)]
+        self.player_gesture = [None] * players
+        
+        # ROI mode: infer on a padded crop around the last hand, optionally
+        # downscaled so its longest side is at most inference_size pixels.
+        # A crop around one hand would cut the others off, so it is
+        # single-player only.
+        self.roi_tracking = roi_tracking and players == 1
+        if inference and load:
+            self.load_model()
+        
+        # Quality knob: run inference on every Nth frame, keeping the last
+        # hand state in between. timestamp is the capture time of the frame
+        # the hand state came from, so skipped frames don't pass for new
+        # measurements
+        self.inference_interval = 1
+        self.frame_index = 0
+        self.timestamp = 0.0
+        self.capture_time = 0.0
+        self.inference_size = inference_size
+        self.roi_padding = roi_padding
+        self.roi = None
+        self.used_roi = False
+        
+    def load_model(self):
+        # Imports MediaPipe and builds the graphs
+        import mediapipe as mp
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
+        self.hands = self.create_graph()
+        if self.roi_tracking:
+            # Separate graph so its internal tracking only ever sees crops
+            self.roi_hands = self.create_graph()
+        
+    def warm_up(self, frame_size=(640, 480)):
+        # The first process() call sets up the inference backend; do it on
+        # a blank frame before the first real one
+        w, h = frame_size
+        blank = np.zeros((h, w, 3), dtype=np.uint8)
+        for graph in (self.hands, self.roi_hands):
+            if graph is not None:
+                graph.process(self.prepare(blank, (0, 0, w, h)))
+        
+    def create_graph(self):
+        return self.mp_hands.Hands(
             static_image_mode=False,
-            max_num_hands=1,
+            max_num_hands=self.players,
             min_detection_confidence=0.7,
             min_tracking_confidence=0.7
         )
-        self.mp_draw = mp.solutions.drawing_utils
-        self.hand_detected = False
-        self.confidence = 0
         
-    def find_hands(self, img):
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results = self.hands.process(img_rgb)
-        self.hand_detected = bool(self.results.multi_hand_landmarks)
+    def find_hands(self, img, timestamp=0.0):
+        self.frame_index += 1
+        if self.inference_interval > 1 and self.frame_index % self.inference_interval:
+            return img
+        self.timestamp = timestamp
+        if self.players > 1:
+            return self.find_all_hands(img)
+        h, w = img.shape[:2]
+        self.frame_size = (w, h)
+        self.landmarks = None
+        self.used_roi = False
+        
+        if self.roi is not None:
+            self.landmarks, self.results = self.detect(img, self.roi, self.roi_hands)
+            self.used_roi = self.landmarks is not None
+        if self.landmarks is None:
+            # No ROI yet, or tracking was lost - full-frame detection
+            self.landmarks, self.results = self.detect(img, (0, 0, w, h), self.hands)
+        
+        self.hand_detected = self.landmarks is not None
+        if self.hand_detected:
+            hand_lms = self.results.multi_hand_landmarks[0]
+            
+            # Calculate confidence based on landmark visibility
+            self.confidence = min([lm.visibility for lm in hand_lms.landmark if hasattr(lm, 'visibility')] + [1.0])
+        if self.roi_tracking:
+            self.roi = self.roi_around(self.landmarks) if self.hand_detected else None
+        self.classify()
         return img
     
-    def find_position(self, img):
-        lm_list = []
-        if self.results.multi_hand_landmarks:
-            for hand_lms in self.results.multi_hand_landmarks:
-                for id, lm in enumerate(hand_lms.landmark):
-                    h, w, c = img.shape
-                    cx, cy = int(lm.x * w), int(lm.y * h)
-                    lm_list.append([id, cx, cy])
-                    
-                # Calculate confidence based on landmark visibility
-                self.confidence = min([lm.visibility for lm in hand_lms.landmark if hasattr(lm, 'visibility')] + [1.0])
-        return lm_list
-    
-    def is_fist(self, lm_list):
-        if len(lm_list) == 21:
-            fingers = []
-            
-            # Thumb
-            if lm_list[4][1] < lm_list[3][1]:
-                fingers.append(1)
+    def prepare(self, img, roi):
+        # Crops, downscales and converts to RGB for inference
+        import cv2
+        x0, y0, x1, y1 = roi
+        crop = img[y0:y1, x0:x1]
+        crop_w, crop_h = x1 - x0, y1 - y0
+        if self.inference_size and max(crop_w, crop_h) > self.inference_size:
+            scale = self.inference_size / max(crop_w, crop_h)
+            crop = cv2.resize(crop, (max(1, int(crop_w * scale)), max(1, int(crop_h * scale))),
+                              interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+    
+    def detect(self, img, roi, graph):
+        # Runs inference on img[roi] and returns landmarks normalized to the full frame
+        x0, y0, x1, y1 = roi
+        crop_w, crop_h = x1 - x0, y1 - y0
+        results = graph.process(self.prepare(img, roi))
+        if not results.multi_hand_landmarks:
+            return None, results
+        
+        landmarks = self.landmark_buffer
+        for i, lm in enumerate(results.multi_hand_landmarks[0].landmark):
+            landmarks[i, 0] = lm.x
+            landmarks[i, 1] = lm.y
+            landmarks[i, 2] = lm.z
+        h, w = img.shape[:2]
+        if roi != (0, 0, w, h):
+            landmarks[:, 0] = (x0 + landmarks[:, 0] * crop_w) / w
+            landmarks[:, 1] = (y0 + landmarks[:, 1] * crop_h) / h
+        return landmarks, results
+    
+    def roi_around(self, landmarks):
+        # Square crop around the hand, padded for motion between frames
+        w, h = self.frame_size
+        xs = landmarks[:, 0] * w
+        ys = landmarks[:, 1] * h
+        size = max(xs.max() - xs.min(), ys.max() - ys.min()) * (1 + 2 * self.roi_padding)
+        size = int(min(max(size, 96), w, h))
+        cx = int((xs.max() + xs.min()) / 2)
+        cy = int((ys.max() + ys.min()) / 2)
+        x0 = min(max(cx - size // 2, 0), w - size)
+        y0 = min(max(cy - size // 2, 0), h - size)
+        return (x0, y0, x0 + size, y0 + size)
+    
+    def find_all_hands(self, img):
+        # One conversion and one inference pass for every player's hand
+        h, w = img.shape[:2]
+        self.frame_size = (w, h)
+        results = self.hands.process(self.prepare(img, (0, 0, w, h)))
+        self.results = results
+        
+        hands = []
+        handedness = []
+        confidence = []
+        for i, hand_lms in enumerate((results.multi_hand_landmarks or [])[:self.players]):
+            buffer = self.hand_buffer[i]
+            for j, lm in enumerate(hand_lms.landmark):
+                buffer[j, 0] = lm.x
+                buffer[j, 1] = lm.y
+                buffer[j, 2] = lm.z
+            hands.append(buffer)
+            labels = results.multi_handedness[i].classification if results.multi_handedness else None
+            handedness.append(labels[0].label if labels else None)
+            confidence.append(min([lm.visibility for lm in hand_lms.landmark
+                                   if hasattr(lm, 'visibility')] + [1.0]))
+        self.assign_players(hands, handedness, confidence)
+        return img
+    
+    def use_hands(self, hands, handedness, frame_size, confidence=1.0):
+        # Multi-hand landmarks from a synthetic source - no inference needed
+        self.frame_size = frame_size
+        self.assign_players(hands[:self.players], handedness[:self.players],
+                            [confidence] * len(hands))
+    
+    def assign_players(self, hands, handedness, confidence):
+        self.player_landmarks = [None] * self.players
+        xs = [float(landmarks[9, 0]) for landmarks in hands]
+        for h, p in enumerate(self.assigner.assign(xs, handedness)):
+            if p >= 0:
+                self.player_buffer[p] = hands[h]
+                self.player_landmarks[p] = self.player_buffer[p]
+                self.player_confidence[p] = confidence[h]
+        
+        w, h = self.frame_size
+        for p, landmarks in enumerate(self.player_landmarks):
+            self.player_gesture[p] = self.player_gestures[p].update(landmarks, w / h)
+        
+        # Summary for the hand tracking panel
+        detected = [p for p in range(self.players) if self.player_landmarks[p] is not None]
+        self.hand_detected = bool(detected)
+        self.landmarks = self.player_landmarks[detected[0]] if detected else None
+        self.gesture = self.player_gesture[detected[0]] if detected else None
+        if detected:
+            self.confidence = min(self.player_confidence[p] for p in detected)
+    
+    def player_inputs(self):
+        # (hand_x, is_fist, hand_detected, confidence) per player
+        inputs = []
+        for p, landmarks in enumerate(self.player_landmarks):
+            if landmarks is None:
+                inputs.append((None, False, False, 0))
             else:
-                fingers.append(0)
+                inputs.append((float(landmarks[9, 0]), self.player_gesture[p] == "fist", True,
+                               self.player_confidence[p]))
+        return inputs
+    
+    def use_landmarks(self, landmarks, frame_size, confidence=1.0):
+        # Landmarks from a synthetic source - no inference needed
+        self.landmarks = None
+        if landmarks is not None:
+            self.landmark_buffer[:] = landmarks
+            self.landmarks = self.landmark_buffer
+        self.hand_detected = self.landmarks is not None
+        self.frame_size = frame_size
+        self.used_roi = False
+        if self.hand_detected:
+            self.confidence = confidence
+        self.classify()
+    
+    def classify(self):
+        w, h = self.frame_size
+        self.gesture = self.gestures.update(self.landmarks, w / h)
+    
+    def is_fist(self):
+        if self.players > 1:
+            return any(self.player_gesture[p] == "fist" for p in range(self.players)
+                       if self.player_landmarks[p] is not None)
+        return self.hand_detected and self.gesture == "fist"
+    
+    def get_hand_center(self):
+        # Middle finger MCP, already normalized to the frame
+        if self.landmarks is not None:
+            return float(self.landmarks[9, 0]), float(self.landmarks[9, 1])
+        return None, None
+
+def draw_gradient(surface):
+    for y in range(SCREEN_HEIGHT):
+        color_ratio = y / SCREEN_HEIGHT
+        r = int(SPACE_DARK[0] * (1 - color_ratio) + (SPACE_DARK[0] + 20) * color_ratio)
+        g = int(SPACE_DARK[1] * (1 - color_ratio) + (SPACE_DARK[1] + 30) * color_ratio)
+        b = int(SPACE_DARK[2] * (1 - color_ratio) + (SPACE_DARK[2] + 50) * color_ratio)
+        pygame.draw.line(surface, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+
+class Compositor:
+    # Static layers are rendered once into a cached background. In dirty-rect
+    # mode only the areas touched last frame and this frame are restored and
+    # pushed to the display; a full flip is used for scene changes.
+    def __init__(self, screen, dirty_rects=False):
+        self.screen = screen
+        self.dirty_rects = dirty_rects
+        self.background = pygame.Surface(screen.get_size()).convert()
+        draw_gradient(self.background)
+        self.dirty = []
+        self.previous = []
+        self.full_redraw = True
+        
+    def request_full_redraw(self):
+        self.full_redraw = True
+        
+    def begin_frame(self):
+        if self.full_redraw or not self.dirty_rects:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            # Erase only what was drawn last frame
+            for rect in self.previous:
+                self.screen.blit(self.background, rect, rect)
                 
-            # Other fingers
-            for finger_id in range(1, 5):
-                if lm_list[4 + finger_id * 4][2] < lm_list[2 + finger_id * 4][2]:
-                    fingers.append(1)
-                else:
-                    fingers.append(0)
+    def mark(self, rect):
+        if rect:
+            self.dirty.append(rect)
             
-            return sum(fingers) <= 1
-        return False
+    def mark_all(self, rects):
+        self.dirty.extend(rects)
+            
+    def present(self):
+        if self.full_redraw or not self.dirty_rects:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous + self.dirty)
+        self.previous = self.dirty
+        self.dirty = []
+        self.full_redraw = False
+
+class HandResult:
+    __slots__ = ("seq", "timestamp", "hand_x", "is_fist", "hand_detected", "confidence", "landmarks",
+                 "gesture", "players", "stamps", "preview")
+
+    def __init__(self, seq, timestamp, hand_x=None, is_fist=False, hand_detected=False, confidence=0,
+                 landmarks=None, gesture=None, players=None, stamps=None, preview=None):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.hand_x = hand_x
+        self.is_fist = is_fist
+        self.hand_detected = hand_detected
+        self.confidence = confidence
+        self.landmarks = landmarks
+        self.gesture = gesture
+        # Multi-player mode: (hand_x, is_fist, hand_detected, confidence) per
+        # player; the fields above then summarize all hands
+        self.players = players
+        # Latency milestones (see latency.py); None for recorded input
+        self.stamps = stamps
+        # CameraPreview slot holding this frame, if the preview is on
+        self.preview = preview
+
+    def player_inputs(self, count=1):
+        # (hand_x, is_fist, hand_detected) for each of count players
+        if self.players is None:
+            return [(self.hand_x, self.is_fist, self.hand_detected)] + [(None, False, False)] * (count - 1)
+        return [player[:3] for player in self.players]
+
+    @classmethod
+    def from_record(cls, record):
+        hand_x = float(record["hand_x"])
+        return cls(int(record["seq"]), float(record["timestamp"]),
+                   None if math.isnan(hand_x) else hand_x,
+                   bool(record["is_fist"]), bool(record["hand_detected"]),
+                   float(record["confidence"]),
+                   record["landmarks"] if record["hand_detected"] else None,
+                   "fist" if record["is_fist"] else None)
+
+    def age(self, now=None):
+        if now is None:
+            now = time.perf_counter()
+        return now - self.timestamp
+
+class ResultMailbox:
+    # Single-slot mailbox: the writer always overwrites, so the reader only
+    # ever sees the newest result and stale ones are dropped on the floor
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.result = None
+        self.dropped = 0
+        self.last_read_seq = -1
+
+    def put(self, result):
+        with self.lock:
+            if self.result is not None and self.result.seq > self.last_read_seq:
+                self.dropped += 1
+            self.result = result
+
+    def get(self):
+        with self.lock:
+            result = self.result
+            if result is not None:
+                self.last_read_seq = result.seq
+            return result
+
+class TrackingWorker(threading.Thread):
+    def __init__(self, source, hand_tracker, mailbox, profiler=None, preview=None):
+        super().__init__(name="TrackingWorker", daemon=True)
+        self.source = source
+        self.hand_tracker = hand_tracker
+        self.mailbox = mailbox
+        self.profiler = profiler
+        # CameraPreview to fill, or None while the preview is off
+        self.preview = preview
+        self.stop_event = threading.Event()
+        self.seq = 0
+        # Idle mode: seconds to wait between frames (0: as fast as the
+        # camera), cut short by wake_event
+        self.poll_interval = 0.0
+        self.wake_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            result = track_frame(self.source, self.hand_tracker, self.seq, self.profiler,
+                                 self.preview)
+            if result is None:
+                if self.source.exhausted:
+                    break
+                # Camera hiccup - back off briefly instead of spinning
+                self.stop_event.wait(0.01)
+                continue
+            self.mailbox.put(result)
+            self.seq += 1
+            if self.poll_interval:
+                self.wake_event.wait(self.poll_interval)
+                self.wake_event.clear()
+
+    def stop(self, timeout=1.0):
+        # Returns False if the worker is still running (e.g. stuck in a
+        # camera read) when the timeout runs out
+        self.stop_event.set()
+        self.wake_event.set()
+        if self.is_alive():
+            self.join(timeout)
+        return not self.is_alive()
+
+def track_frame(source, hand_tracker, seq, profiler=None, preview=None):
+    frame = None
+    if profiler is not None:
+        profiler.begin(prof.CAPTURE)
+    if source.provides_landmarks and hand_tracker.players > 1:
+        ret, hands, handedness, timestamp = source.read_hands()
+        if profiler is not None:
+            profiler.end(prof.CAPTURE)
+        if not ret:
+            return None
+        hand_tracker.use_hands(hands, handedness, source.frame_size)
+        hand_tracker.timestamp = timestamp
+        stamps = lat.new_stamps(timestamp)
+    elif source.provides_landmarks:
+        ret, landmarks, timestamp = source.read_landmarks()
+        if profiler is not None:
+            profiler.end(prof.CAPTURE)
+        if not ret:
+            return None
+        hand_tracker.use_landmarks(landmarks, source.frame_size)
+        hand_tracker.timestamp = timestamp
+        stamps = lat.new_stamps(timestamp)
+    else:
+        capture_start = time.perf_counter()
+        ret, frame, timestamp = source.read()
+        # Time spent blocked on the camera, which no quality setting can reduce
+        hand_tracker.capture_time = time.perf_counter() - capture_start
+        stamps = lat.new_stamps(timestamp)
+        if ret and source.mirror:
+            import cv2
+            frame = cv2.flip(frame, 1)
+            stamps[lat.FLIP] = time.perf_counter()
+        if profiler is not None:
+            profiler.end(prof.CAPTURE)
+        if not ret:
+            return None
+        if profiler is not None:
+            profiler.begin(prof.INFERENCE)
+        hand_tracker.find_hands(frame, timestamp)
+        stamps[lat.INFERENCE] = time.perf_counter()
+        if profiler is not None:
+            profiler.end(prof.INFERENCE)
+
+    hand_x, hand_y = hand_tracker.get_hand_center()
+    is_fist = hand_tracker.is_fist()
+
+    # The tracker reuses its landmark buffer; the result gets its own copy
+    landmarks = hand_tracker.landmarks
+    players = hand_tracker.player_inputs() if hand_tracker.players > 1 else None
+    stamps[lat.GESTURE] = time.perf_counter()
     
-    def get_hand_center(self, lm_list):
-        if len(lm_list) >= 9:
-            return lm_list[9][1] / 640, lm_list[9][2] / 480
-        return None, None
+    # Downscaled into the preview's shared buffer after the gesture decision,
+    # so it adds nothing to the latency of the hand input
+    slot = preview.capture(frame) if preview is not None and frame is not None else None
+    # Timestamped with the frame the hand state came from, which is older
+    # than this one when inference was skipped
+    return HandResult(seq, hand_tracker.timestamp, hand_x, is_fist,
+                      hand_tracker.hand_detected, hand_tracker.confidence,
+                      None if landmarks is None else landmarks.copy(), hand_tracker.gesture,
+                      players, stamps, slot)
 
 class UI:
-    def __init__(self):
-        self.font_small = pygame.font.Font(None, 24)
-        self.font_medium = pygame.font.Font(None, 36)
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_huge = pygame.font.Font(None, 72)
+    # Retained-mode UI: each panel is rendered into its own surface and only
+    # re-rendered when the inputs it shows change; text comes from an LRU
+    # cache. retained=False re-renders everything every frame, for benchmarks.
+    def __init__(self, retained=True, text_cache_size=256):
+        self.retained = retained
+        self.fonts = {}
+        self.font_small = self.font(24)
+        self.font_medium = self.font(36)
+        self.font_large = self.font(48)
+        self.font_huge = self.font(72)
+        self.font_tiny = pygame.font.SysFont("monospace", 14)
+        self.text_cache = SpriteCache(text_cache_size if retained else 0)
+        self.panels = {}
+        self.overlay = None
         self.pulse = 0
+        self.profiler_lines = []
+        self.profiler_stats_frame = 0
+        
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+        
+    def text(self, font, text, color):
+        # Rendered string, cached by font, size, text and color
+        key = (id(font), font.get_height(), text, color)
+        return self.text_cache.get(key, font.render, text, True, color)
+        
+    def panel(self, name, key, rect, render, *args):
+        # Cached panel surface, re-rendered with render(surface, *args) when key changes
+        cached = self.panels.get(name)
+        if cached is None or cached[0] != key or not self.retained:
+            surface = alpha_surface(rect.size)
+            render(surface, *args)
+            cached = self.panels[name] = (key, surface)
+        return cached[1]
         
     def draw_rounded_rect(self, screen, color, rect, radius=10, border=0, border_color=WHITE):
         pygame.draw.rect(screen, color, rect, border_radius=radius)
         if border > 0:
             pygame.draw.rect(screen, border_color, rect, border, border_radius=radius)
+        return pygame.Rect(rect)
+    
+    def draw_panel_background(self, surface, border_color, radius=15, border=2):
+        # Panels have always been drawn opaque (the screen has no alpha channel)
+        self.draw_rounded_rect(surface, (0, 0, 0), surface.get_rect(), radius, border, border_color)
     
     def draw_hand_status(self, screen, hand_detected, confidence, is_fist):
         # Hand detection panel
         panel_rect = pygame.Rect(10, 10, 280, 120)
-        self.draw_rounded_rect(screen, (0, 0, 0, 150), panel_rect, 15, 2, LAVENDER)
+        # Shown in coarse buckets, so landmark jitter doesn't re-render the panel
+        bucket = int(round(confidence * 100 / CONFIDENCE_STEP)) * CONFIDENCE_STEP
+        confidence_text = f"Confidence: {bucket}%" if hand_detected else None
+        key = (hand_detected, confidence_text, is_fist)
+        screen.blit(self.panel("hand_status", key, panel_rect, self.render_hand_status,
+                               hand_detected, confidence_text, is_fist), panel_rect)
+        return panel_rect
+    
+    def render_hand_status(self, surface, hand_detected, confidence_text, is_fist):
+        self.draw_panel_background(surface, LAVENDER)
         
         # Title
-        title = self.font_medium.render("🖐️ Hand Tracking", True, WHITE)
-        screen.blit(title, (20, 20))
+        surface.blit(self.text(self.font_medium, "🖐️ Hand Tracking", WHITE), (10, 10))
         
         # Detection status
         if hand_detected:
             status_color = GREEN
             status_text = "✅ Hand Detected"
-            confidence_text = f"Confidence: {confidence:.1%}"
         else:
             status_color = RED
             status_text = "❌ No Hand Detected"
             confidence_text = "Move hand in front of camera"
             
-        status = self.font_small.render(status_text, True, status_color)
-        screen.blit(status, (20, 50))
-        
-        conf = self.font_small.render(confidence_text, True, LIGHT_GRAY)
-        screen.blit(conf, (20, 70))
+        surface.blit(self.text(self.font_small, status_text, status_color), (10, 40))
+        surface.blit(self.text(self.font_small, confidence_text, LIGHT_GRAY), (10, 60))
         
         # Gesture status
         if hand_detected:
@@ -327,19 +883,73 @@ class UI:
             gesture_text = "🤷 No Gesture"
             gesture_color = DARK_GRAY
             
-        gesture = self.font_small.render(gesture_text, True, gesture_color)
-        screen.blit(gesture, (20, 95))
+        surface.blit(self.text(self.font_small, gesture_text, gesture_color), (10, 85))
     
-    def draw_score_panel(self, screen, score, lives=3):
-        # Score panel
-        panel_rect = pygame.Rect(SCREEN_WIDTH - 200, 10, 180, 80)
-        self.draw_rounded_rect(screen, (0, 0, 0, 150), panel_rect, 15, 2, GOLD)
+    def draw_profiler(self, screen, profiler):
+        # Profiler panel next to the hand tracking panel
+        panel_rect = pygame.Rect(300, 10, 330, 190)
+        self.draw_rounded_rect(screen, (0, 0, 0, 150), panel_rect, 15, 2, MINT_GREEN)
         
-        score_text = self.font_medium.render("⭐ Score", True, WHITE)
-        screen.blit(score_text, (SCREEN_WIDTH - 190, 20))
+        # Rolling frame-time graph; the gold line is the 60 FPS budget
+        graph = pygame.Rect(310, 20, 310, 60)
+        totals, _ = profiler.recent_frames(graph.width // 2)
+        budget_y = graph.bottom - int(graph.height * (1000 / FPS) / 33.3)
+        pygame.draw.line(screen, GOLD, (graph.left, budget_y), (graph.right, budget_y))
+        if len(totals) > 1:
+            heights = np.minimum(totals * 1000 / 33.3, 1.0) * graph.height
+            points = [(graph.left + i * 2, graph.bottom - int(h)) for i, h in enumerate(heights.tolist())]
+            pygame.draw.lines(screen, MINT_GREEN, False, points)
         
-        score_value = self.font_large.render(str(score), True, GOLD)
-        screen.blit(score_value, (SCREEN_WIDTH - 190, 45))
+        # Per-stage percentiles, refreshed a few times a second
+        if profiler.frame_count - self.profiler_stats_frame >= 15 or not self.profiler_lines:
+            self.profiler_stats_frame = profiler.frame_count
+            stats = profiler.stage_percentiles()
+            self.profiler_lines = [self.font_tiny.render("stage       p50 / p95 ms", True, WHITE)]
+            for name in ("frame",) + prof.STAGES:
+                if name in stats:
+                    p50, p95 = stats[name]
+                    text = f"{name:<10} {p50:6.2f} / {p95:6.2f}"
+                    self.profiler_lines.append(self.font_tiny.render(text, True, LIGHT_GRAY))
+        for i, line in enumerate(self.profiler_lines):
+            screen.blit(line, (310 + (i // 4) * 160, 88 + (i % 4) * 26))
+        return panel_rect
+    
+    def draw_camera_preview(self, screen, preview, slot, landmarks, gesture):
+        # Camera inset in the bottom-right corner with the hand skeleton and
+        # gesture on top; sources without frames show the skeleton on black
+        width = preview.width
+        height = preview.height or width * 3 // 4
+        rect = pygame.Rect(SCREEN_WIDTH - width - 10, SCREEN_HEIGHT - height - 10, width, height)
+        surface = preview.surface(slot)
+        if surface is not None:
+            screen.blit(surface, rect)
+        else:
+            screen.fill(SPACE_DARK, rect)
+        if landmarks is not None:
+            points = (landmarks[:, :2] * (width, height) + rect.topleft).astype(np.int32).tolist()
+            for a, b in HAND_CONNECTIONS:
+                pygame.draw.line(screen, MINT_GREEN, points[a], points[b], 2)
+            for point in points:
+                pygame.draw.circle(screen, CUTE_PINK, point, 3)
+        if gesture:
+            label = self.text(self.font_small, gesture.replace("_", " "), GOLD)
+            screen.blit(label, (rect.left + 6, rect.top + 4))
+        pygame.draw.rect(screen, MINT_GREEN, rect, 2)
+        return rect
+    
+    def draw_score_panel(self, screen, score, lives=3, player=None, color=GOLD):
+        # Score panel; in multi-player mode one per player, stacked down the right
+        index = player or 0
+        panel_rect = pygame.Rect(SCREEN_WIDTH - 200, 10 + index * 90, 180, 80)
+        title = "⭐ Score" if player is None else f"⭐ Player {player + 1}"
+        screen.blit(self.panel(f"score{index}", (score, title, color), panel_rect,
+                               self.render_score_panel, score, title, color), panel_rect)
+        return panel_rect
+    
+    def render_score_panel(self, surface, score, title, color):
+        self.draw_panel_background(surface, color)
+        surface.blit(self.text(self.font_medium, title, WHITE), (10, 10))
+        surface.blit(self.text(self.font_large, str(score), GOLD), (10, 35))
     
     def draw_instructions(self, screen):
         instructions = [
@@ -351,234 +961,816 @@ class UI:
         
         panel_height = len(instructions) * 25 + 20
         panel_rect = pygame.Rect(10, SCREEN_HEIGHT - panel_height - 10, 350, panel_height)
-        self.draw_rounded_rect(screen, (0, 0, 0, 120), panel_rect, 15, 2, SOFT_BLUE)
-        
+        screen.blit(self.panel("instructions", None, panel_rect, self.render_instructions,
+                               instructions), panel_rect)
+        return panel_rect
+    
+    def render_instructions(self, surface, instructions):
+        self.draw_panel_background(surface, SOFT_BLUE)
         for i, instruction in enumerate(instructions):
             color = WHITE if i == 0 else LIGHT_GRAY
-            text = self.font_small.render(instruction, True, color)
-            screen.blit(text, (20, SCREEN_HEIGHT - panel_height + i * 25))
+            surface.blit(self.text(self.font_small, instruction, color), (10, 10 + i * 25))
     
     def draw_game_over(self, screen, score):
         self.pulse += 0.1
         pulse_scale = 1 + 0.1 * math.sin(self.pulse)
         
-        # Dark overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(180)
-        overlay.fill(SPACE_DARK)
-        screen.blit(overlay, (0, 0))
+        # Dark overlay, allocated once
+        if self.overlay is None or not self.retained:
+            self.overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.overlay.set_alpha(180)
+            self.overlay.fill(SPACE_DARK)
+        screen.blit(self.overlay, (0, 0))
         
         # Game over panel
         panel_rect = pygame.Rect(SCREEN_WIDTH//2 - 250, SCREEN_HEIGHT//2 - 150, 500, 300)
-        self.draw_rounded_rect(screen, (20, 20, 40), panel_rect, 20, 3, CUTE_PINK)
+        screen.blit(self.panel("game_over", score, panel_rect, self.render_game_over, score),
+                    panel_rect)
+        
+        # Restart instructions with pulse effect; the font sizes it swings
+        # through are few, so each scaled variant is cached like any text
+        restart_font = self.font(int(36 * pulse_scale))
+        restart_text = self.text(restart_font, "Press R to Restart • Q to Quit", WHITE)
+        r_rect = restart_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 40))
+        screen.blit(restart_text, r_rect)
+        return screen.get_rect()
+    
+    def draw_title(self, screen, progress, running, error=None):
+        # Title screen shown while the camera and hand model load; the title
+        # bobs and the bar fills as background phases finish
+        self.pulse += 0.05
+        panel_rect = pygame.Rect(SCREEN_WIDTH//2 - 300, SCREEN_HEIGHT//2 - 140, 600, 280)
+        self.draw_rounded_rect(screen, (20, 20, 40, 200), panel_rect, 20, 3, MINT_GREEN)
+        
+        title = self.text(self.font_huge, "🚀 Cute Space Shooter", MINT_GREEN)
+        bob = int(8 * math.sin(self.pulse))
+        screen.blit(title, title.get_rect(center=(SCREEN_WIDTH//2, panel_rect.top + 70 + bob)))
+        
+        bar = pygame.Rect(panel_rect.left + 60, panel_rect.top + 150, panel_rect.width - 120, 18)
+        pygame.draw.rect(screen, DARK_GRAY, bar, border_radius=9)
+        filled = bar.copy()
+        filled.width = max(bar.height, int(bar.width * progress))
+        pygame.draw.rect(screen, GOLD, filled, border_radius=9)
+        
+        if error:
+            status, color = "Hand tracking unavailable", RED
+        elif running:
+            status, color = "Loading: " + ", ".join(running), LIGHT_GRAY
+        else:
+            status, color = "Starting hand tracking...", LIGHT_GRAY
+        status_text = self.text(self.font_small, status, color)
+        screen.blit(status_text, status_text.get_rect(center=(SCREEN_WIDTH//2, bar.bottom + 25)))
+        hint = self.text(self.font_small, "Press SPACE to start without waiting", WHITE)
+        screen.blit(hint, hint.get_rect(center=(SCREEN_WIDTH//2, bar.bottom + 60)))
+        return panel_rect
+    
+    def render_game_over(self, surface, score):
+        self.draw_rounded_rect(surface, (20, 20, 40), surface.get_rect(), 20, 3, CUTE_PINK)
+        center_x = surface.get_width() // 2
         
         # Game over text
-        game_over = self.font_huge.render("💥 GAME OVER", True, CUTE_PINK)
-        go_rect = game_over.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 80))
-        screen.blit(game_over, go_rect)
+        game_over = self.text(self.font_huge, "💥 GAME OVER", CUTE_PINK)
+        surface.blit(game_over, game_over.get_rect(center=(center_x, 70)))
         
         # Final score
-        final_score = self.font_large.render(f"Final Score: {score}", True, GOLD)
-        fs_rect = final_score.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 20))
-        screen.blit(final_score, fs_rect)
-        
-        # Restart instructions with pulse effect
-        restart_font = pygame.font.Font(None, int(36 * pulse_scale))
-        restart_text = restart_font.render("Press R to Restart • Q to Quit", True, WHITE)
-        r_rect = restart_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 40))
-        screen.blit(restart_text, r_rect)
+        final_score = self.text(self.font_large, f"Final Score: {score}", GOLD)
+        surface.blit(final_score, final_score.get_rect(center=(center_x, 130)))
+
+class Player:
+    # One ship and everything that is per player: score, laser cooldown and
+    # the shots fired / enemies hit that simulate.py reports
+    def __init__(self, index, players, particles, hand_filter="lerp"):
+        self.index = index
+        self.color = PLAYER_COLORS[index]
+        start_x = SCREEN_WIDTH * (index + 0.5) / players
+        self.ship = Spaceship(start_x, SCREEN_HEIGHT - 150, particles, self.color, hand_filter)
+        self.score = 0
+        self.laser_cooldown = 0
+        self.shots = 0
+        self.hits = 0
 
 class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("🚀 Cute Space Shooter - Gesture Controlled! 🚀")
+    def __init__(self, source=None, pipelined=False, dirty_rects=False, star_count=100,
+                 parallax=False, seed=None, record=None, replay=None, replay_fast=False,
+                 roi_tracking=False, inference_size=None, profile=False, profile_dir=".",
+                 horde=False, sprite_cache=True, players=1, quality="high", latency_report=False,
+                 background_startup=False, startup_report=False, preview=False,
+                 hand_filter=None, spawn_interval=SPAWN_INTERVAL, enemy_speed=ENEMY_SPEED,
+                 laser_cooldown=LASER_COOLDOWN, headless=False, idle=False):
+        # Recordings hold a single hand, so they are single-player only
+        if players > 1 and (record or replay):
+            raise ValueError("recording and replay support a single player only")
+        
+        # Phase timing since main started importing; with background_startup
+        # the camera and hand model load behind an animated title screen
+        self.startup = Startup(IMPORT_START)
+        self.startup.record("import game modules", IMPORT_START, IMPORT_END)
+        self.startup_report = startup_report
+        init_start = time.perf_counter()
+        
+        # Replays carry the seed and hand filter they were recorded with
+        self.replay = InputReplay(replay) if replay else None
+        if self.replay is not None:
+            seed = self.replay.seed
+            if hand_filter not in (None, self.replay.hand_filter):
+                print(f"⚠️ Replaying with the recorded {self.replay.hand_filter} filter, "
+                      f"not {hand_filter}")
+            hand_filter = self.replay.hand_filter
+        elif seed is None and record:
+            seed = random.randrange(2 ** 31)
+        if hand_filter is None:
+            hand_filter = "lerp"
+        self.seed = seed
+        self.replay_fast = replay_fast
+        if seed is not None:
+            random.seed(seed)
+        
+        # Headless games (simulate.py) have no window, drawing or hand
+        # tracking; the caller feeds inputs to advance()
+        self.headless = headless
+        self.screen = None
+        self.compositor = None
+        if not headless:
+            self.screen = self.startup.timed("open window", pygame.display.set_mode,
+                                             (SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("🚀 Cute Space Shooter - Gesture Controlled! 🚀")
+            self.compositor = Compositor(self.screen, dirty_rects)
         self.clock = pygame.time.Clock()
         
         # Game objects
-        self.spaceship = Spaceship(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 150)
-        self.lasers = []
-        self.enemies = []
-        self.stars = [Star() for _ in range(100)]
-        self.explosion_particles = []
+        self.particles = ParticleSystem(seed=seed)
+        self.player_count = players
+        self.hand_filter = hand_filter
+        self.players = [Player(i, players, self.particles, hand_filter) for i in range(players)]
+        # Capture time of the hand result being applied, and the time the
+        # filters predict to in every step of the frame. The loop sets both
+        # each frame and recordings store the clock, so a replay predicts
+        # exactly as the live game did (None: the real clock)
+        self.input_time = None
+        self.input_clock = None
+        self.lasers = LaserStore()
+        self.enemies = EnemyStore()
+        self.enemies.speed_range = enemy_speed
+        self.collision_grid = SpatialHash()
+        self.horde = horde
+        self.spawn_interval = spawn_interval
+        self.laser_cooldown = laser_cooldown
+        # Pre-rendered animation frames; None draws every shape from primitives
+        self.sprites = SpriteCache() if sprite_cache and not headless else None
+        self.starfield = Starfield(SCREEN_WIDTH, SCREEN_HEIGHT, star_count,
+                                   PARALLAX_LAYERS if parallax else CLASSIC_LAYERS, seed)
         
-        # Game state
-        self.score = 0
+        # Game state; steps_played and enemies_spawned count since the last restart
         self.game_over = False
         self.enemy_spawn_timer = 0
-        self.laser_cooldown = 0
+        self.steps_played = 0
+        self.enemies_spawned = 0
+        self.accumulator = 0.0
+        self.skipped_frames = 0
+        
+        # Hand tracking (a replay needs neither camera nor MediaPipe)
+        self.hand_tracker = None
+        self.source = None
+        if self.replay is None and not headless:
+            self.source = source if source is not None else CameraSource(lazy=True)
+            self.hand_tracker = HandTracker(not self.source.provides_landmarks,
+                                            roi_tracking, inference_size, players=players,
+                                            load=False)
+        self.tracking_seq = 0
+        self.last_result = HandResult(-1, 0.0)
+        self.next_poll = 0.0
+        self.recorder = InputRecorder(record, seed, SIM_RATE, hand_filter) if record else None
+        
+        # Quality: a fixed level, or "auto" to let the governor hold the frame budget
+        self.base_inference_size = inference_size
+        self.animate = True
+        self.governor = None
+        if quality == "auto":
+            self.governor = QualityGovernor(1.0 / FPS)
+            self.apply_quality(self.governor.level)
+        else:
+            self.apply_quality(QUALITY_LEVELS[level_index(quality)])
+        
+        # Stage timing (P toggles the overlay, T exports a trace)
+        self.profiler = prof.Profiler(enabled=profile)
+        self.profile_dir = profile_dir
+        
+        # Capture-to-flip latency histograms, printed at exit with latency_report
+        self.latency = lat.LatencyTracker(players)
+        self.latency_report = latency_report
+        
+        # Pipelined mode: capture + inference run on a background worker
+        self.pipelined = pipelined and self.replay is None
+        self.mailbox = None
+        self.tracking_worker = None
+        self.closed = False
+        
+        # Low-power idle on the game over screen and while nobody plays
+        # (see idle.py); replays keep their recorded frame timing
+        self.idle_monitor = IdleMonitor() if idle and self.replay is None and not headless else None
+        self.idle = False
+        
+        # UI; C toggles the camera preview inset
+        self.ui = None if headless else UI()
+        self.preview = CameraPreview()
+        self.show_preview = preview
+        self.startup.record("build game", init_start, time.perf_counter())
+        
+        # The title screen shows until tracking is ready (or SPACE skips it)
+        self.tracking_ready = False
+        self.tracking_error = None
+        self.loading = self.replay is None and not headless
+        self.title = background_startup and self.loading
+        if self.loading:
+            phases = self.tracking_phases()
+            if background_startup:
+                for thread, thread_phases in phases:
+                    self.startup.run_in_background(thread, thread_phases)
+            else:
+                for _, thread_phases in phases:
+                    for name, fn in thread_phases:
+                        self.startup.timed(name, fn)
+                self.finish_startup()
+        
+    def tracking_phases(self):
+        # [(thread, [(phase, fn), ...]), ...]: opening the source and loading
+        # the model don't depend on each other, so they get a thread each
+        def import_module(name):
+            return lambda: __import__(name)
+        source = self.source
+        source_phases = []
+        if isinstance(source, (CameraSource, VideoFileSource, ImageSequenceSource)):
+            source_phases.append(("import cv2", import_module("cv2")))
+        name = "open camera" if isinstance(source, CameraSource) else "open input"
+        source_phases.append((name, source.open))
+        phases = [("source", source_phases)]
+        if self.hand_tracker.inference:
+            phases.append(("model", [
+                ("import mediapipe", import_module("mediapipe")),
+                ("build hand model", self.hand_tracker.load_model),
+                ("warm up model", lambda: self.hand_tracker.warm_up(self.source.frame_size)),
+            ]))
+        return phases
+        
+    def finish_startup(self):
+        # Runs on the main thread once every startup phase has finished
+        self.loading = False
+        self.startup.mark("tracking ready")
+        if self.startup.errors:
+            phase, error = self.startup.errors[0]
+            self.tracking_error = f"{phase} failed: {error}"
+            print(f"⚠️ Hand tracking unavailable ({self.tracking_error}) - "
+                  "the game runs without it")
+        else:
+            self.tracking_ready = True
+            if self.pipelined:
+                self.mailbox = ResultMailbox()
+                self.tracking_worker = TrackingWorker(self.source, self.hand_tracker,
+                                                      self.mailbox, self.profiler,
+                                                      self.preview_target())
+                self.tracking_worker.start()
+        if self.title:
+            self.title = False
+            self.compositor.request_full_redraw()
+        
+    def preview_target(self):
+        # The preview for track_frame to fill, None while it is hidden
+        return self.preview if self.show_preview else None
+        
+    def toggle_preview(self):
+        self.show_preview = not self.show_preview
+        if self.tracking_worker is not None:
+            self.tracking_worker.preview = self.preview_target()
+        self.compositor.request_full_redraw()
         
-        # Hand tracking
-        self.hand_tracker = HandTracker()
-        self.cap = cv2.VideoCapture(0)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    @property
+    def quality_level(self):
+        # Name of the quality level in use
+        return self.quality["name"]
         
-        # UI
-        self.ui = UI()
+    def apply_quality(self, level):
+        self.quality = level
+        self.particles.emission_scale = level["particles"]
+        self.starfield.set_visible(int(round(self.starfield.count * level["stars"])))
+        self.animate = level["animate"]
+        if self.hand_tracker is not None:
+            sizes = [s for s in (self.base_inference_size, level["inference_size"]) if s]
+            self.hand_tracker.inference_size = min(sizes) if sizes else None
+            self.hand_tracker.inference_interval = level["inference_interval"]
+        
+    def set_idle(self, idle):
+        # Idle polls the camera slowly with a small inference input and emits
+        # no particles; waking restores the quality level's settings
+        self.idle = idle
+        if idle:
+            self.particles.clear()
+            self.particles.emission_scale = 0.0
+            if self.hand_tracker is not None:
+                sizes = [s for s in (self.hand_tracker.inference_size, IDLE_INFERENCE_SIZE) if s]
+                self.hand_tracker.inference_size = min(sizes)
+                self.hand_tracker.inference_interval = 1
+            self.next_poll = 0.0
+        else:
+            self.apply_quality(self.quality)
+        if self.tracking_worker is not None:
+            self.tracking_worker.poll_interval = IDLE_POLL_INTERVAL if idle else 0.0
+            if not idle:
+                self.tracking_worker.wake_event.set()
+        self.compositor.request_full_redraw()
+        
+    def idle_wait(self, frame_start):
+        # Sleeps out the rest of an idle frame, ending early on a key press
+        end = frame_start + 1.0 / IDLE_FPS
+        while True:
+            remaining = end - time.perf_counter()
+            if remaining <= 0 or pygame.event.peek((pygame.KEYDOWN, pygame.QUIT)):
+                break
+            time.sleep(min(remaining, IDLE_EVENT_CHECK))
+        # Keep the clock's frame timing in step for the next full-rate tick
+        self.clock.tick()
+        
+    @property
+    def spaceship(self):
+        # Player 1's ship
+        return self.players[0].ship
+        
+    @property
+    def score(self):
+        # Team score
+        return sum(player.score for player in self.players)
         
     def handle_collision(self):
-        # Laser-Enemy collisions
-        for laser in self.lasers[:]:
-            for enemy in self.enemies[:]:
-                if (abs(laser.x - enemy.x) < (laser.width + enemy.width) // 2 and
-                    abs(laser.y - enemy.y) < (laser.height + enemy.height) // 2):
-                    self.lasers.remove(laser)
-                    enemy.explode()
-                    self.enemies.remove(enemy)
-                    self.score += 10
-                    break
+        lasers, enemies = self.lasers, self.enemies
+        enemy_x, enemy_y = enemies.x[:enemies.count], enemies.y[:enemies.count]
+        enemy_size = (Enemy.width, Enemy.height)
+        
+        # Laser-Enemy collisions (broadphase grid, one enemy per laser)
+        hit_lasers, destroyed = find_laser_hits(lasers.x[:lasers.count], lasers.y[:lasers.count],
+                                                (Laser.width, Laser.height), enemy_x, enemy_y,
+                                                enemy_size, self.collision_grid)
+        enemies.explode(destroyed, self.particles)
+        if len(destroyed):
+            kills = np.bincount(lasers.owner[hit_lasers], minlength=self.player_count)
+            for player, count in zip(self.players, kills.tolist()):
+                player.score += 10 * count
+                player.hits += count
         
-        # Enemy-Spaceship collisions
-        for enemy in self.enemies:
-            if (abs(self.spaceship.x - enemy.x) < (self.spaceship.width + enemy.width) // 2 and
-                abs(self.spaceship.y - enemy.y) < (self.spaceship.height + enemy.height) // 2):
+        # Enemy-Spaceship collisions, reusing the same grid; the team shares one life
+        for player in self.players:
+            ship = player.ship
+            if ship_hit(ship.x, ship.y, (ship.width, ship.height), enemy_x, enemy_y, enemy_size,
+                        self.collision_grid, destroyed):
                 self.game_over = True
+        
+        # Swap-remove everything that was hit in one pass
+        lasers.remove(hit_lasers)
+        enemies.remove(destroyed)
     
     def spawn_enemies(self):
         if self.enemy_spawn_timer <= 0:
-            enemy_x = random.randint(50, SCREEN_WIDTH - 50)
-            self.enemies.append(Enemy(enemy_x, -50))
-            self.enemy_spawn_timer = random.randint(90, 150)  # Slower spawn rate
+            if self.horde:
+                self.spawn_wave(HORDE_WAVE_SIZE)
+                self.enemy_spawn_timer = HORDE_WAVE_INTERVAL
+            else:
+                enemy_x = random.randint(50, SCREEN_WIDTH - 50)
+                self.enemies.spawn(enemy_x, -50)
+                self.enemies_spawned += 1
+                self.enemy_spawn_timer = random.randint(*self.spawn_interval)
         else:
             self.enemy_spawn_timer -= 1
     
+    def spawn_wave(self, count):
+        xs = np.array([random.randint(50, SCREEN_WIDTH - 50) for _ in range(count)], dtype=np.float64)
+        ys = np.array([-50 - random.uniform(0, HORDE_WAVE_DEPTH) for _ in range(count)])
+        speeds = np.array([random.uniform(*self.enemies.speed_range) for _ in range(count)])
+        self.enemies.spawn_many(xs, ys, speeds)
+        self.enemies_spawned += count
+    
     def update_game_objects(self):
-        # Update stars
-        for star in self.stars:
-            star.update()
+        # Update stars (purely visual, so headless and idle games skip them
+        # and the particles; emissions into a full particle buffer are dropped)
+        visual = not (self.headless or self.idle)
+        if visual:
+            self.starfield.update()
             
-        # Update lasers
-        for laser in self.lasers[:]:
-            laser.update()
-            if laser.is_off_screen():
-                self.lasers.remove(laser)
-        
-        # Update enemies
-        for enemy in self.enemies[:]:
-            enemy.update()
-            if enemy.is_off_screen():
-                self.enemies.remove(enemy)
-        
-        # Update explosion particles
-        self.explosion_particles = [p for p in self.explosion_particles if p.is_alive()]
-        for particle in self.explosion_particles:
-            particle.update()
-    
-    def draw_everything(self, hand_detected, confidence, is_fist):
-        # Gradient background
-        for y in range(SCREEN_HEIGHT):
-            color_ratio = y / SCREEN_HEIGHT
-            r = int(SPACE_DARK[0] * (1 - color_ratio) + (SPACE_DARK[0] + 20) * color_ratio)
-            g = int(SPACE_DARK[1] * (1 - color_ratio) + (SPACE_DARK[1] + 30) * color_ratio)
-            b = int(SPACE_DARK[2] * (1 - color_ratio) + (SPACE_DARK[2] + 50) * color_ratio)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+        # Update lasers and enemies, culling whatever left the screen
+        self.lasers.update()
+        self.enemies.update()
+        
+        # Update trail and explosion particles
+        if visual:
+            self.particles.update()
+    
+    def draw_everything(self, hand_detected, confidence, is_fist, alpha=1.0, result=None):
+        # alpha blends between the previous and current simulation state;
+        # result feeds the camera preview
+        compositor = self.compositor
+        
+        # The game over overlay and the animated title cover the whole screen
+        if self.game_over or self.title:
+            compositor.request_full_redraw()
+        
+        # Cached gradient background
+        compositor.begin_frame()
+        mark = compositor.mark
         
         # Draw stars
-        for star in self.stars:
-            star.draw(self.screen)
+        compositor.mark_all(self.starfield.draw(self.screen, alpha))
         
-        # Draw explosion particles
-        for particle in self.explosion_particles:
-            particle.draw(self.screen)
+        # Draw trail and explosion particles
+        compositor.mark_all(self.particles.draw(self.screen, alpha))
         
         # Draw game objects
-        self.spaceship.draw(self.screen)
-        for laser in self.lasers:
-            laser.draw(self.screen)
-        for enemy in self.enemies:
-            enemy.draw(self.screen)
+        for player in self.players:
+            mark(player.ship.draw(self.screen, alpha, self.sprites))
+        compositor.mark_all(self.lasers.draw(self.screen, alpha, self.sprites, self.animate))
+        compositor.mark_all(self.enemies.draw(self.screen, alpha, self.sprites, self.animate))
         
         # Draw UI
-        self.ui.draw_hand_status(self.screen, hand_detected, confidence, is_fist)
-        self.ui.draw_score_panel(self.screen, self.score)
-        self.ui.draw_instructions(self.screen)
+        mark(self.ui.draw_hand_status(self.screen, hand_detected, confidence, is_fist))
+        if self.player_count == 1:
+            mark(self.ui.draw_score_panel(self.screen, self.score))
+        else:
+            for player in self.players:
+                mark(self.ui.draw_score_panel(self.screen, player.score, player=player.index,
+                                              color=player.color))
+        mark(self.ui.draw_instructions(self.screen))
+        if self.profiler.enabled:
+            mark(self.ui.draw_profiler(self.screen, self.profiler))
+        if self.show_preview and result is not None:
+            mark(self.ui.draw_camera_preview(self.screen, self.preview, result.preview,
+                                             result.landmarks, result.gesture))
         
         if self.game_over:
             self.ui.draw_game_over(self.screen, self.score)
+        elif self.title:
+            progress, running = self.startup.progress()
+            self.ui.draw_title(self.screen, progress, running, self.tracking_error)
+    
+    def present(self):
+        self.compositor.present()
     
     def process_hand_tracking(self):
-        ret, frame = self.cap.read()
-        if not ret:
-            return None, False, False, 0
-        
-        frame = cv2.flip(frame, 1)
-        frame = self.hand_tracker.find_hands(frame)
-        lm_list = self.hand_tracker.find_position(frame)
-        
-        hand_x, hand_y = self.hand_tracker.get_hand_center(lm_list)
-        is_fist = self.hand_tracker.is_fist(lm_list)
+        if not self.tracking_ready:
+            return HandResult(-1, time.perf_counter())
+        if self.pipelined:
+            result = self.mailbox.get()
+            # Nothing yet, or the worker has fallen behind - don't act on old data
+            if result is None or result.age() > STALE_RESULT_AGE:
+                return HandResult(-1, time.perf_counter())
+        else:
+            # Idle frames in between camera polls reuse the last result. Polls
+            # keep to a fixed schedule rather than drifting to the next frame
+            if self.idle:
+                now = time.perf_counter()
+                if now < self.next_poll:
+                    return self.last_result
+                self.next_poll = max(self.next_poll + IDLE_POLL_INTERVAL, now)
+            result = track_frame(self.source, self.hand_tracker, self.tracking_seq, self.profiler,
+                                 self.preview_target())
+            if result is None:
+                return HandResult(-1, time.perf_counter())
+            self.tracking_seq += 1
+            self.last_result = result
         
-        return hand_x, is_fist, self.hand_tracker.hand_detected, self.hand_tracker.confidence
+        return result
     
     def restart_game(self):
-        self.spaceship = Spaceship(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 150)
-        self.lasers = []
-        self.enemies = []
-        self.explosion_particles = []
-        self.score = 0
+        self.particles.clear()
+        self.players = [Player(i, self.player_count, self.particles, self.hand_filter)
+                        for i in range(self.player_count)]
+        self.lasers.clear()
+        self.enemies.clear()
         self.game_over = False
         self.enemy_spawn_timer = 0
-        self.laser_cooldown = 0
+        self.steps_played = 0
+        self.enemies_spawned = 0
+        if self.compositor is not None:
+            self.compositor.request_full_redraw()
     
     def run(self):
         print("🚀 Starting Cute Space Shooter!")
-        print("📷 Make sure your webcam is connected and working")
-        print("✋ Show your hand to the camera to start playing!")
+        if self.replay is None:
+            print("📷 Make sure your webcam is connected and working")
+            print("✋ Show your hand to the camera to start playing!")
+        else:
+            print(f"🎞️ Replaying {len(self.replay)} recorded frames (seed {self.seed})")
         
         running = True
+        profiler = self.profiler
+        self.accumulator = 0.0
+        self.skipped_frames = 0
+        last_time = time.perf_counter()
+        first_frame = True
         
         while running:
+            frame_start = time.perf_counter()
             # Handle events
+            restarted = False
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_q:
                         running = False
-                    elif event.key == pygame.K_r and self.game_over:
+                    elif event.key == pygame.K_r and self.game_over and self.replay is None:
                         self.restart_game()
+                        restarted = True
+                    elif event.key == pygame.K_p:
+                        self.profiler.enabled = not self.profiler.enabled
+                        self.compositor.request_full_redraw()
+                    elif event.key == pygame.K_t:
+                        self.export_profile()
+                    elif event.key == pygame.K_c:
+                        self.toggle_preview()
+                    elif event.key == pygame.K_SPACE and self.title:
+                        # Play without waiting; the ship follows the hand once tracking is up
+                        self.title = False
+                        self.compositor.request_full_redraw()
             
-            if not self.game_over:
-                # Process hand tracking
-                hand_x, is_fist, hand_detected, confidence = self.process_hand_tracking()
-                
-                # Update spaceship position based on hand
-                self.spaceship.update(hand_x)
-                
-                # Handle shooting
-                if is_fist and hand_detected and self.laser_cooldown <= 0:
-                    self.lasers.append(Laser(self.spaceship.x, self.spaceship.y - self.spaceship.height // 2))
-                    self.laser_cooldown = 30  # Cooldown
-                
-                if self.laser_cooldown > 0:
-                    self.laser_cooldown -= 1
-                
-                # Spawn enemies
-                self.spawn_enemies()
-                
-                # Update game objects
-                self.update_game_objects()
-                
-                # Handle collisions
-                self.handle_collision()
-                
-                # Draw everything
-                self.draw_everything(hand_detected, confidence, is_fist)
+            now = time.perf_counter()
+            frame_dt = min(now - last_time, MAX_FRAME_TIME)
+            last_time = now
+            
+            if self.replay is not None:
+                # Recorded input and frame timing stand in for the camera and clock
+                record = self.replay.next()
+                if record is None:
+                    break
+                if record["restart"]:
+                    self.restart_game()
+                # Play was paused behind the title screen while tracking loaded
+                if self.title and not record["title"]:
+                    self.compositor.request_full_redraw()
+                self.title = bool(record["title"])
+                result = HandResult.from_record(record)
+                frame_dt = float(record["frame_dt"])
+                clock = float(record["clock"])
             else:
-                # Game over state - still show hand tracking
-                hand_x, is_fist, hand_detected, confidence = self.process_hand_tracking()
-                self.update_game_objects()  # Keep particles moving
-                self.draw_everything(hand_detected, confidence, is_fist)
+                # Finite sources (video files, image sequences) end the session
+                if self.source.exhausted:
+                    break
+                # Process hand tracking (also during game over, for the status panel)
+                result = self.process_hand_tracking()
+                clock = time.perf_counter()
+                if self.recorder is not None:
+                    self.recorder.write(result, frame_dt, clock, restarted, self.title)
+                # Idle changes take effect this frame, so a wake-up is drawn at full rate
+                if self.idle_monitor is not None and self.tracking_ready and not self.title:
+                    if self.idle_monitor.update(now, result.hand_detected, self.game_over):
+                        self.set_idle(self.idle_monitor.idle)
+            is_fist, hand_detected, confidence = result.is_fist, result.hand_detected, result.confidence
+            inputs = result.player_inputs(self.player_count)
+            self.input_time = result.timestamp
+            self.input_clock = clock
+            if self.replay is None:
+                self.latency.begin(result, inputs)
             
-            pygame.display.flip()
-            self.clock.tick(FPS)
+            # Advance the simulation in fixed steps for the real time that passed
+            if not self.advance(inputs, frame_dt):
+                continue
+            
+            # Draw everything, interpolated between the last two steps
+            profiler.begin(prof.DRAW)
+            self.draw_everything(hand_detected, confidence, is_fist, self.accumulator / SIM_DT,
+                                 result)
+            profiler.end(prof.DRAW)
+            profiler.begin(prof.PRESENT)
+            self.present()
+            self.latency.presented()
+            profiler.end(prof.PRESENT)
+            profiler.end_frame()
+            if first_frame:
+                self.startup.mark("first frame")
+                first_frame = False
+            if self.loading and self.startup.done:
+                self.finish_startup()
+            if self.startup_report and not self.loading:
+                print("⏱️ Startup")
+                print(self.startup.report())
+                self.startup_report = False
+            # Idle frames say nothing about the load the governor is there for
+            if self.governor is not None and not self.idle:
+                self.update_quality(time.perf_counter() - frame_start)
+            if self.idle:
+                self.idle_wait(frame_start)
+            elif not (self.replay is not None and self.replay_fast):
+                self.clock.tick(FPS)
+        
+        if self.replay is not None:
+            print(f"🎞️ Replayed {self.replay.position} frames - final score {self.score}")
+        if self.latency_report:
+            print("⏱️ Motion-to-photon latency")
+            print(self.latency.report())
+    
+    def update_quality(self, frame_time):
+        # Feeds one frame's work time (without the wait for the camera) to the governor
+        if self.hand_tracker is not None and not self.pipelined:
+            frame_time -= self.hand_tracker.capture_time
+        if self.governor.update(frame_time):
+            self.apply_quality(self.governor.level)
+    
+    def apply_input(self, player, hand_x, is_fist, hand_detected):
+        # Update spaceship position based on hand
+        ship = player.ship
+        now = time.perf_counter() if self.input_clock is None else self.input_clock
+        ship.update(hand_x, self.input_time, now)
         
-        # Cleanup
-        self.cap.release()
-        cv2.destroyAllWindows()
+        # Handle shooting
+        if is_fist and hand_detected:
+            if player.laser_cooldown <= 0:
+                self.lasers.spawn(ship.x, ship.y - ship.height // 2, player.index)
+                player.laser_cooldown = self.laser_cooldown
+                player.shots += 1
+                self.latency.laser_spawned(player.index)
+            else:
+                self.latency.laser_blocked(player.index)
+        
+        if player.laser_cooldown > 0:
+            player.laser_cooldown -= 1
+    
+    def apply_inputs(self, inputs):
+        # inputs: one (hand_x, is_fist, hand_detected) per player
+        for player, (hand_x, is_fist, hand_detected) in zip(self.players, inputs):
+            self.apply_input(player, hand_x, is_fist, hand_detected)
+        
+        # Spawn enemies
+        self.spawn_enemies()
+    
+    def advance(self, inputs, frame_dt):
+        # Runs the fixed steps owed for frame_dt seconds of real time. Returns
+        # False when the frame should not be drawn: still behind after the
+        # catch-up cap, a few draws are skipped to let the simulation catch
+        # up, then the backlog is dropped rather than spiral
+        self.accumulator += frame_dt
+        steps = 0
+        while self.accumulator >= SIM_DT and steps < MAX_SIM_STEPS:
+            self.step(inputs)
+            self.accumulator -= SIM_DT
+            steps += 1
+        if self.accumulator >= SIM_DT:
+            if self.skipped_frames < MAX_SKIPPED_FRAMES:
+                self.skipped_frames += 1
+                return False
+            self.accumulator %= SIM_DT
+        self.skipped_frames = 0
+        return True
+    
+    def step(self, inputs):
+        # One fixed simulation step of SIM_DT seconds
+        if not (self.game_over or self.title):
+            self.apply_inputs(inputs)
+            self.latency.target()
+            self.steps_played += 1
+            
+            # Update game objects
+            self.profiler.begin(prof.UPDATE)
+            self.update_game_objects()
+            self.profiler.end(prof.UPDATE)
+            
+            # Handle collisions
+            self.profiler.begin(prof.COLLISION)
+            self.handle_collision()
+            self.profiler.end(prof.COLLISION)
+        else:
+            # Title or game over - the ships hold still, particles keep moving
+            # (idle on the game over screen, nothing moves)
+            for player in self.players:
+                player.ship.snapshot()
+            if not self.idle:
+                self.profiler.begin(prof.UPDATE)
+                self.update_game_objects()
+                self.profiler.end(prof.UPDATE)
+    
+    def export_profile(self):
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        base = os.path.join(self.profile_dir, f"profile-{stamp}")
+        self.profiler.export_csv(base + ".csv")
+        self.profiler.export_chrome_trace(base + ".json")
+        print(f"📈 Profile written to {base}.csv and {base}.json")
+        
+    def shutdown(self):
+        if self.closed:
+            return
+        self.closed = True
+        
+        # Stop the worker before releasing the camera it is reading from;
+        # a worker that won't stop keeps the camera until the process exits
+        worker_stopped = self.tracking_worker is None or self.tracking_worker.stop()
+        if not worker_stopped:
+            print("⚠️ Tracking worker did not stop - leaving the camera open")
+        if self.recorder is not None:
+            self.recorder.close()
+        # Give a camera that is still opening in the background a moment to
+        # finish, so that it is released too
+        self.startup.join(1.0)
+        if self.source is not None and worker_stopped:
+            self.source.release()
+        if "cv2" in sys.modules:
+            sys.modules["cv2"].destroyAllWindows()
         pygame.quit()
-        sys.exit()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Gesture controlled space shooter")
+    parser.add_argument("--camera", type=int, default=0,
+                        help="index of the webcam to use")
+    parser.add_argument("--camera-size", default="640x480", metavar="WxH",
+                        help="requested webcam resolution")
+    parser.add_argument("--fourcc", help="requested webcam pixel format, e.g. MJPG")
+    parser.add_argument("--video", metavar="PATH",
+                        help="read frames from a video file instead of the webcam")
+    parser.add_argument("--images", metavar="DIR_OR_GLOB",
+                        help="read frames from an image sequence instead of the webcam")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="generate hand landmarks without a camera or MediaPipe")
+    parser.add_argument("--input-fps", type=float, default=30.0,
+                        help="frame rate for image sequences and synthetic input")
+    parser.add_argument("--input-fast", action="store_true",
+                        help="read file/synthetic input as fast as possible instead of in real time")
+    parser.add_argument("--input-loop", action="store_true",
+                        help="loop video files and image sequences")
+    parser.add_argument("--no-mirror", action="store_true",
+                        help="don't mirror frames horizontally before tracking")
+    parser.add_argument("--roi", action="store_true",
+                        help="run hand inference on a crop around the last detected hand")
+    parser.add_argument("--inference-size", type=int, metavar="PX",
+                        help="downscale inference input so its longest side is at most PX")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="run camera capture and hand inference on a background thread")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="only push changed screen regions to the display")
+    parser.add_argument("--stars", type=int, default=100,
+                        help="number of background stars")
+    parser.add_argument("--parallax", action="store_true",
+                        help="spread the stars over several parallax layers")
+    parser.add_argument("--players", type=int, default=1, choices=range(1, MAX_PLAYERS + 1),
+                        help="number of players, one hand each, sharing one inference pass")
+    parser.add_argument("--horde", action="store_true",
+                        help="send enemies in large waves of hundreds at a time")
+    parser.add_argument("--filter", choices=FILTERS,
+                        help="hand-position filter (default lerp; replays use the recorded one); "
+                             "one-euro and kalman predict ahead by the tracking latency")
+    parser.add_argument("--quality", default="auto",
+                        choices=["auto"] + [level["name"] for level in QUALITY_LEVELS],
+                        help="detail level; auto lowers it under load to hold the frame rate")
+    parser.add_argument("--no-idle", action="store_true",
+                        help="keep the full frame and inference rate on the game over screen "
+                             "and while no hand is seen")
+    parser.add_argument("--profile", action="store_true",
+                        help="start with the profiler overlay on (toggle with P, export with T)")
+    parser.add_argument("--profile-dir", default=".",
+                        help="directory for exported profiles")
+    parser.add_argument("--preview", action="store_true",
+                        help="start with the camera preview inset on (toggle with C)")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print how long each startup phase took")
+    parser.add_argument("--latency", action="store_true",
+                        help="print motion-to-photon latency histograms on exit")
+    parser.add_argument("--seed", type=int,
+                        help="seed the random number generators for a reproducible game")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record hand-tracking input to a binary file")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="replay a recording instead of using the camera")
+    parser.add_argument("--replay-fast", action="store_true",
+                        help="replay as fast as possible instead of in real time")
+    args = parser.parse_args(argv)
+    if args.players > 1 and (args.record or args.replay):
+        parser.error("--record and --replay support a single player only")
+    return args
+
+def make_source(args):
+    # Sources are created unopened; the game opens them in the background
+    realtime = not args.input_fast
+    mirror = not args.no_mirror
+    if args.video:
+        return VideoFileSource(args.video, realtime, args.input_loop, mirror, lazy=True)
+    if args.images:
+        return ImageSequenceSource(args.images, args.input_fps, realtime, args.input_loop, mirror,
+                                   lazy=True)
+    if args.synthetic:
+        return SyntheticSource(fps=args.input_fps, realtime=realtime, seed=args.seed,
+                               hands=args.players)
+    width, height = (int(v) for v in args.camera_size.lower().split("x"))
+    return CameraSource(args.camera, width, height, args.fourcc, mirror, lazy=True)
+
+def make_game(args, source=None):
+    # The game the command line describes; source defaults to make_source(args)
+    if source is None and not args.replay:
+        source = make_source(args)
+    return Game(source=source, pipelined=args.pipelined, dirty_rects=args.dirty_rects,
+                star_count=args.stars, parallax=args.parallax, seed=args.seed,
+                record=args.record, replay=args.replay, replay_fast=args.replay_fast,
+                roi_tracking=args.roi, inference_size=args.inference_size,
+                profile=args.profile, profile_dir=args.profile_dir, horde=args.horde,
+                players=args.players, quality=args.quality, latency_report=args.latency,
+                background_startup=True, startup_report=args.startup_report,
+                preview=args.preview, hand_filter=args.filter, idle=not args.no_idle)
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
\ No newline at end of file
+    game = make_game(parse_args())
+    try:
+        game.run()
+    finally:
+        game.shutdown()
+    sys.exit()
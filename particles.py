@@ -0,0 +1,144 @@
+"""Struct-of-arrays particle engine.
+
+All live particles sit packed at the front of preallocated NumPy arrays.
+Emitters append into the free tail, and update/decay/culling each run as a
+single vectorized step over the live slice. Drawing goes through a small
+cache of pre-rendered circle sprites and one ``Surface.blits`` call.
+"""
+import numpy as np
+import pygame
+
+PARTICLE_LIFE = 60
+MAX_RADIUS = 8
+
+
+class ParticleSystem:
+    def __init__(self, capacity=16384, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        # Positions at the start of the last update, for interpolated drawing
+        self.prev_x = np.zeros(capacity, dtype=np.float32)
+        self.prev_y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int16)
+        self.color = np.zeros(capacity, dtype=np.int16)
+        self.rng = np.random.default_rng(seed)
+        # Share of requested particles actually emitted (quality setting)
+        self.emission_scale = 1.0
+
+        # Colors are stored as indices into a small palette
+        self.palette = []
+        self.palette_index = {}
+        self.sprites = []
+
+    def color_id(self, color):
+        color = tuple(color[:3])
+        index = self.palette_index.get(color)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(color)
+            self.palette_index[color] = index
+            self.sprites.extend(self.render_sprites(color))
+        return index
+
+    def render_sprites(self, color):
+        sprites = []
+        for radius in range(MAX_RADIUS + 1):
+            radius = max(1, radius)
+            sprite = pygame.Surface((radius * 2 + 1, radius * 2 + 1))
+            sprite.set_colorkey((0, 0, 0))
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            sprites.append(sprite)
+        return sprites
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def reserve(self, count):
+        # Returns the slice of free slots to write into; emissions beyond
+        # capacity are dropped rather than growing the arrays
+        start = self.count
+        end = min(self.capacity, start + count)
+        self.count = end
+        return slice(start, end)
+
+    def emit(self, x, y, color, size):
+        if self.emission_scale < 1.0 and self.rng.random() >= self.emission_scale:
+            return
+        slots = self.reserve(1)
+        if slots.start == slots.stop:
+            return
+        i = slots.start
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.vx[i], self.vy[i] = self.rng.uniform(-2, 2, 2)
+        self.size[i] = size
+        self.life[i] = PARTICLE_LIFE
+        self.color[i] = self.color_id(color)
+
+    def burst(self, x, y, count, colors, spread, size_range):
+        # Scaled bursts keep at least one particle unless emission is off
+        if self.emission_scale <= 0.0:
+            return
+        if self.emission_scale < 1.0:
+            count = max(1, int(round(count * self.emission_scale)))
+        slots = self.reserve(count)
+        n = slots.stop - slots.start
+        if n <= 0:
+            return
+        rng = self.rng
+        self.x[slots] = x + rng.integers(-spread, spread + 1, n)
+        self.y[slots] = y + rng.integers(-spread, spread + 1, n)
+        self.prev_x[slots] = self.x[slots]
+        self.prev_y[slots] = self.y[slots]
+        self.vx[slots] = rng.uniform(-2, 2, n)
+        self.vy[slots] = rng.uniform(-2, 2, n)
+        self.size[slots] = rng.integers(size_range[0], size_range[1] + 1, n)
+        self.life[slots] = PARTICLE_LIFE
+        ids = np.array([self.color_id(c) for c in colors], dtype=np.int16)
+        self.color[slots] = ids[rng.integers(0, len(ids), n)]
+
+    def update(self):
+        n = self.count
+        if n == 0:
+            return
+        # Move, age and shrink (same curve as the old per-object Particle)
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.life[:n] -= 1
+        self.size[:n] *= self.life[:n] / PARTICLE_LIFE
+        np.maximum(self.size[:n], 0, out=self.size[:n])
+
+        # Cull dead particles by packing the survivors to the front
+        alive = self.life[:n] > 0
+        live = int(np.count_nonzero(alive))
+        if live != n:
+            for array in (self.x, self.y, self.prev_x, self.prev_y, self.vx, self.vy,
+                          self.size, self.life, self.color):
+                array[:live] = array[:n][alive]
+            self.count = live
+
+    def draw(self, screen, alpha=1.0):
+        n = self.count
+        if n == 0:
+            return []
+        radius = np.clip(self.size[:n].astype(np.int32), 1, MAX_RADIUS)
+        x, y = self.x[:n], self.y[:n]
+        if alpha != 1.0:
+            x = self.prev_x[:n] + (x - self.prev_x[:n]) * alpha
+            y = self.prev_y[:n] + (y - self.prev_y[:n]) * alpha
+        left = x.astype(np.int32) - radius
+        top = y.astype(np.int32) - radius
+        keys = self.color[:n].astype(np.int32) * (MAX_RADIUS + 1) + radius
+        sprites = self.sprites
+        return screen.blits(zip([sprites[k] for k in keys.tolist()],
+                                zip(left.tolist(), top.tolist())))
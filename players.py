@@ -0,0 +1,63 @@
+"""Stable assignment of detected hands to player slots.
+
+Every frame the hands from one inference pass are matched to players by
+trying each injective hand -> player mapping (at most 4! = 24 for four
+players) and keeping the cheapest. A player who is being tracked costs the
+distance from their last hand position, plus a penalty if the handedness
+does not match, so hands keep their player when they move or cross.
+A free slot costs the distance from its home lane plus a fixed penalty, so
+a new hand takes the free slot nearest to it rather than stealing a tracked
+player's identity. A player whose hand stays missing for ``lost_frames``
+frames is freed again.
+"""
+import itertools
+
+
+class PlayerAssigner:
+    def __init__(self, players, lost_frames=15, handedness_penalty=0.25, free_penalty=0.5):
+        self.players = players
+        self.lost_frames = lost_frames
+        self.handedness_penalty = handedness_penalty
+        self.free_penalty = free_penalty
+        self.reset()
+
+    def reset(self):
+        self.x = [None] * self.players
+        self.handedness = [None] * self.players
+        self.missing = [0] * self.players
+
+    def home(self, player):
+        # Players own equal vertical lanes of the frame, left to right
+        return (player + 0.5) / self.players
+
+    def cost(self, player, x, handedness):
+        if self.x[player] is None:
+            return abs(x - self.home(player)) + self.free_penalty
+        cost = abs(x - self.x[player])
+        if handedness and self.handedness[player] and handedness != self.handedness[player]:
+            cost += self.handedness_penalty
+        return cost
+
+    def assign(self, xs, handedness):
+        # xs: normalized hand x per hand, handedness: "Left"/"Right"/None per
+        # hand. Returns the player index for each hand, -1 for extra hands.
+        count = min(len(xs), self.players)
+        best, best_cost = (), None
+        for players in itertools.permutations(range(self.players), count):
+            cost = sum(self.cost(p, xs[h], handedness[h]) for h, p in enumerate(players))
+            if best_cost is None or cost < best_cost:
+                best, best_cost = players, cost
+
+        assignment = list(best) + [-1] * (len(xs) - count)
+        seen = set(best)
+        for h, p in enumerate(best):
+            self.x[p] = xs[h]
+            self.handedness[p] = handedness[h]
+            self.missing[p] = 0
+        for p in range(self.players):
+            if p not in seen and self.x[p] is not None:
+                self.missing[p] += 1
+                if self.missing[p] > self.lost_frames:
+                    self.x[p] = None
+                    self.handedness[p] = None
+        return assignment
@@ -0,0 +1,102 @@
+"""Picture-in-picture camera preview.
+
+The tracked frame (already captured and mirrored) is downscaled straight
+into one of a few preallocated BGR buffers. Each buffer is wrapped once in a
+pygame surface made with ``pygame.image.frombuffer``, which shares the
+array's memory: resizing into the buffer updates the surface, and no pixels
+are copied between NumPy and pygame. Buffers rotate, so the tracking thread
+(pipelined mode) never writes the one being drawn.
+
+Downscaling halves the frame with ``INTER_AREA`` (OpenCV has a fast path for
+exact halves) into preallocated intermediate buffers while it is at least
+twice the preview size, then finishes with ``INTER_LINEAR``. A single
+``INTER_AREA`` resize at an odd ratio costs ten times as much.
+
+Downscaling is timed. When it costs more than ``PREVIEW_BUDGET_MS`` (large
+camera frames, slow machines), the preview is only refreshed every few
+frames, so its average cost per frame stays within the budget; the frames in
+between show the last preview again.
+"""
+import math
+import time
+
+import numpy as np
+import pygame
+
+# Average per-frame budget for downscaling into the preview, in milliseconds
+PREVIEW_BUDGET_MS = 1.0
+# Weight of the newest downscale time in the running average
+COST_SMOOTHING = 0.1
+
+# MediaPipe's 21-landmark hand skeleton
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+
+
+class CameraPreview:
+    def __init__(self, width=200, buffers=3, budget_ms=PREVIEW_BUDGET_MS):
+        self.width = width
+        self.height = None
+        self.count = buffers
+        self.frame_size = None
+        self.halves = []
+        self.buffers = []
+        self.surfaces = []
+        self.slot = -1
+        # Running average of one downscale in seconds, and the refresh
+        # interval in frames that keeps it within the budget
+        self.budget = budget_ms / 1000
+        self.cost = None
+        self.interval = 1
+        self.skipped = 0
+
+    def allocate(self, frame_size):
+        w, h = frame_size
+        self.frame_size = frame_size
+        self.cost = None
+        self.height = max(1, round(self.width * h / w))
+        self.halves = []
+        while w // 2 >= self.width:
+            w, h = w // 2, h // 2
+            self.halves.append(np.empty((h, w, 3), dtype=np.uint8))
+        self.buffers = [np.zeros((self.height, self.width, 3), dtype=np.uint8)
+                        for _ in range(self.count)]
+        self.surfaces = [pygame.image.frombuffer(buffer, (self.width, self.height), "BGR")
+                         for buffer in self.buffers]
+
+    def capture(self, frame):
+        # Downscales a BGR frame into the next buffer and returns its slot;
+        # between refreshes, returns the slot of the last preview
+        import cv2
+        h, w = frame.shape[:2]
+        if self.frame_size == (w, h) and self.skipped + 1 < self.interval:
+            self.skipped += 1
+            return self.slot
+        if self.frame_size != (w, h):
+            self.allocate((w, h))
+        start = time.perf_counter()
+        image = frame
+        for half in self.halves:
+            image = cv2.resize(image, (half.shape[1], half.shape[0]), dst=half,
+                               interpolation=cv2.INTER_AREA)
+        self.slot = (self.slot + 1) % self.count
+        buffer = self.buffers[self.slot]
+        cv2.resize(image, (self.width, self.height), dst=buffer, interpolation=cv2.INTER_LINEAR)
+        self.measure(time.perf_counter() - start)
+        return self.slot
+
+    def measure(self, cost):
+        if self.cost is None:
+            self.cost = cost
+        else:
+            self.cost += COST_SMOOTHING * (cost - self.cost)
+        self.interval = max(1, math.ceil(self.cost / self.budget))
+        self.skipped = 0
+
+    def surface(self, slot):
+        return self.surfaces[slot] if slot is not None and self.surfaces else None
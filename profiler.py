@@ -0,0 +1,115 @@
+"""Hot-path timing spans for the main loop stages.
+
+Spans are recorded into preallocated NumPy ring buffers, so profiling never
+allocates per span. Besides the raw span ring (for CSV / Chrome trace export)
+the profiler keeps a per-frame table of time spent in each stage, which the
+in-game overlay turns into a frame-time graph and per-stage percentiles.
+
+With ``enabled`` off, ``begin``/``end`` return after a single attribute check.
+"""
+import json
+import threading
+import time
+
+import numpy as np
+
+STAGES = ("capture", "inference", "update", "collision", "draw", "present")
+CAPTURE, INFERENCE, UPDATE, COLLISION, DRAW, PRESENT = range(len(STAGES))
+
+
+class Profiler:
+    def __init__(self, enabled=False, span_capacity=65536, frame_capacity=600):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+        self.main_thread = threading.get_ident()
+
+        # Raw spans, oldest overwritten first
+        self.span_capacity = span_capacity
+        self.span_stage = np.zeros(span_capacity, dtype=np.int8)
+        self.span_thread = np.zeros(span_capacity, dtype=np.int8)
+        self.span_start = np.zeros(span_capacity, dtype=np.float64)
+        self.span_duration = np.zeros(span_capacity, dtype=np.float64)
+        self.span_count = 0
+        self.open = [0.0] * len(STAGES)
+
+        # Per-frame stage totals and frame times
+        self.frame_capacity = frame_capacity
+        self.frame_stage = np.zeros((frame_capacity, len(STAGES)), dtype=np.float64)
+        self.frame_total = np.zeros(frame_capacity, dtype=np.float64)
+        self.frame_count = 0
+        self.frame_start = None
+
+    def begin(self, stage):
+        if self.enabled:
+            self.open[stage] = time.perf_counter()
+
+    def end(self, stage):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        start = self.open[stage]
+        worker = threading.get_ident() != self.main_thread
+        with self.lock:
+            i = self.span_count % self.span_capacity
+            self.span_stage[i] = stage
+            self.span_thread[i] = worker
+            self.span_start[i] = start - self.origin
+            self.span_duration[i] = now - start
+            self.span_count += 1
+            self.frame_stage[self.frame_count % self.frame_capacity, stage] += now - start
+
+    def end_frame(self):
+        if not self.enabled:
+            self.frame_start = None
+            return
+        now = time.perf_counter()
+        with self.lock:
+            if self.frame_start is not None:
+                self.frame_total[self.frame_count % self.frame_capacity] = now - self.frame_start
+                self.frame_count += 1
+                self.frame_stage[self.frame_count % self.frame_capacity] = 0
+            self.frame_start = now
+
+    def recent_frames(self, window):
+        # (frame times, stage table) for the last `window` completed frames, oldest first
+        with self.lock:
+            n = min(window, self.frame_count, self.frame_capacity)
+            rows = (np.arange(self.frame_count - n, self.frame_count)) % self.frame_capacity
+            return self.frame_total[rows].copy(), self.frame_stage[rows].copy()
+
+    def stage_percentiles(self, window=120, percentiles=(50, 95)):
+        # {stage: [p50, p95, ...]} in milliseconds over recent frames
+        totals, stages = self.recent_frames(window)
+        if not len(totals):
+            return {}
+        values = np.percentile(stages, percentiles, axis=0) * 1000
+        stats = {name: values[:, i] for i, name in enumerate(STAGES)}
+        stats["frame"] = np.percentile(totals, percentiles) * 1000
+        return stats
+
+    def spans(self):
+        # Recorded spans in chronological order
+        with self.lock:
+            n = min(self.span_count, self.span_capacity)
+            rows = np.arange(self.span_count - n, self.span_count) % self.span_capacity
+            return (self.span_stage[rows], self.span_thread[rows],
+                    self.span_start[rows], self.span_duration[rows])
+
+    def export_csv(self, path):
+        stage, thread, start, duration = self.spans()
+        with open(path, "w") as f:
+            f.write("stage,thread,start_ms,duration_ms\n")
+            for s, t, b, d in zip(stage.tolist(), thread.tolist(), start.tolist(), duration.tolist()):
+                f.write(f"{STAGES[s]},{'worker' if t else 'main'},{b * 1000:.3f},{d * 1000:.3f}\n")
+
+    def export_chrome_trace(self, path):
+        # Trace-event format, loadable in chrome://tracing or Perfetto
+        stage, thread, start, duration = self.spans()
+        events = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+                   "args": {"name": name}} for tid, name in ((0, "main"), (1, "tracking worker"))]
+        for s, t, b, d in zip(stage.tolist(), thread.tolist(), start.tolist(), duration.tolist()):
+            events.append({"name": STAGES[s], "ph": "X", "pid": 1, "tid": t,
+                           "ts": round(b * 1e6, 3), "dur": round(d * 1e6, 3)})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
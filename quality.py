@@ -0,0 +1,145 @@
+"""Adaptive quality governor.
+
+The governor is fed the work time of every frame (excluding time spent
+sleeping for the frame cap or blocked on the camera) and watches a rolling
+window of it. When the window's 90th percentile goes over the frame budget,
+it steps one quality level down. When the percentile stays well under the
+budget for a full window, it steps one level back up. Every change starts
+a fresh window, and three things stop it from flapping between levels:
+
+- after every change it waits ``hold_frames`` before stepping up again;
+- an upgrade that is reverted within two windows of its hold ending
+  doubles the wait before the next upgrade, up to ``max_upgrade_hold``;
+- a downgrade remembers how much more the level it left cost than the one
+  below (the p90 that forced it over the first window's p90 after it).
+  The level is only tried again when the current p90 scaled by that ratio
+  fits the budget, or ``max_upgrade_hold`` frames later, when the ratio
+  is forgotten.
+
+Levels are plain dicts, highest quality first:
+
+- particles: share of trail/explosion particles emitted
+- stars: share of background stars drawn
+- animate: animate enemy antennae and laser glow (off draws one sprite each)
+- inference_size: cap on the longest side of the hand-inference input, or None
+- inference_interval: run hand inference on every Nth camera frame
+"""
+import time
+
+import numpy as np
+
+QUALITY_LEVELS = [
+    {"name": "high", "particles": 1.0, "stars": 1.0, "animate": True,
+     "inference_size": None, "inference_interval": 1},
+    {"name": "medium", "particles": 0.6, "stars": 0.6, "animate": True,
+     "inference_size": 320, "inference_interval": 1},
+    {"name": "low", "particles": 0.3, "stars": 0.35, "animate": False,
+     "inference_size": 256, "inference_interval": 2},
+    {"name": "minimum", "particles": 0.1, "stars": 0.15, "animate": False,
+     "inference_size": 192, "inference_interval": 3},
+]
+
+
+def level_index(name, levels=QUALITY_LEVELS):
+    for i, level in enumerate(levels):
+        if level["name"] == name:
+            return i
+    raise ValueError(f"unknown quality level {name!r}")
+
+
+class QualityGovernor:
+    def __init__(self, budget, levels=QUALITY_LEVELS, start=0, window=30, down_threshold=1.0,
+                 up_threshold=0.75, hold_frames=60, max_upgrade_hold=1800, log=print):
+        self.budget = budget
+        self.levels = levels
+        self.index = start
+        self.window = window
+        self.down_threshold = down_threshold
+        self.up_threshold = up_threshold
+        self.hold_frames = hold_frames
+        self.max_upgrade_hold = max_upgrade_hold
+        self.log = log
+
+        self.samples = np.zeros(window, dtype=np.float64)
+        self.filled = 0
+        self.cursor = 0
+        self.frame = 0
+        self.hold = 0
+        self.upgrade_hold = hold_frames
+        self.last_upgrade = None
+        self.upgrade_held = False
+        # Level index -> (its p90 over the next level down's, frame measured);
+        # left_p90 waits for the first window after a downgrade
+        self.cost_ratios = {}
+        self.left = None
+        self.left_p90 = 0.0
+        # (frame, time, old level, new level, p90 ms) per change
+        self.history = []
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    @property
+    def name(self):
+        return self.level["name"]
+
+    def percentile(self):
+        return float(np.percentile(self.samples[:self.filled], 90))
+
+    def update(self, frame_time):
+        # Feed one frame's work time in seconds; returns True if the level changed
+        self.frame += 1
+        self.samples[self.cursor] = frame_time
+        self.cursor = (self.cursor + 1) % self.window
+        self.filled = min(self.filled + 1, self.window)
+        if self.hold > 0:
+            self.hold -= 1
+        if self.filled < self.window:
+            return False
+
+        p90 = self.percentile()
+        if self.left is not None:
+            self.cost_ratios[self.left] = (self.left_p90 / max(p90, 1e-6), self.frame)
+            self.left = None
+        if p90 > self.budget * self.down_threshold and self.index < len(self.levels) - 1:
+            since_upgrade = self.frame - self.last_upgrade if self.last_upgrade is not None else None
+            if since_upgrade is not None and since_upgrade <= self.upgrade_hold + 2 * self.window:
+                # The last upgrade did not hold - wait longer before the next one
+                self.upgrade_hold = min(self.upgrade_hold * 2, self.max_upgrade_hold)
+            self.upgrade_held = False
+            self.left, self.left_p90 = self.index, p90
+            self.change(self.index + 1, p90, self.upgrade_hold)
+            return True
+        if (p90 < self.budget * self.up_threshold and self.index > 0 and not self.hold
+                and self.fits(self.index - 1, p90)):
+            self.last_upgrade = self.frame
+            self.upgrade_held = True
+            self.change(self.index - 1, p90, self.upgrade_hold)
+            return True
+        if self.upgrade_held and self.frame - self.last_upgrade > self.upgrade_hold + 4 * self.window:
+            # The last upgrade held: back to the normal upgrade hold
+            self.upgrade_hold = self.hold_frames
+        return False
+
+    def fits(self, index, p90):
+        # Whether level index is expected to hold the budget, going by what it
+        # cost relative to the level below when it was last left
+        if index not in self.cost_ratios:
+            return True
+        ratio, measured = self.cost_ratios[index]
+        if self.frame - measured > self.max_upgrade_hold:
+            del self.cost_ratios[index]
+            return True
+        return p90 * ratio <= self.budget * self.down_threshold
+
+    def change(self, index, p90, hold):
+        old = self.name
+        self.index = index
+        self.history.append((self.frame, time.time(), old, self.name, p90 * 1000))
+        if self.log is not None:
+            self.log(f"⚙️ Quality {old} -> {self.name} "
+                     f"(frame p90 {p90 * 1000:.1f} ms, budget {self.budget * 1000:.1f} ms)")
+        self.filled = 0
+        self.cursor = 0
+        self.hold = hold
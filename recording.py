@@ -0,0 +1,112 @@
+"""Compact binary recording and replay of hand-tracking input.
+
+A recording is a small fixed header followed by one fixed-size record per
+game-loop iteration. Records are staged in a preallocated NumPy record array
+and written to disk in blocks, so recording costs a couple of array stores
+per frame. Replays read the whole file back with ``np.fromfile`` and need
+neither a camera nor MediaPipe.
+"""
+import numpy as np
+
+MAGIC = b"HANDREC1"
+VERSION = 2
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("sim_rate", "<u4"),
+    ("seed", "<i8"),
+    ("filter", "S16"),         # hand filter the game was played with
+])
+
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),      # capture time of the hand result
+    ("frame_dt", "<f8"),       # real time fed to the simulation this frame
+    ("clock", "<f8"),          # time the hand filters predicted to this frame
+    ("seq", "<i4"),            # -1 for frames without a tracking result
+    ("hand_detected", "u1"),
+    ("is_fist", "u1"),
+    ("restart", "u1"),         # the player pressed R this frame
+    ("title", "u1"),           # the startup title screen was up (play paused)
+    ("confidence", "<f4"),
+    ("hand_x", "<f4"),         # NaN when there was no hand
+    ("landmarks", "<f4", (21, 3)),
+])
+
+
+class InputRecorder:
+    def __init__(self, path, seed, sim_rate, hand_filter="lerp", buffer_frames=256):
+        self.path = path
+        self.file = open(path, "wb")
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header["magic"] = MAGIC
+        header["version"] = VERSION
+        header["sim_rate"] = sim_rate
+        header["seed"] = seed
+        header["filter"] = hand_filter.encode()
+        self.file.write(header.tobytes())
+        self.buffer = np.zeros(buffer_frames, dtype=RECORD_DTYPE)
+        self.count = 0
+        self.frames = 0
+
+    def write(self, result, frame_dt, clock, restart=False, title=False):
+        record = self.buffer[self.count]
+        record["timestamp"] = result.timestamp
+        record["frame_dt"] = frame_dt
+        record["clock"] = clock
+        record["seq"] = result.seq
+        record["hand_detected"] = result.hand_detected
+        record["is_fist"] = result.is_fist
+        record["restart"] = restart
+        record["title"] = title
+        record["confidence"] = result.confidence
+        record["hand_x"] = np.nan if result.hand_x is None else result.hand_x
+        if result.landmarks is not None:
+            record["landmarks"] = result.landmarks
+        else:
+            record["landmarks"] = 0
+        self.count += 1
+        self.frames += 1
+        if self.count == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        if self.count:
+            self.file.write(self.buffer[:self.count].tobytes())
+            self.count = 0
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+
+class InputReplay:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            header = np.fromfile(f, dtype=HEADER_DTYPE, count=1)
+            if len(header) != 1 or header["magic"][0] != MAGIC:
+                raise ValueError(f"{path} is not a hand-tracking recording")
+            if header["version"][0] != VERSION:
+                raise ValueError(f"{path}: unsupported recording version {header['version'][0]}")
+            self.records = np.fromfile(f, dtype=RECORD_DTYPE)
+        self.seed = int(header["seed"][0])
+        self.sim_rate = int(header["sim_rate"][0])
+        self.hand_filter = header["filter"][0].decode()
+        self.position = 0
+
+    def __len__(self):
+        return len(self.records)
+
+    def finished(self):
+        return self.position >= len(self.records)
+
+    def next(self):
+        # Returns the next record, or None once the recording is exhausted
+        if self.finished():
+            return None
+        record = self.records[self.position]
+        self.position += 1
+        return record
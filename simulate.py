@@ -0,0 +1,265 @@
+"""Headless batch simulation with scripted bots.
+
+    python simulate.py [--games N] [--bot nearest|random] [--workers N] [--output stats.csv]
+    python simulate.py --bot replay --recording a.rec b.rec [--output stats.npz]
+
+Plays complete games with no window, drawing, hand tracking or frame
+pacing, for tuning the game rules (--spawn-interval, --enemy-speed,
+--laser-cooldown). A bot takes the place of the hand tracker and the game
+advances through ``Game.advance``, the same fixed-step code the real loop
+uses. Game i is seeded with ``--seed + i``, so any row can be played again
+on its own. Games are handed to a process pool in chunks. Each chunk's
+stats are written as soon as it finishes, one column per field of
+``STATS_DTYPE``. CSV rows are appended per chunk, and ``.npz`` stores each
+column as an array when the run ends.
+
+Bots:
+
+- nearest: moves under the enemy that will reach the ship's row first and
+  fires once lined up with it
+- random: wanders to random positions and makes a fist at random
+- replay: plays a ``main.py --record`` recording with its own frame timing,
+  seed and hand filter, one game per recording. The game stops at the first
+  game over or restart. With the default rules it matches ``main.py --replay``
+"""
+import argparse
+import multiprocessing
+import os
+import time
+
+# No window is opened, but keep SDL away from the display and audio devices.
+# SDL also turns SIGTERM into a quit event, which would stop Pool.terminate
+# from ending the workers
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+import main
+from filters import FILTERS
+from recording import InputReplay
+
+BOTS = ("nearest", "random", "replay")
+
+STATS_DTYPE = np.dtype([
+    ("game", "<i4"),
+    ("seed", "<i8"),
+    ("bot", "U8"),
+    ("score", "<i4"),
+    ("survival_s", "<f8"),     # simulated seconds until game over or the time limit
+    ("game_over", "?"),        # False when the time limit or the recording ended the game
+    ("shots", "<i4"),
+    ("hits", "<i4"),
+    ("enemies", "<i4"),        # enemies spawned
+    ("spawn_min", "<i4"),
+    ("spawn_max", "<i4"),
+    ("speed_min", "<f4"),
+    ("speed_max", "<f4"),
+    ("laser_cooldown", "<i4"),
+])
+
+
+class NearestEnemyBot:
+    # Steers under the enemy closest to the ship's row and fires when lined
+    # up. It picks a new target every reaction seconds, and its hand shakes
+    # by jitter (a fraction of the screen width)
+    def __init__(self, seed, reaction=0.2, aim=15, jitter=0.005):
+        self.rng = np.random.default_rng(seed)
+        self.reaction = max(1, int(round(reaction * main.SIM_RATE)))
+        self.aim = aim
+        self.jitter = jitter
+        self.hand_x = 0.5
+        self.target = None
+
+    def frame(self, game, seq, t):
+        ship = game.spaceship
+        if seq % self.reaction == 0:
+            enemies = game.enemies
+            xs, ys = enemies.x[:enemies.count], enemies.y[:enemies.count]
+            above = ys < ship.y
+            self.target = xs[above][np.argmax(ys[above])] if above.any() else None
+            if self.target is not None:
+                self.hand_x = self.target / main.SCREEN_WIDTH
+        is_fist = self.target is not None and abs(ship.x - self.target) < self.aim
+        hand_x = self.hand_x + self.jitter * self.rng.standard_normal()
+        return main.HandResult(seq, t, hand_x, is_fist, True, 1.0), main.SIM_DT, t
+
+
+class RandomBot:
+    # Moves to a new random position every 0.25-1.5 s; fist 10% of the time
+    def __init__(self, seed, fist_chance=0.1):
+        self.rng = np.random.default_rng(seed)
+        self.fist_chance = fist_chance
+        self.hand_x = 0.5
+        self.hold = 0
+
+    def frame(self, game, seq, t):
+        if self.hold <= 0:
+            self.hand_x = self.rng.uniform(0.05, 0.95)
+            self.hold = self.rng.integers(15, 90)
+        self.hold -= 1
+        is_fist = self.rng.random() < self.fist_chance
+        return main.HandResult(seq, t, self.hand_x, is_fist, True, 1.0), main.SIM_DT, t
+
+
+class ReplayBot:
+    # Recorded hand input, frame timing, filter clock and title screen
+    # pauses; ends at the recording's end or first restart
+    def __init__(self, replay):
+        self.replay = replay
+
+    def frame(self, game, seq, t):
+        record = self.replay.next()
+        if record is None or record["restart"]:
+            return None
+        game.title = bool(record["title"])
+        return (main.HandResult.from_record(record), float(record["frame_dt"]),
+                float(record["clock"]))
+
+
+def play(game_index, seed, bot_name, rules, max_seconds, hand_filter="lerp", recording=None,
+         reaction=0.2):
+    # Plays one game and returns its STATS_DTYPE row as a tuple
+    if bot_name == "replay":
+        replay = InputReplay(recording)
+        seed = replay.seed
+        hand_filter = replay.hand_filter
+        bot = ReplayBot(replay)
+    elif bot_name == "nearest":
+        bot = NearestEnemyBot(seed, reaction)
+    else:
+        bot = RandomBot(seed)
+    game = main.Game(seed=seed, headless=True, hand_filter=hand_filter, quality="high", **rules)
+    max_steps = int(round(max_seconds * main.SIM_RATE))
+    seq, t = 0, 0.0
+    while not game.game_over and game.steps_played < max_steps:
+        frame = bot.frame(game, seq, t)
+        if frame is None:
+            break
+        result, frame_dt, clock = frame
+        game.input_time = result.timestamp
+        game.input_clock = clock
+        game.advance(result.player_inputs(), frame_dt)
+        seq += 1
+        t += frame_dt
+    player = game.players[0]
+    return (game_index, seed, bot_name, game.score, game.steps_played * main.SIM_DT,
+            game.game_over, player.shots, player.hits, game.enemies_spawned,
+            *rules["spawn_interval"], *rules["enemy_speed"], rules["laser_cooldown"])
+
+
+def play_chunk(games):
+    # Worker task: a list of play() argument tuples -> a STATS_DTYPE array
+    return np.array([play(*args) for args in games], dtype=STATS_DTYPE)
+
+
+class StatsWriter:
+    # CSV is appended chunk by chunk; .npz (one array per column) is written on close
+    def __init__(self, path):
+        self.path = path
+        self.chunks = []
+        self.file = None
+        if path is not None and not path.endswith(".npz"):
+            self.file = open(path, "w")
+            self.file.write(",".join(STATS_DTYPE.names) + "\n")
+
+    def write(self, rows):
+        self.chunks.append(rows)
+        if self.file is not None:
+            for row in rows.tolist():
+                self.file.write(",".join(str(int(v)) if isinstance(v, bool) else str(v)
+                                         for v in row) + "\n")
+            self.file.flush()
+
+    def rows(self):
+        return np.concatenate(self.chunks) if self.chunks else np.zeros(0, STATS_DTYPE)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        elif self.path is not None:
+            rows = self.rows()
+            np.savez(self.path, **{name: rows[name] for name in STATS_DTYPE.names})
+
+
+def run_batch(games, workers, chunk, writer):
+    # Plays every game over a pool of workers, writing chunks as they finish
+    chunks = [games[i:i + chunk] for i in range(0, len(games), chunk)]
+    if workers <= 1:
+        for rows in map(play_chunk, chunks):
+            writer.write(rows)
+        return
+    # Workers start from a fresh interpreter rather than a fork of one with
+    # SDL's threads running
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        for rows in pool.imap_unordered(play_chunk, chunks):
+            writer.write(rows)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--bot", default="nearest", choices=BOTS)
+    parser.add_argument("--recording", nargs="+", default=[], metavar="PATH",
+                        help="recordings for the replay bot, one game each")
+    parser.add_argument("--reaction", type=float, default=0.2,
+                        help="seconds between the nearest bot's target choices")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=8, help="games per worker task")
+    parser.add_argument("--max-seconds", type=float, default=300.0,
+                        help="end a game after this much simulated time")
+    parser.add_argument("--output", help="write per-game stats to this .csv or .npz file")
+    parser.add_argument("--filter", default="lerp", choices=FILTERS,
+                        help="hand filter (the replay bot uses the recorded one)")
+    parser.add_argument("--horde", action="store_true")
+    parser.add_argument("--spawn-interval", type=int, nargs=2, default=main.SPAWN_INTERVAL,
+                        metavar=("MIN", "MAX"), help="simulation steps between enemies")
+    parser.add_argument("--enemy-speed", type=float, nargs=2, default=main.ENEMY_SPEED,
+                        metavar=("MIN", "MAX"), help="enemy speed in pixels per step")
+    parser.add_argument("--laser-cooldown", type=int, default=main.LASER_COOLDOWN,
+                        help="simulation steps between shots")
+    args = parser.parse_args(argv)
+    if args.bot == "replay" and not args.recording:
+        parser.error("--bot replay needs --recording")
+    return args
+
+
+def run(argv=None):
+    args = parse_args(argv)
+    rules = dict(spawn_interval=tuple(args.spawn_interval), enemy_speed=tuple(args.enemy_speed),
+                 laser_cooldown=args.laser_cooldown, horde=args.horde)
+    if args.bot == "replay":
+        games = [(i, None, "replay", rules, args.max_seconds, args.filter, path)
+                 for i, path in enumerate(args.recording)]
+    else:
+        games = [(i, args.seed + i, args.bot, rules, args.max_seconds, args.filter, None,
+                  args.reaction)
+                 for i in range(args.games)]
+
+    writer = StatsWriter(args.output)
+    start = time.perf_counter()
+    try:
+        run_batch(games, args.workers, args.chunk, writer)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+
+    rows = writer.rows()
+    shots = max(1, rows["shots"].sum())
+    print(f"{len(rows)} games in {elapsed:.1f} s on {args.workers} worker(s): "
+          f"{len(rows) / elapsed:.1f} games/s, "
+          f"{rows['survival_s'].sum() * main.SIM_RATE / elapsed:,.0f} steps/s")
+    print(f"score mean {rows['score'].mean():.1f} (p50 {np.median(rows['score']):.0f}, "
+          f"max {rows['score'].max()}), survival mean {rows['survival_s'].mean():.1f} s, "
+          f"accuracy {rows['hits'].sum() / shots:.1%}, "
+          f"{(~rows['game_over']).sum()} not over at the end")
+    if args.output:
+        print(f"Stats written to {args.output}")
+
+
+if __name__ == "__main__":
+    run()
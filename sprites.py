@@ -0,0 +1,50 @@
+"""Bounded LRU cache of pre-rendered entity sprites.
+
+Periodic animations (ship bob, antenna wobble, laser glow) only ever produce
+a handful of distinct images, so each one is rendered once into a per-pixel
+alpha surface and then blitted. Sprites are keyed by ``(kind, style, phase)``:
+``style`` holds everything the drawing depends on (dimensions and colors),
+so a change there simply produces new keys and the stale sprites age out of
+the cache; ``phase`` is the quantized animation frame.
+"""
+from collections import OrderedDict
+
+import pygame
+
+
+def alpha_surface(size):
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    # Match the display format for faster blits once a window exists
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    return surface
+
+
+class SpriteCache:
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def clear(self):
+        self.sprites.clear()
+
+    def get(self, key, render, *args):
+        # Returns the cached sprite for key, rendering it with render(*args)
+        # on a miss and evicting the least recently used one when full
+        sprites = self.sprites
+        sprite = sprites.get(key)
+        if sprite is not None:
+            sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+        self.misses += 1
+        sprite = render(*args)
+        sprites[key] = sprite
+        if len(sprites) > self.capacity:
+            sprites.popitem(last=False)
+        return sprite
@@ -0,0 +1,104 @@
+"""Vectorized parallax starfield.
+
+Star state lives in NumPy arrays and scroll, wrap and twinkle are updated in
+bulk. Stars are drawn from a cache of pre-rendered sprites, one per size and
+brightness level, with a single ``Surface.blits`` call.
+"""
+import numpy as np
+import pygame
+
+TWINKLE_PERIOD = 120
+BRIGHTNESS_LEVELS = 16
+
+# (share of stars, speed range, size range) per layer, far to near
+CLASSIC_LAYERS = [(1.0, (0.5, 2.0), (1, 3))]
+PARALLAX_LAYERS = [
+    (0.6, (0.3, 0.8), (1, 1)),
+    (0.3, (0.8, 1.6), (1, 2)),
+    (0.1, (1.6, 2.8), (2, 3)),
+]
+
+
+def twinkle_brightness(twinkle):
+    # Same curve as the original Star.draw
+    alpha = 100 + (100 * np.sin(twinkle * 0.1)).astype(np.int32)
+    return np.clip(alpha, 50, 255)
+
+
+class Starfield:
+    def __init__(self, width, height, count=100, layers=CLASSIC_LAYERS, seed=None):
+        self.width = width
+        self.height = height
+        self.rng = rng = np.random.default_rng(seed)
+
+        speeds, sizes = [], []
+        remaining = count
+        for i, (share, speed_range, size_range) in enumerate(layers):
+            n = remaining if i == len(layers) - 1 else int(round(count * share))
+            n = min(n, remaining)
+            remaining -= n
+            speeds.append(rng.uniform(speed_range[0], speed_range[1], n))
+            sizes.append(rng.integers(size_range[0], size_range[1] + 1, n))
+
+        self.count = count
+        self.x = rng.integers(0, width + 1, count).astype(np.float32)
+        self.y = rng.integers(0, height + 1, count).astype(np.float32)
+        self.prev_y = self.y.copy()
+        self.speed = np.concatenate(speeds).astype(np.float32)
+        self.size = np.concatenate(sizes).astype(np.int32)
+        self.twinkle = rng.integers(0, 61, count).astype(np.int32)
+
+        self.max_size = int(self.size.max()) if count else 1
+        self.sprites = self.render_sprites()
+        # Subset drawn at reduced quality; None draws every star
+        self.visible = None
+
+    def render_sprites(self):
+        # Index = size * BRIGHTNESS_LEVELS + level
+        sprites = []
+        for size in range(self.max_size + 1):
+            radius = max(1, size)
+            for level in range(BRIGHTNESS_LEVELS):
+                brightness = 50 + (200 - 50) * level // (BRIGHTNESS_LEVELS - 1)
+                sprite = pygame.Surface((radius * 2 + 1, radius * 2 + 1))
+                sprite.set_colorkey((0, 0, 0))
+                pygame.draw.circle(sprite, (brightness,) * 3, (radius, radius), radius)
+                sprites.append(sprite)
+        return sprites
+
+    def set_visible(self, count):
+        # Draws only count stars, spread evenly over the layers
+        if count >= self.count:
+            self.visible = None
+        else:
+            self.visible = np.linspace(0, self.count - 1, max(count, 0)).astype(np.intp)
+
+    def update(self):
+        self.prev_y[:] = self.y
+        self.y += self.speed
+        wrapped = self.y > self.height
+        wrapped_count = int(np.count_nonzero(wrapped))
+        if wrapped_count:
+            # Wrapped stars jump straight to the top, no interpolation
+            self.y[wrapped] = self.prev_y[wrapped] = -10
+            self.x[wrapped] = self.rng.integers(0, self.width + 1, wrapped_count)
+        self.twinkle += 1
+        self.twinkle %= TWINKLE_PERIOD
+
+    def draw(self, screen, alpha=1.0):
+        if not self.count:
+            return []
+        x, y, prev_y, size, twinkle = self.x, self.y, self.prev_y, self.size, self.twinkle
+        if self.visible is not None:
+            index = self.visible
+            x, y, prev_y, size, twinkle = x[index], y[index], prev_y[index], size[index], twinkle[index]
+        brightness = twinkle_brightness(twinkle)
+        level = (brightness - 50) * (BRIGHTNESS_LEVELS - 1) // (200 - 50)
+        keys = size * BRIGHTNESS_LEVELS + level
+        left = x.astype(np.int32) - size
+        if alpha != 1.0:
+            y = prev_y + (y - prev_y) * alpha
+        top = y.astype(np.int32) - size
+        sprites = self.sprites
+        return screen.blits(zip([sprites[k] for k in keys.tolist()],
+                                zip(left.tolist(), top.tolist())))
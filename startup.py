@@ -0,0 +1,109 @@
+"""Startup phases, background loading and their timing.
+
+The slow parts of starting the game (importing OpenCV and MediaPipe,
+building and warming up the hand model, opening the camera) run as phases
+on background threads while the main thread shows the title screen. Each
+thread runs its phases in order and stops at the first failure; threads
+run in parallel with each other and with the main thread.
+
+Every phase is timed, on whichever thread ran it, relative to ``origin``
+(the moment ``main`` started importing). ``mark`` records one-off events
+such as the first frame on screen, and ``report`` prints the lot.
+"""
+import threading
+import time
+
+
+class Startup:
+    def __init__(self, origin=None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.lock = threading.Lock()
+        # (phase, thread, start, end) in seconds since origin
+        self.phases = []
+        # {event: seconds since origin}
+        self.marks = {}
+        # (phase, exception) for phases that raised
+        self.errors = []
+        self.threads = []
+        self.total = 0
+        self.finished = 0
+        self.running = []
+
+    def record(self, name, start, end, thread="main"):
+        with self.lock:
+            self.phases.append((name, thread, start - self.origin, end - self.origin))
+
+    def timed(self, name, fn, *args):
+        # Runs one phase on the calling thread and returns its result
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            thread = threading.current_thread()
+            self.record(name, start, time.perf_counter(),
+                        "main" if thread is threading.main_thread() else thread.name)
+
+    def mark(self, name):
+        # Records the first occurrence of an event
+        with self.lock:
+            self.marks.setdefault(name, time.perf_counter() - self.origin)
+
+    def run_in_background(self, thread, phases):
+        # phases: [(name, fn), ...] run in order on a new daemon thread
+        with self.lock:
+            self.total += len(phases)
+        worker = threading.Thread(target=self.run_phases, args=(phases,), name=thread, daemon=True)
+        self.threads.append(worker)
+        worker.start()
+
+    def run_phases(self, phases):
+        for i, (name, fn) in enumerate(phases):
+            with self.lock:
+                self.running.append(name)
+            try:
+                self.timed(name, fn)
+            except Exception as error:
+                with self.lock:
+                    self.errors.append((name, error))
+                    # The rest of this thread's phases count as done
+                    self.finished += len(phases) - i - 1
+                return
+            finally:
+                with self.lock:
+                    self.running.remove(name)
+                    self.finished += 1
+
+    @property
+    def done(self):
+        return not any(thread.is_alive() for thread in self.threads)
+
+    def join(self, timeout=None):
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def progress(self):
+        # (fraction of background phases finished, names of the running ones)
+        with self.lock:
+            fraction = self.finished / self.total if self.total else 1.0
+            return fraction, list(self.running)
+
+    def as_dict(self):
+        with self.lock:
+            return {"phases": [{"phase": name, "thread": thread, "start": start, "end": end}
+                               for name, thread, start, end in self.phases],
+                    "marks": dict(self.marks),
+                    "errors": [(name, repr(error)) for name, error in self.errors]}
+
+    def report(self):
+        with self.lock:
+            phases = sorted(self.phases, key=lambda phase: phase[2])
+            marks = sorted(self.marks.items(), key=lambda mark: mark[1])
+            errors = list(self.errors)
+        lines = [f"  {'phase':<24}{'thread':<12}{'start ms':>10}{'took ms':>10}"]
+        for name, thread, start, end in phases:
+            lines.append(f"  {name:<24}{thread:<12}{start * 1000:>10.1f}{(end - start) * 1000:>10.1f}")
+        for name, at in marks:
+            lines.append(f"  {name:<24}{'':<12}{at * 1000:>10.1f}")
+        for name, error in errors:
+            lines.append(f"  {name} failed: {error}")
+        return "\n".join(lines)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+import main
+from collision import (DIRECT_MAX_ENEMIES, SpatialHash, brute_force_laser_hits, find_laser_hits,
+                       reach, ship_hit)
+
+LASER_SIZE = (main.Laser.width, main.Laser.height)
+ENEMY_SIZE = (main.Enemy.width, main.Enemy.height)
+SHIP_SIZE = (60, 50)
+SCENES = 250
+
+
+def random_scene(rng, lasers, enemies, width=main.SCREEN_WIDTH, height=main.SCREEN_HEIGHT):
+    # (laser x, laser y, enemy x, enemy y) arrays, as the entity stores hold them
+    return (rng.uniform(0, width, lasers), rng.uniform(-50, height, lasers),
+            rng.uniform(0, width, enemies), rng.uniform(-50, height, enemies))
+
+
+# Few enough enemies are tested pair by pair, more go through the grid
+@pytest.mark.parametrize("enemies", [(0, DIRECT_MAX_ENEMIES), (DIRECT_MAX_ENEMIES + 1, 200)],
+                         ids=["direct", "grid"])
+def test_broadphase_matches_brute_force(enemies):
+    rng = np.random.default_rng(1234)
+    grid = SpatialHash()
+    ship_y = main.SCREEN_HEIGHT - 150
+    reach_x, reach_y = reach(SHIP_SIZE, ENEMY_SIZE)
+    hits = ship_hits = 0
+    for _ in range(SCENES):
+        lx, ly, ex, ey = random_scene(rng, rng.integers(0, 200),
+                                      rng.integers(enemies[0], enemies[1] + 1))
+        ship_x = rng.uniform(0, main.SCREEN_WIDTH)
+        expected = brute_force_laser_hits(lx, ly, LASER_SIZE, ex, ey, ENEMY_SIZE)
+        hit_lasers, destroyed = find_laser_hits(lx, ly, LASER_SIZE, ex, ey, ENEMY_SIZE, grid)
+        assert list(zip(hit_lasers.tolist(), destroyed.tolist())) == expected
+
+        dead = {ei for _, ei in expected}
+        expected_ship = any(abs(ship_x - ex[i]) < reach_x and abs(ship_y - ey[i]) < reach_y
+                            for i in range(len(ex)) if i not in dead)
+        assert ship_hit(ship_x, ship_y, SHIP_SIZE, ex, ey, ENEMY_SIZE, grid,
+                        destroyed) == expected_ship
+        hits += len(expected)
+        ship_hits += expected_ship
+    # The scenes are busy enough to exercise both checks
+    assert hits and ship_hits
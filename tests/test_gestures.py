@@ -0,0 +1,25 @@
+import itertools
+
+from gestures import DEFAULT_GESTURES, GestureEngine
+
+EXTENDED, CURLED = 2.0, 0.5
+PINCHING, APART = 0.1, 1.0
+
+
+def classify(fingers, pinching):
+    # Raw gesture of a fresh engine for a finger state (thumb first)
+    extension = [EXTENDED if extended else CURLED for extended in fingers]
+    return GestureEngine().classify(extension, PINCHING if pinching else APART)
+
+
+def test_every_default_gesture_is_reachable():
+    # First match wins, so an earlier, looser pattern can hide a later one
+    reached = {classify(fingers, pinching)
+               for fingers in itertools.product((False, True), repeat=5)
+               for pinching in (False, True)}
+    assert {g["name"] for g in DEFAULT_GESTURES} <= reached
+
+
+def test_thumbs_up_is_not_a_fist():
+    assert classify((True, False, False, False, False), False) == "thumbs_up"
+    assert classify((False, False, False, False, False), False) == "fist"
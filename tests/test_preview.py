@@ -0,0 +1,21 @@
+import numpy as np
+
+from preview import CameraPreview
+
+FRAME = np.zeros((720, 1280, 3), dtype=np.uint8)
+
+
+def test_preview_refreshes_every_frame_within_budget():
+    preview = CameraPreview(budget_ms=1000.0)
+    slots = [preview.capture(FRAME) for _ in range(4)]
+    assert preview.interval == 1
+    assert slots == [0, 1, 2, 0]
+
+
+def test_preview_refreshes_less_often_over_budget():
+    # Any downscale is over this budget
+    preview = CameraPreview(budget_ms=1e-6)
+    slot = preview.capture(FRAME)
+    assert preview.interval > 1
+    # The frames until the next refresh show the last preview again
+    assert [preview.capture(FRAME) for _ in range(3)] == [slot] * 3
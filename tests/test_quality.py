@@ -0,0 +1,29 @@
+from quality import QualityGovernor, level_index
+
+BUDGET = 1 / 60
+# Modelled frame work per quality level, highest first: the spike only fits
+# the budget from "low" down, quiet frames fit at every level
+SPIKE = (0.030, 0.020, 0.012, 0.008)
+QUIET = (0.006, 0.005, 0.004, 0.004)
+
+
+def feed(governor, costs, frames):
+    # Feeds frames at the current level's cost; returns the level index of each
+    levels = []
+    for _ in range(frames):
+        governor.update(costs[governor.index])
+        levels.append(governor.index)
+    return levels
+
+
+def test_spike_lowers_quality_and_quiet_frames_restore_it():
+    governor = QualityGovernor(BUDGET, log=None)
+    assert set(feed(governor, QUIET, 300)) == {level_index("high")}
+
+    during = feed(governor, SPIKE, 900)
+    assert during[-1] == level_index("low")
+    # Only steps down: a level the spike can't hold is not tried again
+    assert during == sorted(during)
+
+    after = feed(governor, QUIET, 1800)
+    assert after[-1] == level_index("high")
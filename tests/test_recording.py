@@ -0,0 +1,96 @@
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+import pytest
+
+import main
+from input_sources import SyntheticSource
+from recording import InputReplay
+
+FRAMES = 60
+
+
+def assert_same_game(replayed, live):
+    assert replayed.steps_played == live.steps_played
+    assert replayed.enemies_spawned == live.enemies_spawned
+    assert replayed.spaceship.x == live.spaceship.x
+    assert replayed.score == live.score
+
+
+def run_cli(argv, frames=None):
+    # Builds the game the way main.py's command line does and runs it to the end
+    pygame.init()
+    args = main.parse_args(argv)
+    source = None
+    if not args.replay:
+        source = main.make_source(args)
+        source.frames = frames
+    game = main.make_game(args, source)
+    try:
+        game.run()
+    finally:
+        game.shutdown()
+    return game
+
+
+# A fast source would outrun the pipelined game loop, so that one runs in real time
+@pytest.mark.parametrize("mode", [["--input-fast"], ["--pipelined"]])
+def test_record_and_replay_from_the_command_line(tmp_path, mode):
+    path = str(tmp_path / "input.rec")
+    # kalman predicts to the clock, so it only replays exactly if the clock was recorded
+    argv = ["--synthetic", "--seed", "7", "--filter", "kalman", "--record", path,
+            "--no-idle"] + mode
+    live = run_cli(argv, FRAMES)
+
+    replay = InputReplay(path)
+    assert replay.seed == 7
+    assert replay.hand_filter == "kalman"
+    assert len(replay) > 0
+    # Frames before tracking was ready (background startup) have no result
+    assert replay.records["seq"].min() == -1
+    assert replay.records["seq"].max() >= 0
+
+    replayed = run_cli(["--replay", path, "--replay-fast"])
+    assert replayed.replay.finished()
+    assert replayed.hand_filter == "kalman"
+    assert_same_game(replayed, live)
+
+
+def test_record_without_seed_or_filter(tmp_path):
+    path = str(tmp_path / "input.rec")
+    # The recording draws its own seed and falls back to the default filter
+    live = run_cli(["--synthetic", "--record", path, "--no-idle", "--input-fast"], FRAMES)
+
+    replay = InputReplay(path)
+    assert replay.seed == live.seed
+    assert replay.hand_filter == "lerp"
+
+    replayed = run_cli(["--replay", path, "--replay-fast"])
+    assert_same_game(replayed, live)
+
+
+def test_replay_pauses_behind_the_title_screen(tmp_path, monkeypatch):
+    path = str(tmp_path / "input.rec")
+    # A source that takes as long to open as a camera keeps the title screen
+    # up (and play paused) for the first frames
+    open_source = SyntheticSource.open
+
+    def slow_open(self):
+        time.sleep(0.5)
+        open_source(self)
+
+    monkeypatch.setattr(SyntheticSource, "open", slow_open)
+    live = run_cli(["--synthetic", "--seed", "7", "--record", path, "--no-idle",
+                    "--input-fast"], FRAMES)
+
+    replay = InputReplay(path)
+    assert replay.records["title"][0]
+    assert not replay.records["title"][-1]
+
+    replayed = run_cli(["--replay", path, "--replay-fast"])
+    assert_same_game(replayed, live)